@@ -0,0 +1,231 @@
+# % Default automatic generation control (AGC) and ACE.
+# %
+# % Every tAGC seconds the AGC moves all regulating units at once towards
+# % their RTSCED basepoints plus a share of the regulation signal, limited by
+# % ramp rate, regulation reserve and output limits, then measures ACE. All
+# % unit updates are NumPy array operations; the integral and smoothing
+# % windows are running sums over ring buffers, so a step costs the same no
+# % matter how long the simulation has run.
+# %
+# % The ACE row of every step holds the six columns of load_ace_indices:
+# % time, raw ACE, integrated ACE (MWh), CPS2 ACE (mean of the current
+# % CPS2_interval_in window), SACE and AACEE (cumulative |ACE| in MWh).
+# %
+# % AGC modes (agcmode):
+# % 1 Normal - regulation follows raw ACE outside the deadband.
+# % 2 Fast   - regulation follows raw ACE with no deadband.
+# % 3 Smooth - regulation follows SACE = K1 * ACE + K2 * mean ACE over the
+# %            last Type3_integral_in seconds, outside the deadband.
+# % 4 Custom - regulation follows custom_signal(engine, ace), a function
+# %            assigned to the engine instance.
+
+import numpy as np
+from SYSTEM_MODEL import TYPE_INDICES
+
+ACE_COLUMNS = ('time', 'raw', 'integrated', 'CPS2', 'SACE', 'AACEE')
+
+class RollingSum:
+    """Sum of the last n values pushed, updated in O(1) per value"""
+
+    def __init__(self, n):
+        self.n = max(int(n), 1)
+        self.buffer = np.zeros(self.n)
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, value):
+        self.total += value - self.buffer[self.position]
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.n
+        self.count = min(self.count + 1, self.n)
+        return self.total
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+class CPS2Compliance:
+    """
+    Streaming CPS2 and AACEE accumulator.
+
+    ACE is averaged over consecutive CPS2_interval-minute windows; a window
+    whose mean |ACE| exceeds L10 is a violation. Only the open window's sum
+    is kept, so memory stays constant however long the simulation runs.
+    With a ResultsWriter every closed window is written to its 'CPS2' stage
+    and close() stores the totals as attributes of that stage.
+    """
+
+    def __init__(self, interval_minutes=10, L10=50, tAGC=4, results=None, stage='CPS2'):
+        self.L10 = L10
+        self.tAGC = tAGC
+        self.window_steps = max(int(interval_minutes * 60 // tAGC), 1)
+        self.results = results
+        self.stage = stage
+        self.windows = 0
+        self.violations = 0
+        self.aacee = 0.0
+        self._sum = 0.0
+        self._count = 0
+
+    def push(self, time_seconds, ace):
+        """Add one AGC step of raw ACE; returns the mean ACE of the open window"""
+        self.aacee += abs(ace) * self.tAGC / 3600
+        self._sum += ace
+        self._count += 1
+        mean = self._sum / self._count
+        if self._count == self.window_steps:
+            self._close_window(time_seconds, mean)
+        return mean
+
+    def _close_window(self, time_seconds, mean):
+        violation = abs(mean) > self.L10
+        self.windows += 1
+        self.violations += int(violation)
+        self._sum = 0.0
+        self._count = 0
+        if self.results is not None:
+            self.results.write(self.stage, time_seconds, mean_ACE=mean, violation=np.int8(violation))
+
+    @property
+    def compliance(self):
+        """Percentage of closed windows within L10"""
+        return 100.0 * (1 - self.violations / self.windows) if self.windows else 100.0
+
+    def summary(self):
+        return {'windows': self.windows, 'violations': self.violations,
+                'compliance': self.compliance, 'AACEE': self.aacee, 'L10': self.L10}
+
+    def close(self):
+        """Store the totals with the results (the open partial window is not scored)"""
+        if self.results is not None:
+            self.results.set_attributes(self.stage, **self.summary())
+        return self.summary()
+
+class AGCEngine:
+    """
+    AGC of one run over the units of a SystemModel.
+
+    Units respond when AGC_QUALIFIED is set; their share of the regulation
+    signal follows reg_proportion (1 by ramp rate, 2 by regulation
+    schedule, 3 by remaining regulation room in the signal's direction).
+    """
+
+    custom_signal = None
+
+    def __init__(self, model, tAGC=4, K1=1, K2=2, integral_seconds=180, deadband=5, mode=3,
+                 CPS2_interval=10, reg_proportion=2, initial_output=None, L10=50, results=None):
+        gen = model.gen
+        self.tAGC = tAGC
+        self.K1 = K1
+        self.K2 = K2
+        self.deadband = deadband
+        self.mode = mode
+        self.reg_proportion = reg_proportion
+        self.capacity = gen.column('capacity')
+        # MW a unit can move in one AGC step
+        self.step_ramp = np.where(gen.column('ramp_rate') > 0, gen.column('ramp_rate') * tAGC / 60, self.capacity)
+        self.regulating = gen.column('agc_qualified') > 0
+        self.is_vg = model.gen_type_mask(TYPE_INDICES.wind_gen_type_index, TYPE_INDICES.PV_gen_type_index)
+        self.output = (gen.column('initial_MW') * (gen.column('initial_status') > 0) if initial_output is None
+                       else np.asarray(initial_output, dtype=float)).astype(float)
+
+        self.step = 0
+        self.ace = 0.0
+        self.sace = 0.0
+        self.integrated = 0.0
+        self._integral = RollingSum(integral_seconds / tAGC)
+        self.cps2 = CPS2Compliance(CPS2_interval, L10, tAGC, results)
+
+    @classmethod
+    def from_config(cls, model, config, initial_output=None, results=None):
+        """AGC with the options of a RunConfig (or settings); CPS2 windows go to results if given"""
+        return cls(model, config.tAGC, config.K1_in, config.K2_in, config.Type3_integral_in,
+                   config.agc_deadband_in, config.agcmode, config.CPS2_interval_in,
+                   config.reg_proportion, initial_output, config.L10_in, results)
+
+    def signal(self):
+        """Regulation signal (MW of ACE to correct) for the next step"""
+        if self.mode == 1:
+            return self.ace if abs(self.ace) > self.deadband else 0.0
+        if self.mode == 2:
+            return self.ace
+        if self.mode == 3:
+            return self.sace if abs(self.sace) > self.deadband else 0.0
+        if self.mode == 4 and self.custom_signal is not None:
+            return self.custom_signal(self, self.ace)
+        raise ValueError(f"AGC mode {self.mode} needs AGCEngine.custom_signal")
+
+    def _shares(self, signal, basepoint, reg_up, reg_down):
+        """Fraction of the regulation signal taken by each unit"""
+        if self.reg_proportion == 1:
+            weight = self.step_ramp
+        elif self.reg_proportion == 2:
+            weight = reg_up if signal < 0 else reg_down
+        else:
+            weight = (basepoint + reg_up - self.output) if signal < 0 else (self.output - basepoint + reg_down)
+        weight = np.where(self.regulating, np.maximum(weight, 0), 0)
+        total = weight.sum()
+        return weight / total if total > 0 else weight
+
+    def advance(self, basepoint, load, reg_up=None, reg_down=None, available=None):
+        """
+        Move every unit one AGC step and return the ACE row of that step.
+
+        basepoint is the (ngen,) dispatch the units are following (RTSCED
+        schedule ramped between intervals), load the actual load, reg_up/
+        reg_down the regulation reserve of each unit (default its ramp over
+        one step, 0 for units with no basepoint, i.e. offline) and available
+        the actual VG output limit. Regulation never takes a unit below 0 or
+        above its capacity or available output.
+        """
+        basepoint = np.asarray(basepoint, dtype=float)
+        online_ramp = np.where(basepoint > 0, self.step_ramp, 0.0)
+        reg_up = online_ramp if reg_up is None else np.asarray(reg_up, dtype=float)
+        reg_down = online_ramp if reg_down is None else np.asarray(reg_down, dtype=float)
+        upper = self.capacity if available is None else np.where(self.is_vg, np.minimum(available, self.capacity),
+                                                                  self.capacity)
+        reg_up = np.minimum(reg_up, np.maximum(upper - basepoint, 0))
+        reg_down = np.minimum(reg_down, np.maximum(basepoint, 0))
+
+        signal = self.signal()
+        target = basepoint
+        if signal:
+            target = basepoint - self._shares(signal, basepoint, reg_up, reg_down) * signal
+            target = np.where(self.regulating, np.clip(target, basepoint - reg_down, basepoint + reg_up), basepoint)
+        output = np.clip(target, self.output - self.step_ramp, self.output + self.step_ramp)
+        self.output = np.clip(output, 0, upper)
+
+        return self.measure(self.output.sum() - load)
+
+    def measure(self, ace):
+        """Update the ACE accumulators with this step's raw ACE and return the ACE row"""
+        self.step += 1
+        time_seconds = self.step * self.tAGC
+        self.ace = ace
+        self.integrated += ace * self.tAGC / 3600
+        self.sace = self.K1 * ace + self.K2 * (self._integral.push(ace) / self._integral.n)
+        cps2 = self.cps2.push(time_seconds, ace)
+        return np.array([time_seconds, ace, self.integrated, cps2, self.sace, self.cps2.aacee])
+
+    def run(self, basepoints, loads, reg_up=None, reg_down=None, available=None):
+        """
+        Advance over many steps; basepoints/available are (nsteps, ngen), loads (nsteps,).
+
+        Returns (ACE table (nsteps, 6), unit output (nsteps, ngen)).
+        """
+        nsteps = len(loads)
+        ace = np.empty((nsteps, len(ACE_COLUMNS)))
+        output = np.empty((nsteps, len(self.output)))
+        for k in range(nsteps):
+            ace[k] = self.advance(basepoints[k], loads[k], reg_up, reg_down,
+                                  None if available is None else available[k])
+            output[k] = self.output
+        return ace, output
+
+# Example usage:
+# if __name__ == "__main__":
+#     agc = AGCEngine.from_config(system_model, run_config, ACTUAL_GEN_OUTPUT, results)
+#     for step in range(time_grid.nagc):
+#         ACE[step] = agc.advance(basepoint, ACTUAL_LOAD[step], reg_up, reg_down, ACTUAL_VG[step])
+#     print(agc.cps2.close())
@@ -0,0 +1,86 @@
+# % Absolute Line Flow Exceedance in Energy (ALFEE) at AGC resolution.
+# %
+# % ALFEE of a line is the energy its actual |flow| spends above LINE_RATING:
+# %   ALFEE_l = sum over AGC steps of max(|f_l| - rating_l, 0) * tAGC / 3600
+# % Flows come from the generation and load shift factors of the monitored
+# % lines (one dense product per step or per block of steps), and only the
+# % running totals are kept, so the cost does not grow with the length of
+# % the run and no flow history is stored.
+
+import numpy as np
+from SHIFT_FACTOR import NetworkFlows
+
+class ALFEEMonitor:
+    """
+    Running ALFEE of the rated AC lines of one network.
+
+    Call push() every AGC step with the actual unit output and load, or
+    push_block() with a block of steps at once. exceedance holds the MWh
+    of every monitored line, steps_exceeded the AGC steps above rating and
+    max_loading the largest |flow| / rating seen. The load is withdrawn at
+    load_factors, by default the LOAD_DIST shares of the model.
+    """
+
+    def __init__(self, model, tAGC=4, network=None, branches=None, load_factors=None):
+        network = NetworkFlows(model, load_factors) if network is None else network
+        self.tAGC = tAGC
+        self.branches = (np.flatnonzero(np.isfinite(network.rating) & (network.sf.susceptance != 0)) if branches is None
+                         else np.asarray(branches, dtype=np.int64))
+        self.rating = network.rating[self.branches]
+        self._gen = network.gen_factors(self.branches)
+        self._shift = network.load_shift(self.branches)
+
+        self.steps = 0
+        self.exceedance = np.zeros(len(self.branches))
+        self.steps_exceeded = np.zeros(len(self.branches), dtype=np.int64)
+        self.max_loading = np.zeros(len(self.branches))
+
+    @classmethod
+    def from_config(cls, model, config, network=None):
+        """Monitor of a RunConfig (or settings), or None when monitor_ALFEE is off"""
+        if config.monitor_ALFEE != 1:
+            return None
+        return cls(model, config.tAGC, network)
+
+    def flows(self, output, load):
+        """Line flows of unit output (ngen,) or (nsteps, ngen) with load scalar or (nsteps,)"""
+        output = np.asarray(output, dtype=float)
+        return output @ self._gen.T - np.multiply.outer(load, self._shift)
+
+    def push_block(self, output, load):
+        """Accumulate nsteps AGC steps of output (nsteps, ngen) and load (nsteps,); returns the block's ALFEE"""
+        flows = np.abs(np.atleast_2d(self.flows(output, load)))
+        excess = np.maximum(flows - self.rating, 0)
+        block = excess.sum(axis=0) * self.tAGC / 3600
+        self.exceedance += block
+        self.steps_exceeded += np.count_nonzero(excess, axis=0)
+        self.max_loading = np.maximum(self.max_loading, flows.max(axis=0, initial=0) / self.rating)
+        self.steps += flows.shape[0]
+        return block.sum()
+
+    def push(self, output, load):
+        """Accumulate one AGC step; returns that step's ALFEE"""
+        return self.push_block(np.asarray(output, dtype=float)[None, :], np.atleast_1d(load))
+
+    @property
+    def total(self):
+        return self.exceedance.sum()
+
+    def summary(self):
+        return {'ALFEE': self.total, 'line_ALFEE': self.exceedance, 'steps_exceeded': self.steps_exceeded,
+                'max_loading': self.max_loading, 'branches': self.branches, 'steps': self.steps}
+
+    def close(self, results=None, stage='ALFEE'):
+        """Store the totals as attributes of the results' ALFEE stage"""
+        if results is not None:
+            results.set_attributes(stage, **self.summary())
+        return self.summary()
+
+# Example usage:
+# if __name__ == "__main__":
+#     alfee = ALFEEMonitor.from_config(system_model, run_config)
+#     for step in range(time_grid.nagc):
+#         ACE[step] = agc.advance(basepoint, ACTUAL_LOAD[step], reg_up, reg_down, ACTUAL_VG[step])
+#         if alfee is not None:
+#             alfee.push(agc.output, ACTUAL_LOAD[step])
+#     print(alfee.close(results)['ALFEE'])
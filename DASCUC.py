@@ -0,0 +1,239 @@
+# % Default day-ahead security-constrained unit commitment (DASCUC).
+# %
+# % Native replacement for the GAMS DASCUC model, used when
+# % use_Default_DASCUC is on. The MILP is assembled directly as sparse
+# % matrices from the columnar SystemModel and solved in-process with HiGHS
+# % (see solver_backend), so no GDX/.gms files are written and no GAMS
+# % process is started. Runs anywhere scipy is installed.
+# %
+# % Formulation per unit g and interval t: energy p, commitment u, start v,
+# % stop w and spinning-up reserve r; system balance with load shedding at
+# % VOLL, reserve requirement with shortfall at VOIR, capacity and minimum
+# % generation, ramping with start-up/shut-down allowance, minimum run and
+# % down times, and initial conditions from INITIAL_STATUS/HOUR/MW. Variable
+# % generation (wind/PV) is committed and limited by its forecast. With
+# % checkthenetwork/contingencycheck the network limits are added lazily
+# % (see NETWORK_CONSTRAINTS).
+
+import numpy as np
+from lp_model import LinearModel
+from NETWORK_CONSTRAINTS import enforce
+from SYSTEM_MODEL import TYPE_INDICES
+
+DEFAULT_VOLL = 10000.0
+DEFAULT_VOIR = 1000.0
+
+VG_TYPES = (TYPE_INDICES.wind_gen_type_index, TYPE_INDICES.PV_gen_type_index)
+
+def reserve_shortage_cost(model):
+    """$/MW of reserve shortfall: the highest VOIR of the RESERVEPARAM tab, DEFAULT_VOIR without one"""
+    voir = model.reserve.column('res_voir', DEFAULT_VOIR)
+    return voir.max() if len(voir) else DEFAULT_VOIR
+
+class UnitData:
+    """Per-unit vectors of a SystemModel prepared for one scheduling horizon"""
+
+    def __init__(self, model, interval_hours):
+        gen = model.gen
+        self.ngen = gen.n
+        self.capacity = gen.column('capacity')
+        self.min_gen = gen.column('min_gen')
+        # RAMP_RATE is MW/min; 0 means not ramp limited
+        ramp = gen.column('ramp_rate') * 60 * interval_hours
+        self.ramp = np.where(ramp > 0, ramp, self.capacity)
+        self.startup_ramp = np.maximum(self.min_gen, self.ramp)
+        self.energy_cost = gen.column('pucost')
+        self.noload_cost = gen.column('noload_cost')
+        self.startup_cost = gen.column('su_cost')
+        self.min_run = np.ceil(gen.column('mr_time') / interval_hours).astype(np.int64)
+        self.min_down = np.ceil(gen.column('md_time') / interval_hours).astype(np.int64)
+        self.initial_status = gen.column('initial_status') > 0
+        self.initial_hour = gen.column('initial_hour')
+        self.initial_MW = np.where(self.initial_status, gen.column('initial_MW'), 0.0)
+
+        self.is_vg = model.gen_type_mask(*VG_TYPES)
+        self.is_out = model.gen_type_mask(TYPE_INDICES.outage_gen_type_index)
+        # VG units only follow their forecast
+        self.ramp[self.is_vg] = self.capacity[self.is_vg]
+        self.startup_ramp[self.is_vg] = self.capacity[self.is_vg]
+        self.min_gen = np.where(self.is_vg, 0.0, self.min_gen)
+
+        # Reserve a unit can provide within the reserve deployment time
+        self.reserve_ramp = np.where(self.is_vg, 0.0, gen.column('ramp_rate'))
+
+def _lagged(index, lags, max_lag):
+    """(G, T, max_lag) columns of index[g, t - k] for k < lags[g], -1 where outside the window"""
+    G, T = index.shape
+    cols = np.full((G, T, max_lag), -1, dtype=np.int64)
+    t = np.arange(T)
+    for k in range(min(max_lag, T)):
+        valid = (t[None, :] - k >= 0) & (k < lags[:, None])
+        shifted = np.full((G, T), -1, dtype=np.int64)
+        shifted[:, k:] = index[:, :T - k] if k else index
+        cols[:, :, k] = np.where(valid, shifted, -1)
+    return cols
+
+def build_scuc(model, load, vg_forecast=None, reserve_requirement=None, interval_hours=1.0,
+               reserve_time=10.0, initial=None):
+    """
+    Assemble the unit commitment MILP for len(load) intervals.
+
+    vg_forecast is (n_vg_units, T) in the order of the VG units of the GEN
+    tab (or (ngen, T)); reserve_requirement is (T,) MW. initial optionally
+    overrides the GEN tab initial conditions with a dict of 'status' (bool),
+    'hours' (time in that state) and 'MW' vectors, as used by RTSCUC.
+    Returns (LinearModel, UnitData).
+    """
+    units = UnitData(model, interval_hours)
+    G, T = units.ngen, len(load)
+    load = np.asarray(load, dtype=float)
+    reserve_requirement = np.zeros(T) if reserve_requirement is None else np.asarray(reserve_requirement, dtype=float)
+    if initial is not None:
+        units.initial_status = np.asarray(initial['status'], dtype=bool)
+        units.initial_hour = np.asarray(initial['hours'], dtype=float)
+        units.initial_MW = np.asarray(initial['MW'], dtype=float)
+    voll = model.system_value('VOLL', DEFAULT_VOLL)
+
+    # Output limits, VG limited by its forecast
+    p_max = np.repeat(units.capacity[:, None], T, axis=1)
+    if vg_forecast is not None:
+        vg_forecast = np.asarray(vg_forecast, dtype=float)
+        if vg_forecast.shape[0] == G:
+            p_max[units.is_vg] = vg_forecast[units.is_vg]
+        else:
+            p_max[units.is_vg] = vg_forecast
+    p_max[units.is_out] = 0
+
+    # Commitment bounds: VG always on, outaged units off, initial minimum run/down times honoured
+    u_lb = np.zeros((G, T))
+    u_ub = np.ones((G, T))
+    u_lb[units.is_vg] = 1
+    u_ub[units.is_out] = 0
+    t = np.arange(T)
+    hours_done = np.floor(units.initial_hour / interval_hours)
+    must_run = units.initial_status & ~units.is_vg
+    must_stay_off = ~units.initial_status & ~units.is_vg
+    u_lb[must_run[:, None] & (t[None, :] < (units.min_run - hours_done)[:, None])] = 1
+    u_ub[must_stay_off[:, None] & (t[None, :] < (units.min_down - hours_done)[:, None])] = 0
+
+    m = LinearModel()
+    # Costs are per interval; prices are turned back into $/MWh with this
+    m.interval_hours = interval_hours
+    p = m.add_variables('p', (G, T), lb=0, ub=p_max, cost=units.energy_cost[:, None] * interval_hours)
+    u = m.add_variables('u', (G, T), lb=u_lb, ub=u_ub,
+                        cost=np.where(units.is_vg, 0.0, units.noload_cost)[:, None] * interval_hours, integer=True)
+    v = m.add_variables('v', (G, T), lb=0, ub=1, cost=np.where(units.is_vg, 0.0, units.startup_cost)[:, None])
+    w = m.add_variables('w', (G, T), lb=0, ub=1)
+    r = m.add_variables('r', (G, T), lb=0, ub=(units.reserve_ramp * reserve_time)[:, None])
+    shed = m.add_variables('shed', T, lb=0, ub=np.maximum(load, 0), cost=voll * interval_hours)
+    short = m.add_variables('reserve_short', T, lb=0, ub=reserve_requirement, cost=reserve_shortage_cost(model))
+
+    # System balance and reserve requirement
+    m.add_rows('balance', [(1.0, p.index.T), (1.0, shed.index)], lb=load, ub=load)
+    m.add_rows('reserve', [(1.0, r.index.T), (1.0, short.index)], lb=reserve_requirement)
+
+    flat = lambda block: block.index.ravel()
+    cap = np.repeat(units.capacity, T)
+    m.add_rows('capacity', [(1.0, flat(p)), (1.0, flat(r)), (-cap, flat(u))], ub=0)
+    m.add_rows('min_gen', [(1.0, flat(p)), (-np.repeat(units.min_gen, T), flat(u))], lb=0)
+
+    # Previous interval columns, -1 in the first interval where the initial state is used instead
+    prev = lambda block: np.concatenate([np.full((G, 1), -1), block.index[:, :-1]], axis=1).ravel()
+    first = np.zeros((G, T), dtype=bool)
+    first[:, 0] = True
+    first = first.ravel()
+    u0 = np.repeat(units.initial_status.astype(float), T) * first
+    p0 = np.repeat(units.initial_MW, T) * first
+    ramp = np.repeat(units.ramp, T)
+    su_ramp = np.repeat(units.startup_ramp, T)
+
+    # u[t] - u[t-1] = v[t] - w[t]
+    m.add_rows('logic', [(1.0, flat(u)), (-1.0, prev(u)), (-1.0, flat(v)), (1.0, flat(w))], lb=u0, ub=u0)
+    # p[t] - p[t-1] <= R u[t-1] + SU v[t]
+    m.add_rows('ramp_up', [(1.0, flat(p)), (-1.0, prev(p)), (-ramp, prev(u)), (-su_ramp, flat(v))],
+               ub=p0 + ramp * u0)
+    # p[t-1] - p[t] <= R u[t] + SD w[t]
+    m.add_rows('ramp_down', [(-1.0, flat(p)), (1.0, prev(p)), (-ramp, flat(u)), (-su_ramp, flat(w))],
+               ub=-p0)
+
+    # Minimum run time: starts within the last MR intervals imply on; minimum down time likewise
+    max_up = int(max(units.min_run.max(initial=1), 1))
+    max_down = int(max(units.min_down.max(initial=1), 1))
+    m.add_rows('min_run', [(1.0, _lagged(v.index, units.min_run, max_up).reshape(G * T, max_up)),
+                           (-1.0, flat(u))], ub=0)
+    m.add_rows('min_down', [(1.0, _lagged(w.index, units.min_down, max_down).reshape(G * T, max_down)),
+                            (1.0, flat(u))], ub=1)
+    return m, units
+
+class SCUCResult:
+    """Commitment, dispatch, reserves and prices of a solved unit commitment"""
+
+    def __init__(self, model, solution, lmp, status, message, objective):
+        self.status = status
+        self.message = message
+        self.objective = objective
+        self.commitment = np.rint(model.blocks['u'].values(solution)).astype(np.int8)
+        self.startup = np.rint(model.blocks['v'].values(solution)).astype(np.int8)
+        self.shutdown = np.rint(model.blocks['w'].values(solution)).astype(np.int8)
+        self.dispatch = model.blocks['p'].values(solution)
+        self.reserve = model.blocks['r'].values(solution)
+        self.shed = model.blocks['shed'].values(solution)
+        self.reserve_shortfall = model.blocks['reserve_short'].values(solution)
+        self.lmp = lmp
+        # Whether an incumbent was passed to the solver (see RTSCUC)
+        self.start = False
+
+    @property
+    def feasible(self):
+        return self.status == 0
+
+    def write(self, results, interval_time, stage):
+        """Stream this solve's commitment, dispatch, reserves and prices to a ResultsWriter"""
+        results.write(stage, interval_time, commitment=self.commitment, dispatch=self.dispatch,
+                      reserve=self.reserve, lmp=self.lmp, shed=self.shed, reserve_shortfall=self.reserve_shortfall)
+
+def price_commitment(session, commitment):
+    """Fix the commitment, re-solve the LP in session and return (solution, balance duals in $/MWh)"""
+    m = session.model
+    u = m.blocks['u'].index.ravel()
+    saved = m.lb[u].copy(), m.ub[u].copy()
+    m.set_var_bounds('u', lb=commitment, ub=commitment)
+    try:
+        solution = session.solve()
+    finally:
+        m.lb[u], m.ub[u] = saved
+    return solution, solution.duals[m.row_blocks['balance'].rows] / m.interval_hours
+
+def solve_scuc(m, integer=True, time_limit=None, mip_gap=None, start=None, session=None, cuts=()):
+    """
+    Solve an assembled unit commitment and price the resulting commitment.
+
+    cuts are NETWORK_CONSTRAINTS FlowCuts whose violated flow limits are
+    added to m and re-solved until none is violated, for the commitment
+    and again for the priced dispatch.
+    """
+    if session is None:
+        session = m.session()
+    result = enforce(lambda: session.solve(integer=integer, start=start, time_limit=time_limit, mip_gap=mip_gap),
+                     m, cuts)
+    if result.x is None:
+        T = m.blocks['p'].shape[1]
+        return SCUCResult(m, np.zeros(m.nvars), np.full(T, np.nan), result.status, result.message, np.nan)
+    commitment = np.rint(m.blocks['u'].values(result.x)) if integer else m.blocks['u'].values(result.x)
+    lp_result = enforce(lambda: price_commitment(session, commitment)[0], m, cuts)
+    lmp = lp_result.duals[m.row_blocks['balance'].rows] / m.interval_hours
+    solution = lp_result.x if lp_result.status == 0 else result.x
+    return SCUCResult(m, solution, lmp, result.status, result.message, result.objective)
+
+def solve_dascuc(model, load, vg_forecast=None, reserve_requirement=None, interval_hours=1.0,
+                 integer=True, time_limit=None, mip_gap=None, backend=None, cuts=()):
+    """Build and solve the DASCUC for the given hourly load, VG forecast and reserve requirement"""
+    m, _ = build_scuc(model, load, vg_forecast, reserve_requirement, interval_hours)
+    return solve_scuc(m, integer, time_limit, mip_gap, session=m.session(backend), cuts=cuts)
+
+# Example usage:
+# if __name__ == "__main__":
+#     result = solve_dascuc(system_model, DAC_load_forecast, DAC_vg_forecast,
+#                           integer=run_config.USE_INTEGER_in == 'YES', backend=get_backend(run_config),
+#                           cuts=network_cuts(system_model, run_config))
+#     print(result.commitment, result.lmp)
@@ -1,307 +1,323 @@
-import pandas as pd
-import h5py
 import os
+import types
 import settings
+from input_cache import cached_input_file
 
-def load_system_indices():
+# Tabs whose headers are needed to declare the indices. Column A of the
+# SYSTEM tab holds the property names, the other tabs list them across row 1.
+INPUT_TABS = ('SYSTEM', 'GEN', 'STORAGE', 'RESERVEPARAM', 'BRANCHDATA')
+
+# Header maps already read, keyed by (input path, mtime) so that repeated
+# runs against an unchanged input file skip the I/O entirely.
+_header_cache = {}
+
+GEN_PARAMS = {
+    'capacity': 'CAPACITY',
+    'noload_cost': 'NO_LOAD_COST',
+    'su_cost': 'STARTUP_COST',
+    'mr_time': 'MIN_RUN_TIME',
+    'md_time': 'MIN_DOWN_TIME',
+    'ramp_rate': 'RAMP_RATE',
+    'min_gen': 'MIN_GEN',
+    'gen_type': 'GEN_TYPE',
+    'su_time': 'STARTUP_TIME',
+    'sd_time': 'SHUTDOWN_TIME',
+    'agc_qualified': 'AGC_QUALIFIED',
+    'max_starts': 'MAX_STARTS',
+    'initial_status': 'INITIAL_STATUS',
+    'initial_hour': 'INITIAL_HOUR',
+    'initial_MW': 'INITIAL_MW',
+    'forced_outage_rate': 'FORCED_OUTAGE_RATE',
+    'mttr': 'MTTR',
+    'variable_start': 'VARIABLE_STARTUP',
+    'behavior_rate': 'BEHAVIOR_RATE',
+    'inertia': 'INERTIA',
+    'droop': 'DROOP',
+    'gov_db': 'GOV_DB',
+    'gov_beta': 'GOV_BETA',
+    'gov_tg': 'GOV_TG',
+    'gen_agc_mode': 'GEN_AGC_MODE',
+    'q_max': 'Q_MAX',
+    'q_min': 'Q_MIN',
+    'pucost': 'PERUNIT_COST'
+}
+
+STORAGE_PARAMS = {
+    'max_pump': 'MAX_PUMP',
+    'min_pump': 'MIN_PUMP',
+    'min_pump_time': 'MIN_PUMP_TIME',
+    'pump_su_time': 'PUMP_STARTUP_TIME',
+    'pump_sd_time': 'PUMP_SHUTDOWN_TIME',
+    'pump_ramp_rate': 'PUMP_RAMP_RATE',
+    'initial_storage': 'INITIAL_STORAGE',
+    'final_storage': 'FINAL_STORAGE',
+    'storage_max': 'STORAGE_MAX',
+    'efficiency': 'EFFICIENCY',
+    'reservoir_value': 'RESERVOIR_VALUE',
+    'initial_pump_status': 'INITIAL_PUMP_STATUS',
+    'initial_pump_mw': 'INITIAL_PUMP_MW',
+    'initial_pump_hour': 'INITIAL_PUMP_HOUR',
+    'variable_efficiency': 'VARIABLE_EFFICIENCY',
+    'enforce_final_storage': 'ENFORCE_FINAL_STORAGE'
+}
+
+RESERVE_PARAMS = {
+    'res_on': 'RESERVE_ON',
+    'res_time': 'RESERVE_TIME',
+    'res_dir': 'RESERVE_DIR',
+    'res_agc': 'RESERVE_AGC',
+    'res_gov': 'RESERVE_GOV',
+    'res_inertia': 'RESERVE_INERTIA',
+    'res_inclusive': 'RESERVE_INCLUSIVE',
+    'res_vg': 'RESERVE_VG',
+    'res_voir': 'VOIR'
+}
+
+BRANCH_PARAMS = {
+    'reactance': 'REACTANCE',
+    'resistance': 'RESISTANCE',
+    'line_rating': 'LINE_RATING',
+    'ste_rating': 'STE_RATING',
+    'par_low': 'PHASE_SHIFTER_ANGLE_LOW',
+    'par_hi': 'PHASE_SHIFTER_ANGLE_HIGH',
+    'ctgc_monitor': 'CTGC_MONITOR',
+    'branch_type': 'BRANCH_TYPE',
+    'susceptance': 'SUSCEPTANCE'
+}
+
+def get_input_file(config=settings):
+    """Return the file the input tabs are read from (the workbook, its parsed-input cache or its .h5)"""
+    if config.useHDF5 == 0:
+        if config.cache_excel_inputs:
+            return cached_input_file(config.inputPath)
+        return config.inputPath
+    input_dir = os.path.dirname(config.inputPath)
+    input_name = os.path.splitext(os.path.basename(config.inputPath))[0]
+    return os.path.join(input_dir, f"{input_name}.h5")
+
+def _read_excel_headers(fileName):
+    """Read the headers of every input tab from one open workbook"""
+    # pandas/h5py are imported where they are used, keeping them off the startup path
+    import pandas as pd
+    headers = {}
+    with pd.ExcelFile(fileName) as xls:
+        for tab in INPUT_TABS:
+            if tab not in xls.sheet_names:
+                headers[tab] = None
+            elif tab == 'SYSTEM':
+                df = xls.parse(sheet_name=tab, usecols='A:A', nrows=20)
+                headers[tab] = df.iloc[:, 0].tolist()
+            else:
+                # Header row only, columns B:AZ
+                df = xls.parse(sheet_name=tab, nrows=0)
+                headers[tab] = df.columns.tolist()[1:52]
+    return headers
+
+def _read_hdf5_headers(fileName):
+    """Read the headers of every input tab from one open .h5 file"""
+    import h5py
+    headers = {}
+    with h5py.File(fileName, 'r') as f:
+        main_input = f['/Main Input File']
+        for tab in INPUT_TABS:
+            if tab not in main_input:
+                headers[tab] = None
+            elif tab == 'SYSTEM':
+                props = main_input[tab]['Property'][:]
+                headers[tab] = [h.decode() if isinstance(h, bytes) else h for h in props]
+            elif tab == 'BRANCHDATA':
+                headers[tab] = list(main_input[tab].keys())
+            else:
+                headers[tab] = list(main_input[tab].keys())[1:]  # Skip first field
+    return headers
+
+def load_input_headers(fileName=None):
+    """Return the header map of all input tabs, reading the input file at most once per mtime"""
+    if fileName is None:
+        fileName = get_input_file()
+    key = (os.path.abspath(fileName), os.path.getmtime(fileName))
+    headers = _header_cache.get(key)
+    if headers is None:
+        if os.path.splitext(fileName)[1].lower() == '.h5':
+            headers = _read_hdf5_headers(fileName)
+        else:
+            headers = _read_excel_headers(fileName)
+        _header_cache[key] = headers
+    return headers
+
+def _set_indices(params, headers, target):
+    """Set the 1-based column index of each parameter on target"""
+    for param, header_name in params.items():
+        try:
+            setattr(target, param, headers.index(header_name) + 1)
+        except ValueError:
+            setattr(target, param, None)
+
+def load_system_indices(headers=None, target=settings):
     """Load SYSTEM tab indices"""
     
-    if settings.useHDF5 == 0:
-        # Read from Excel file
-        df = pd.read_excel(settings.inputPath, sheet_name='SYSTEM', usecols='A:A', nrows=20)
-        headers = df.iloc[:, 0].tolist()
-    else:
-        # Read from HDF5 file
-        input_dir = os.path.dirname(settings.inputPath)
-        input_name = os.path.splitext(os.path.basename(settings.inputPath))[0]
-        fileName = os.path.join(input_dir, f"{input_name}.h5")
-        
-        with h5py.File(fileName, 'r') as f:
-            headers = f['/Main Input File/SYSTEM']['Property'][:]
-            headers = [h.decode() if isinstance(h, bytes) else h for h in headers]
+    if headers is None:
+        headers = load_input_headers()['SYSTEM']
     
     # Find indices for each parameter
     try:
-        settings.slack_bus = headers.index('SLACK_BUS') + 1  # +1 for MATLAB 1-based indexing
+        target.slack_bus = headers.index('SLACK_BUS') + 1  # +1 for MATLAB 1-based indexing
     except ValueError:
-        settings.slack_bus = None
+        target.slack_bus = None
         
     try:
-        settings.mva_pu = headers.index('MVA_PERUNIT') + 1
+        target.mva_pu = headers.index('MVA_PERUNIT') + 1
     except ValueError:
-        settings.mva_pu = None
+        target.mva_pu = None
         
     try:
-        settings.voll = headers.index('VOLL') + 1
+        target.voll = headers.index('VOLL') + 1
     except ValueError:
-        settings.voll = None
+        target.voll = None
     
     # Optional parameters with try-catch equivalent
     try:
-        settings.inertia_load = headers.index('INERTIALOAD') + 1
+        target.inertia_load = headers.index('INERTIALOAD') + 1
     except ValueError:
-        settings.inertia_load = None
+        target.inertia_load = None
         
     try:
-        settings.dfmax = headers.index('DFMAX') + 1
+        target.dfmax = headers.index('DFMAX') + 1
     except ValueError:
-        settings.dfmax = None
+        target.dfmax = None
         
     try:
-        settings.load_damping = headers.index('LOAD_DAMPING') + 1
+        target.load_damping = headers.index('LOAD_DAMPING') + 1
     except ValueError:
-        settings.load_damping = None
+        target.load_damping = None
         
     try:
-        settings.db_max = headers.index('DBMAX') + 1
+        target.db_max = headers.index('DBMAX') + 1
     except ValueError:
-        settings.db_max = None
+        target.db_max = None
         
     try:
-        settings.frequency = headers.index('FREQUENCY') + 1
+        target.frequency = headers.index('FREQUENCY') + 1
     except ValueError:
-        settings.frequency = None
+        target.frequency = None
         
     try:
-        settings.first_stage_startup = headers.index('FIRST_STAGE_STARTUP') + 1
+        target.first_stage_startup = headers.index('FIRST_STAGE_STARTUP') + 1
     except ValueError:
-        settings.first_stage_startup = None
+        target.first_stage_startup = None
 
-def load_gen_indices():
+def load_gen_indices(headers=None, target=settings):
     """Load GEN tab indices"""
     
-    if settings.useHDF5 == 0:
-        # Read from Excel file
-        df = pd.read_excel(settings.inputPath, sheet_name='GEN', usecols='B:AZ', nrows=1)
-        headers = df.columns.tolist()
-    else:
-        input_dir = os.path.dirname(settings.inputPath)
-        input_name = os.path.splitext(os.path.basename(settings.inputPath))[0]
-        fileName = os.path.join(input_dir, f"{input_name}.h5")
-        
-        with h5py.File(fileName, 'r') as f:
-            gen_data = f['/Main Input File/GEN']
-            headers = list(gen_data.keys())[1:]  # Skip first field
+    if headers is None:
+        headers = load_input_headers()['GEN']
     
     # Map all GEN parameters
-    gen_params = {
-        'capacity': 'CAPACITY',
-        'noload_cost': 'NO_LOAD_COST',
-        'su_cost': 'STARTUP_COST',
-        'mr_time': 'MIN_RUN_TIME',
-        'md_time': 'MIN_DOWN_TIME',
-        'ramp_rate': 'RAMP_RATE',
-        'min_gen': 'MIN_GEN',
-        'gen_type': 'GEN_TYPE',
-        'su_time': 'STARTUP_TIME',
-        'sd_time': 'SHUTDOWN_TIME',
-        'agc_qualified': 'AGC_QUALIFIED',
-        'max_starts': 'MAX_STARTS',
-        'initial_status': 'INITIAL_STATUS',
-        'initial_hour': 'INITIAL_HOUR',
-        'initial_MW': 'INITIAL_MW',
-        'forced_outage_rate': 'FORCED_OUTAGE_RATE',
-        'mttr': 'MTTR',
-        'variable_start': 'VARIABLE_STARTUP',
-        'behavior_rate': 'BEHAVIOR_RATE',
-        'inertia': 'INERTIA',
-        'droop': 'DROOP',
-        'gov_db': 'GOV_DB',
-        'gov_beta': 'GOV_BETA',
-        'gov_tg': 'GOV_TG',
-        'gen_agc_mode': 'GEN_AGC_MODE',
-        'q_max': 'Q_MAX',
-        'q_min': 'Q_MIN',
-        'pucost': 'PERUNIT_COST'
-    }
-    
-    for param, header_name in gen_params.items():
-        try:
-            setattr(settings, param, headers.index(header_name) + 1)
-        except ValueError:
-            setattr(settings, param, None)
+    _set_indices(GEN_PARAMS, headers, target)
 
-def load_storage_indices():
+def load_storage_indices(headers=None, target=settings):
     """Load STORAGE tab indices"""
     
-    try:
-        if settings.useHDF5 == 0:
-            df = pd.read_excel(settings.inputPath, sheet_name='STORAGE', usecols='B:AZ', nrows=1)
-            headers = df.columns.tolist()
-        else:
-            input_dir = os.path.dirname(settings.inputPath)
-            input_name = os.path.splitext(os.path.basename(settings.inputPath))[0]
-            fileName = os.path.join(input_dir, f"{input_name}.h5")
-            
-            with h5py.File(fileName, 'r') as f:
-                storage_data = f['/Main Input File/STORAGE']
-                headers = list(storage_data.keys())[1:]  # Skip first field
-        
-        storage_params = {
-            'max_pump': 'MAX_PUMP',
-            'min_pump': 'MIN_PUMP',
-            'min_pump_time': 'MIN_PUMP_TIME',
-            'pump_su_time': 'PUMP_STARTUP_TIME',
-            'pump_sd_time': 'PUMP_SHUTDOWN_TIME',
-            'pump_ramp_rate': 'PUMP_RAMP_RATE',
-            'initial_storage': 'INITIAL_STORAGE',
-            'final_storage': 'FINAL_STORAGE',
-            'storage_max': 'STORAGE_MAX',
-            'efficiency': 'EFFICIENCY',
-            'reservoir_value': 'RESERVOIR_VALUE',
-            'initial_pump_status': 'INITIAL_PUMP_STATUS',
-            'initial_pump_mw': 'INITIAL_PUMP_MW',
-            'initial_pump_hour': 'INITIAL_PUMP_HOUR',
-            'variable_efficiency': 'VARIABLE_EFFICIENCY',
-            'enforce_final_storage': 'ENFORCE_FINAL_STORAGE'
-        }
-        
-        for param, header_name in storage_params.items():
-            try:
-                setattr(settings, param, headers.index(header_name) + 1)
-            except ValueError:
-                setattr(settings, param, None)
-                
-    except Exception:
-        # If STORAGE tab doesn't exist or has issues, skip
-        pass
+    if headers is None:
+        headers = load_input_headers()['STORAGE']
+    
+    # If STORAGE tab doesn't exist, skip
+    if headers is not None:
+        _set_indices(STORAGE_PARAMS, headers, target)
 
-def load_reserve_indices():
+def load_reserve_indices(headers=None, target=settings):
     """Load RESERVE tab indices"""
     
-    try:
-        if settings.useHDF5 == 0:
-            df = pd.read_excel(settings.inputPath, sheet_name='RESERVEPARAM', usecols='B:AZ', nrows=1)
-            headers = df.columns.tolist()
-        else:
-            input_dir = os.path.dirname(settings.inputPath)
-            input_name = os.path.splitext(os.path.basename(settings.inputPath))[0]
-            fileName = os.path.join(input_dir, f"{input_name}.h5")
-            
-            with h5py.File(fileName, 'r') as f:
-                reserve_data = f['/Main Input File/RESERVEPARAM']
-                headers = list(reserve_data.keys())[1:]  # Skip first field
-        
-        reserve_params = {
-            'res_on': 'RESERVE_ON',
-            'res_time': 'RESERVE_TIME',
-            'res_dir': 'RESERVE_DIR',
-            'res_agc': 'RESERVE_AGC',
-            'res_gov': 'RESERVE_GOV',
-            'res_inertia': 'RESERVE_INERTIA',
-            'res_inclusive': 'RESERVE_INCLUSIVE',
-            'res_vg': 'RESERVE_VG',
-            'res_voir': 'VOIR'
-        }
-        
-        for param, header_name in reserve_params.items():
-            try:
-                setattr(settings, param, headers.index(header_name) + 1)
-            except ValueError:
-                setattr(settings, param, None)
-                
-    except Exception:
-        # If RESERVEPARAM tab doesn't exist or has issues, skip
-        pass
+    if headers is None:
+        headers = load_input_headers()['RESERVEPARAM']
+    
+    # If RESERVEPARAM tab doesn't exist, skip
+    if headers is not None:
+        _set_indices(RESERVE_PARAMS, headers, target)
 
-def load_branch_indices():
+def load_branch_indices(headers=None, target=settings):
     """Load BRANCH tab indices"""
     
-    try:
-        if settings.useHDF5 == 0:
-            df = pd.read_excel(settings.inputPath, sheet_name='BRANCHDATA', usecols='B:AZ', nrows=1)
-            headers = df.columns.tolist()
-        else:
-            input_dir = os.path.dirname(settings.inputPath)
-            input_name = os.path.splitext(os.path.basename(settings.inputPath))[0]
-            fileName = os.path.join(input_dir, f"{input_name}.h5")
-            
-            with h5py.File(fileName, 'r') as f:
-                branch_data = f['/Main Input File/BRANCHDATA']
-                headers = list(branch_data.keys())
-        
-        branch_params = {
-            'reactance': 'REACTANCE',
-            'resistance': 'RESISTANCE',
-            'line_rating': 'LINE_RATING',
-            'ste_rating': 'STE_RATING',
-            'par_low': 'PHASE_SHIFTER_ANGLE_LOW',
-            'par_hi': 'PHASE_SHIFTER_ANGLE_HIGH',
-            'ctgc_monitor': 'CTGC_MONITOR',
-            'branch_type': 'BRANCH_TYPE',
-            'susceptance': 'SUSCEPTANCE'
-        }
-        
-        # Find indices
-        indices = {}
-        for param, header_name in branch_params.items():
-            try:
-                indices[param] = headers.index(header_name) + 1
-            except ValueError:
-                indices[param] = None
-        
-        # Calculate offset (equivalent to MATLAB offset calculation)
-        valid_indices = [idx for idx in indices.values() if idx is not None]
-        if valid_indices:
-            firstcol = min(valid_indices)
-            offset = 1 - firstcol
-            
-            # Apply offset to all indices
-            for param in branch_params.keys():
-                if indices[param] is not None:
-                    setattr(settings, param, indices[param] + offset)
-                else:
-                    setattr(settings, param, None)
+    if headers is None:
+        headers = load_input_headers()['BRANCHDATA']
+    
+    # If BRANCHDATA tab doesn't exist, skip
+    if headers is None:
+        return
+    
+    # Find indices
+    indices = {}
+    for param, header_name in BRANCH_PARAMS.items():
+        try:
+            indices[param] = headers.index(header_name) + 1
+        except ValueError:
+            indices[param] = None
+    
+    # Calculate offset (equivalent to MATLAB offset calculation)
+    valid_indices = [idx for idx in indices.values() if idx is not None]
+    if valid_indices:
+        firstcol = min(valid_indices)
+        offset = 1 - firstcol
         
-    except Exception:
-        # If BRANCHDATA tab doesn't exist or has issues, skip
-        pass
+        # Apply offset to all indices
+        for param in BRANCH_PARAMS.keys():
+            if indices[param] is not None:
+                setattr(target, param, indices[param] + offset)
+            else:
+                setattr(target, param, None)
 
-def load_ace_indices():
+def load_ace_indices(target=settings):
     """Load ACE indices (these are fixed)"""
-    settings.ACE_time_index = 1
-    settings.raw_ACE_index = 2
-    settings.integrated_ACE_index = 3
-    settings.CPS2_ACE_index = 4
-    settings.SACE_index = 5
-    settings.AACEE_index = 6
+    target.ACE_time_index = 1
+    target.raw_ACE_index = 2
+    target.integrated_ACE_index = 3
+    target.CPS2_ACE_index = 4
+    target.SACE_index = 5
+    target.AACEE_index = 6
 
-def load_type_indices():
+def load_type_indices(target=settings):
     """Load generator and branch type indices (these are fixed)"""
     
     # Generator types
-    settings.steam_gen_type_index = 1
-    settings.CT_gen_type_index = 2
-    settings.combined_cycle_gen_type_index = 3
-    settings.hydro_gen_type_index = 4
-    settings.nuclear_gen_type_index = 5
-    settings.pumped_storage_gen_type_index = 6
-    settings.wind_gen_type_index = 7
-    settings.ESR_gen_type_index = 8
-    settings.LESR_gen_type_index = 9
-    settings.PV_gen_type_index = 10
-    settings.CSP_gen_type_index = 11
-    settings.demandresponse_gen_type_index = 12
-    settings.virtual_gen_type_index = 13
-    settings.interface_gen_type_index = 14
-    settings.outage_gen_type_index = 15
-    settings.variable_dispatch_gen_type_index = 16
+    target.steam_gen_type_index = 1
+    target.CT_gen_type_index = 2
+    target.combined_cycle_gen_type_index = 3
+    target.hydro_gen_type_index = 4
+    target.nuclear_gen_type_index = 5
+    target.pumped_storage_gen_type_index = 6
+    target.wind_gen_type_index = 7
+    target.ESR_gen_type_index = 8
+    target.LESR_gen_type_index = 9
+    target.PV_gen_type_index = 10
+    target.CSP_gen_type_index = 11
+    target.demandresponse_gen_type_index = 12
+    target.virtual_gen_type_index = 13
+    target.interface_gen_type_index = 14
+    target.outage_gen_type_index = 15
+    target.variable_dispatch_gen_type_index = 16
     
     # Branch types
-    settings.transmission_line_branch_type_index = 1
-    settings.fixed_par_branch_type_index = 2
-    settings.adj_par_branch_type_index = 3
-    settings.HVDC_branch_type_index = 4
+    target.transmission_line_branch_type_index = 1
+    target.fixed_par_branch_type_index = 2
+    target.adj_par_branch_type_index = 3
+    target.HVDC_branch_type_index = 4
 
-def load_all_indices():
+def load_all_indices(target=settings, fileName=None):
     """Load all tab indices"""
-    load_system_indices()
-    load_gen_indices()
-    load_storage_indices()
-    load_reserve_indices()
-    load_branch_indices()
-    load_ace_indices()
-    load_type_indices()
+    headers = load_input_headers(fileName)
+    load_system_indices(headers['SYSTEM'], target)
+    load_gen_indices(headers['GEN'], target)
+    load_storage_indices(headers['STORAGE'], target)
+    load_reserve_indices(headers['RESERVEPARAM'], target)
+    load_branch_indices(headers['BRANCHDATA'], target)
+    load_ace_indices(target)
+    load_type_indices(target)
+
+def declare_indices(fileName=None):
+    """Return all tab indices as a dict instead of setting them on settings"""
+    indices = types.SimpleNamespace()
+    load_all_indices(indices, fileName)
+    return vars(indices)
 
 # Usage:
 # if __name__ == "__main__":
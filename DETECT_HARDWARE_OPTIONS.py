@@ -7,7 +7,13 @@
 from GUI_HPC_OPTIONS import *
 import settings
 import platform 
-import matplotlib
+import os
+
+def gui_backend_available():
+    """Check whether matplotlib runs on a Qt backend that can open windows"""
+    # Imported here so that headless runs never load matplotlib
+    import matplotlib
+    return matplotlib.get_backend().lower().startswith('qt')
 
 def detect_hardware_options():
     gui_hpc_options()
@@ -18,8 +24,12 @@ def detect_hardware_options():
         #read_tmps_txt_file()
         #create gams no gui()
         settings.use_gui=0
+
+    if os.environ.get('FESTIV_HEADLESS') == '1':
+        # started through FESTIV_HEADLESS.py
+        settings.use_gui=0
     
-    if (settings.use_gui) and not(matplotlib.get_backend().lower().startswith('qt')):
+    if (settings.use_gui) and not gui_backend_available():
         print(f"Warning use_gui was set to True but cannot open windows")
         settings.use_gui=0
 
@@ -38,10 +38,15 @@ from settings import *
 from reset_settings import *
 from DETECT_HARDWARE_OPTIONS import *
 from FESTIV_ADDL_OPTIONS import *
-import matplotlib
 from FESTIVBANNER import *
 from getsgamspath import *
 from DECLARE_INDICES import *
+from SYSTEM_MODEL import *
+from config_store import load_config, config_paths
+from run_config import RunConfig
+from run_context import RunContext
+from TIME_GRID import TimeGrid, on_boundary
+import settings
 
 
 warnings.filterwarnings('ignore')
@@ -54,14 +59,14 @@ if execution_from_previous==0 or starting_execution_script == "FESTIV.py":
     # print("executing the FESTIV script now!") (checked if FESTIV only executing)
 
 if execution_from_previous:
-    eps = sys.float_info.epsilon
-    mod_val = (time * 60) % tRTC
-    if abs(mod_val) < eps or abs(tRTC - mod_val) < eps:
+    #time is in hours and tRTC in minutes, compare in whole seconds
+    if on_boundary(time * 3600, tRTC * 60):
         RTSCUC_binding_interval_index -= 1
 else:
     pass
 
-reset_settings_to_zero(use_float=True)
+#start from the declared settings.py values (arrays keep their shape), not from zeros
+reset_settings_to_defaults()
 execution_from_previous=0;
 
 # #Detect Hardware Options Now!
@@ -71,7 +76,7 @@ detect_hardware_options()
 #User options to be seen throughout , a number of different options to change from default values if the user wishes to modify the file 
 festiv_addl_options()
 
-if (matplotlib.get_backend().lower().startswith('qt')) and use_gui:
+if settings.use_gui and gui_backend_available():
     # print("code working fine till now , now use WINDOWS")
     #instead of loading TEMPWS , I have converted the TEMPWS file to the setting2.py file
     cancel = 1
@@ -86,6 +91,9 @@ while(finishedrunningFESTIV!=1):
         if execution_from_previous==0 or time==start_time:
             tStart = tic
             festiv_banner()
+    if not settings.use_gui:
+        #no GUI to finish the run in headless (batch/HPC) mode, so leave the loop after the banner
+        finishedrunningFESTIV = 1
 
 #Data and Initialization
 
@@ -95,6 +103,10 @@ if multiplefilecheck:
     qq_final = qq
     #declare the input path
 
+#binary config of this run (written by mat_converter.convert_mat_to_config) is mapped lazily
+if os.path.exists(config_paths(f'settings{numberofFESTIVrun}')[1]):
+    load_config(f'settings{numberofFESTIVrun}').apply_to(settings)
+
 #now adding the GAMS PATH 
 gamspath=getgamspath()
 
@@ -112,4 +124,18 @@ gamspath=getgamspath()
 #setting indices based on how user input file is listed
 load_all_indices()
 
-    
\ No newline at end of file
+#immutable options of this run, passed explicitly to the stages instead of reading settings
+run_config = RunConfig.from_source(settings, load_indices=True)
+
+#fresh per-run state; parsed inputs and other run-invariant data are shared across the numberofFESTIVrun loop
+#closing the context at the end of the run writes the pending results and closes the results file
+with RunContext(run_config, numberofFESTIVrun) as run_context:
+
+    #columnar copy of the GEN/STORAGE/BRANCHDATA/RESERVEPARAM tabs used by the scheduling and AGC stages
+    system_model = run_context.system_model
+
+    #per-interval RTSCUC/RTSCED results streamed to FESTIV_RESULTS_<run>.h5, None when stream_results is off
+    results = run_context.results
+
+    #integer-indexed DAC/RTC/RTD/AGC interval tables used by the main loop
+    time_grid = TimeGrid(run_config)
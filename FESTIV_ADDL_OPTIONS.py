@@ -26,10 +26,10 @@ def festiv_addl_options():
     # %Whether to stop with a breakpoint if there are any infeasibilities.
     settings.Stop_for_Infeasibilities = 1
 
-    # %Absolute Line Flow Exceedance in Energy (ALFEE) Monitoring. ALFEE
-    # %calculations can take substantial computation time and should only be
-    # %monitored if a focus is to look at the exceedance in actual time
-    # %resolution.
+    # %Absolute Line Flow Exceedance in Energy (ALFEE) Monitoring at actual
+    # %time resolution. Off by default. With 1, ALFEEMonitor.from_config gives
+    # %a monitor that the AGC loop pushes every step (see ALFEE.py); it keeps
+    # %running totals only, without storing line flow history.
     settings.monitor_ALFEE = 0
 
     # %Pump parameters. Fix_RT_Pump of 1 if the real-time RTSCUC fixes the PSH (GEN_TYPE = 6) mode in
@@ -84,6 +84,16 @@ def festiv_addl_options():
     settings.rtd_vg_error = np.zeros((5, 1))
     settings.rtd_load_error = np.zeros((5, 1))
 
+    # %Seed of the forecast errors. Every run of a batch draws from its own
+    # %stream spawned from this seed (see FORECAST.py), so runs are independent
+    # %and a run can be reproduced exactly on its own.
+    settings.forecast_seed = 0
+
+    # %Seed of the sampled forced outages (FORCED_OUTAGE_RATE and MTTR of the
+    # %GEN tab). Each run of a batch draws its outage timelines from its own
+    # %stream spawned from this seed (see FORCED_OUTAGE.py).
+    settings.outage_seed = 0
+
     # %Dispatch Schedule Type (CURRENTLY NOT COMPLETE)
     # %{
     # 1: normal for dispatch that ramps continuously to meet schedule.
@@ -103,4 +113,15 @@ def festiv_addl_options():
     settings.RTCPrintResults = 0
     settings.RTDPrintResults = 0
 
+    # %Per-interval RTSCUC/RTSCED results (dispatch, commitment, LMP, reserves,
+    # %flows) are streamed to a compressed HDF5 file, FESTIV_RESULTS_<run>.h5,
+    # %by a background writer (results_writer.py). This is cheap enough to leave
+    # %on for every interval; set to 0 to write no results file.
+    settings.stream_results = 1
+
+    # %Excel inputs (useHDF5 of 0) are parsed once and cached next to the
+    # %workbook as <name>.cache.h5. The cache is rebuilt whenever the workbook
+    # %contents change. Set to 0 to always read the workbook directly.
+    settings.cache_excel_inputs = 1
+
     settings.eps = 0.0000001
\ No newline at end of file
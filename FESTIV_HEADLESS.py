@@ -0,0 +1,25 @@
+# % Headless FESTIV entry point for batch and HPC runs.
+# %
+# % Runs FESTIV.py with the GUI forced off. The GUI, plotting and Excel
+# % libraries are then only imported if a run actually needs them (e.g. an
+# % .xlsx input that has no parsed-input cache yet). At the end the time
+# % spent importing modules is printed so startup regressions are visible.
+# %
+# % To start, type python FESTIV_HEADLESS.py in the terminal
+
+import os
+import runpy
+import time
+from import_timing import ImportTimer
+
+if __name__ == "__main__":
+    os.environ['FESTIV_HEADLESS'] = '1'
+    festiv_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'FESTIV.py')
+    start = time.perf_counter()
+    import_timer = ImportTimer()
+    try:
+        with import_timer:
+            runpy.run_path(festiv_script, run_name='__main__')
+    finally:
+        print(f"FESTIV wall time: {time.perf_counter() - start:.2f} s")
+        import_timer.report()
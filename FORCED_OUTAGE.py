@@ -0,0 +1,151 @@
+# % Forced outages of generating units.
+# %
+# % Each unit alternates between available and forced out: time to failure
+# % is exponential with mean MTTF = MTTR (1 - FOR) / FOR, so that FOR
+# % (FORCED_OUTAGE_RATE) is the long-run fraction of time out, and time to
+# % repair is exponential with mean MTTR (hours). Instead of a random draw
+# % per unit per AGC step, the whole horizon's outage and repair events of
+# % every unit are sampled up front for any number of Monte Carlo replicas
+# % at once, one vectorized round per failure, and kept as event arrays
+# % sorted by replica and time. The real-time loop only reads the events
+# % that fall in the current interval.
+# %
+# % FORCED_OUTAGE_PRE_in/FORCED_OUTAGE_POST_in functional mods still run
+# % around the outage handling in the main loop.
+
+import numpy as np
+
+class OutageTimeline:
+    """
+    Sampled outage (failed True) and repair (failed False) events.
+
+    time (seconds from the start of the run), unit (GEN row) and failed
+    are sorted by replica then time; the events of replica r are
+    [offsets[r], offsets[r + 1]). Units start available.
+    """
+
+    def __init__(self, time, unit, failed, offsets, ngen, horizon):
+        self.time = time
+        self.unit = unit
+        self.failed = failed
+        self.offsets = offsets
+        self.ngen = ngen
+        self.horizon = horizon
+
+    @property
+    def replicas(self):
+        return len(self.offsets) - 1
+
+    def events(self, replica, start, stop):
+        """(time, unit, failed) views of a replica's events with start <= time < stop"""
+        first, last = self.offsets[replica], self.offsets[replica + 1]
+        lo, hi = first + np.searchsorted(self.time[first:last], [start, stop])
+        return self.time[lo:hi], self.unit[lo:hi], self.failed[lo:hi]
+
+    def available(self, replica, time):
+        """(ngen,) availability of every unit of a replica at time (after the events at time)"""
+        _, unit, failed = self.events(replica, 0, time + 1)
+        status = np.ones(self.ngen, dtype=bool)
+        # Last event of each unit decides its state
+        units, last = np.unique(unit[::-1], return_index=True)
+        status[units] = ~failed[::-1][last]
+        return status
+
+    def outage_counts(self):
+        """(replicas, ngen) number of forced outages of every unit"""
+        counts = np.zeros((self.replicas, self.ngen), dtype=np.int64)
+        replica = np.repeat(np.arange(self.replicas), np.diff(self.offsets))
+        np.add.at(counts, (replica[self.failed], self.unit[self.failed]), 1)
+        return counts
+
+    def cursor(self, replica):
+        """OutageCursor over the events of one replica"""
+        return OutageCursor(self, replica)
+
+class OutageCursor:
+    """Walks one replica's events forward in time for the real-time loop"""
+
+    def __init__(self, timeline, replica):
+        self.timeline = timeline
+        self.position = timeline.offsets[replica]
+        self.stop = timeline.offsets[replica + 1]
+
+    def advance(self, until):
+        """(time, unit, failed) of the events before until not returned yet"""
+        t = self.timeline
+        end = self.position + np.searchsorted(t.time[self.position:self.stop], until)
+        events = t.time[self.position:end], t.unit[self.position:end], t.failed[self.position:end]
+        self.position = end
+        return events
+
+def sample_outages(forced_outage_rate, mttr, horizon_seconds, replicas, rng):
+    """
+    Sample an OutageTimeline of every unit over horizon_seconds for replicas replicas.
+
+    Units with no FOR or MTTR never fail; a FOR of 1 or more fails the unit
+    at the start for good.
+    """
+    rate = np.asarray(forced_outage_rate, dtype=float)
+    mttr = np.asarray(mttr, dtype=float)
+    ngen = len(rate)
+    always_out = rate >= 1
+    random = (rate > 0) & (mttr > 0) & ~always_out
+
+    units = np.flatnonzero(random)
+    mean_up = np.tile(mttr[units] * (1 - rate[units]) / rate[units] * 3600, replicas)
+    mean_down = np.tile(mttr[units] * 3600, replicas)
+    pairs = np.arange(replicas * len(units))
+    clock = np.zeros(len(pairs))
+    times, which, kinds = [], [], []
+
+    # One round draws the next failure and repair of every unit still inside the horizon
+    active = pairs
+    while active.size:
+        fail = clock[active] + rng.exponential(mean_up[active])
+        repair = fail + rng.exponential(mean_down[active])
+        inside = fail < horizon_seconds
+        repaired = inside & (repair < horizon_seconds)
+        times += [fail[inside], repair[repaired]]
+        which += [active[inside], active[repaired]]
+        kinds += [np.ones(inside.sum(), dtype=bool), np.zeros(repaired.sum(), dtype=bool)]
+        clock[active] = repair
+        active = active[repaired]
+
+    pair = np.concatenate(which) if which else np.empty(0, dtype=np.int64)
+    replica = pair // max(len(units), 1)
+    unit = units[pair % max(len(units), 1)] if len(units) else pair
+    time = np.concatenate(times) if times else np.empty(0)
+    failed = np.concatenate(kinds) if kinds else np.empty(0, dtype=bool)
+
+    # Units that are always out fail at time 0 in every replica
+    out = np.flatnonzero(always_out)
+    replica = np.concatenate([replica, np.repeat(np.arange(replicas), len(out))])
+    unit = np.concatenate([unit, np.tile(out, replicas)])
+    time = np.concatenate([time, np.zeros(replicas * len(out))])
+    failed = np.concatenate([failed, np.ones(replicas * len(out), dtype=bool)])
+
+    # Sorted on the exact times, then truncated to whole seconds
+    order = np.lexsort((time, replica))
+    offsets = np.searchsorted(replica[order], np.arange(replicas + 1))
+    return OutageTimeline(np.floor(time[order]).astype(np.int64), unit[order].astype(np.int64), failed[order],
+                          offsets, ngen, horizon_seconds)
+
+def sample_model_outages(model, horizon_seconds, replicas=1, seed=0, run_number=1):
+    """
+    OutageTimeline of a SystemModel's units from FORCED_OUTAGE_RATE and MTTR.
+
+    The replicas of one run come from the run_number-th child of
+    SeedSequence(seed) (outage_seed), so batches are reproducible and
+    independent of each other.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(run_number,)))
+    return sample_outages(model.gen.column('forced_outage_rate'), model.gen.column('mttr'),
+                          horizon_seconds, replicas, rng)
+
+# Example usage:
+# if __name__ == "__main__":
+#     outages = sample_model_outages(system_model, time_grid.total, replicas, run_config.outage_seed, run.run_number)
+#     cursor = outages.cursor(replica)
+#     for step in range(time_grid.nagc):
+#         times, units, failed = cursor.advance(time_grid.step_time(step + 1))
+#         unit_available[units] = ~failed
@@ -0,0 +1,218 @@
+# % Forecast creation.
+# %
+# % The look-ahead forecasts of every stage (DAC, RTC, RTD) and quantity
+# % (load, vg) are materialized once per run as an [issue interval, lead,
+# % series] array over the TimeGrid's look-ahead windows, so every
+# % DASCUC/RTSCUC/RTSCED call takes a zero-copy slice instead of rebuilding
+# % its forecast. *_forecast_data_create_in selects how a cube is built:
+# % 1 from the forecast series of the input files, by target time
+# % 2 perfect, the actual value at each look-ahead interval
+# % 3 persistence, the actual value at the time the solve is issued
+# % 4 actual + randn() * err(lead) * actual, err from dac_/rtc_/rtd_
+# %   load/vg_error as a fraction of the actual value
+# %
+# % Cubes are built in chunks of CHUNK_ISSUES issue intervals on first use,
+# % in memory or in a memory-mapped .npy file. Type 4 draws come from numpy
+# % Generators seeded by SeedSequence: each run of a batch takes the
+# % run_number-th child of forecast_seed and each (stage, quantity) a child
+# % of that (stream_generators). A stream's chunks are drawn from its
+# % Generator in issue order, so forecasts are independent between runs,
+# % reproducible on their own and the same whatever the chunk size; they
+# % equal the all-at-once draws of error_forecasts.
+
+import os
+import numpy as np
+
+STAGES = ('DAC', 'RTC', 'RTD')
+QUANTITIES = ('load', 'vg')
+STREAMS = tuple((stage, quantity) for stage in STAGES for quantity in QUANTITIES)
+CHUNK_ISSUES = 96
+
+FORECAST_FILE = 1
+FORECAST_PERFECT = 2
+FORECAST_PERSISTENCE = 3
+FORECAST_ERROR = 4
+
+def stream_generators(seed, run_number):
+    """An independent Generator for every (stage, quantity) in STREAMS of one run"""
+    children = np.random.SeedSequence(seed, spawn_key=(run_number,)).spawn(len(STREAMS))
+    return {stream: np.random.default_rng(child) for stream, child in zip(STREAMS, children)}
+
+def actual_at(actual, dt_seconds, times, t0_seconds=0):
+    """
+    Actual values in effect at times (seconds, any shape) as an array of shape times.shape + (nseries,).
+
+    actual is an (nsteps, nseries) array sampled every dt_seconds from
+    t0_seconds; times past either end take the first or last sample.
+    """
+    actual = np.asarray(actual, dtype=float)
+    if actual.ndim == 1:
+        actual = actual[:, None]
+    steps = (np.asarray(times, dtype=np.int64) - int(t0_seconds)) // int(dt_seconds)
+    return actual[np.clip(steps, 0, len(actual) - 1)]
+
+def error_by_lead(error, nlead):
+    """(nlead, 1 or nseries) error fractions; the last given lead is repeated for longer horizons"""
+    error = np.asarray(error, dtype=float)
+    if error.ndim < 2:
+        error = error.reshape(-1, 1)
+    if len(error) == 0:
+        return np.zeros((nlead, 1))
+    return error[np.minimum(np.arange(nlead), len(error) - 1)]
+
+def error_forecast(actual, error, rng):
+    """Forecasts of an [issue, lead, series] actual array with one draw of rng for all of them"""
+    actual = np.asarray(actual, dtype=float)
+    noise = rng.standard_normal(actual.shape)
+    return np.maximum(actual * (1 + noise * error_by_lead(error, actual.shape[1])[None]), 0)
+
+def error_forecasts(grid, config, actual_load, actual_vg, dt_seconds, run_number=1, seed=None):
+    """
+    Type 4 forecasts of every stage, {(stage, quantity): [issue, lead, series] array}.
+
+    actual_load/actual_vg are (nsteps, nseries) actuals sampled every
+    dt_seconds from the start of the run and grid the run's TimeGrid.
+    """
+    generators = stream_generators(config.forecast_seed if seed is None else seed, run_number)
+    actuals = {'load': actual_load, 'vg': actual_vg}
+    forecasts = {}
+    for stage, quantity in STREAMS:
+        times = getattr(grid, stage.lower()).lookahead
+        cube = actual_at(actuals[quantity], dt_seconds, times)
+        error = getattr(config, f'{stage.lower()}_{quantity}_error')
+        forecasts[stage, quantity] = error_forecast(cube, error, generators[stage, quantity])
+    return forecasts
+
+class ForecastCube:
+    """
+    [issue, lead, series] forecasts of one stage and quantity.
+
+    build(start, stop) returns the forecasts of issues [start, stop).
+    Chunks are built on first access; cube[issue] is a (lead, series) view
+    and materialize() builds everything. With in_order every chunk before
+    the one asked for is built first, for builders that draw from one
+    random stream. With path the cube lives in a memory-mapped .npy file
+    instead of memory.
+    """
+
+    def __init__(self, build, shape, path=None, chunk=CHUNK_ISSUES, in_order=False):
+        self._build = build
+        self.in_order = in_order
+        self.shape = tuple(shape)
+        self.chunk = max(int(chunk), 1)
+        if path is None:
+            self._data = np.empty(self.shape)
+        else:
+            self._data = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=self.shape)
+        self._ready = np.zeros(-(-self.shape[0] // self.chunk), dtype=bool)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _ensure(self, first, last):
+        if self.in_order and not self._ready[:first].all():
+            first = int(np.argmin(self._ready))
+        for c in range(first, last + 1):
+            if not self._ready[c]:
+                start, stop = c * self.chunk, min((c + 1) * self.chunk, self.shape[0])
+                self._data[start:stop] = self._build(start, stop)
+                self._ready[c] = True
+
+    def __getitem__(self, issue):
+        issue = range(self.shape[0])[issue]
+        self._ensure(issue // self.chunk, issue // self.chunk)
+        return self._data[issue]
+
+    def window(self, start, stop):
+        """Forecasts of issues [start, stop) as a view"""
+        if stop > start:
+            self._ensure(start // self.chunk, (stop - 1) // self.chunk)
+        return self._data[start:stop]
+
+    def materialize(self):
+        """Build every chunk and return the whole cube"""
+        self._ensure(0, len(self._ready) - 1)
+        return self._data
+
+class ForecastEngine:
+    """
+    Forecast cubes of every stage and quantity of one run.
+
+    actual_load/actual_vg are the (nsteps, nseries) actual series sampled
+    every dt_seconds from the start of the run. forecasts maps (stage,
+    quantity) to the input file forecast series (same sampling, by target
+    time) for type 1, or to a ready [issue, lead, series] array which is
+    used as is. With directory every cube is memory-mapped in that folder.
+    Type 4 forecasts depend only on forecast_seed and run_number, not on
+    chunk.
+    """
+
+    def __init__(self, grid, config, actual_load, actual_vg, dt_seconds, run_number=1,
+                 forecasts=None, directory=None, chunk=CHUNK_ISSUES):
+        self.grid = grid
+        self.config = config
+        self.dt_seconds = dt_seconds
+        self.run_number = run_number
+        self.generators = stream_generators(config.forecast_seed, run_number)
+        actuals = {'load': actual_load, 'vg': actual_vg}
+        forecasts = {} if forecasts is None else forecasts
+        self.cubes = {}
+        for stream in STREAMS:
+            stage, quantity = stream
+            given = forecasts.get(stream)
+            if given is not None and np.ndim(given) == 3:
+                self.cubes[stream] = given
+                continue
+            actual = np.asarray(actuals[quantity], dtype=float)
+            nseries = 1 if actual.ndim == 1 else actual.shape[1]
+            grid_stage = getattr(grid, stage.lower())
+            path = None if directory is None else os.path.join(directory, f'{stage}_{quantity}_forecast.npy')
+            self.cubes[stream] = ForecastCube(self._builder(stream, actual, given),
+                                              grid_stage.lookahead.shape + (nseries,), path, chunk,
+                                              in_order=self.mode(stage, quantity) == FORECAST_ERROR)
+
+    def mode(self, stage, quantity):
+        return getattr(self.config, f'{stage}_{quantity}_forecast_data_create_in')
+
+    def _builder(self, stream, actual, given):
+        stage, quantity = stream
+        mode = self.mode(stage, quantity)
+        grid_stage = getattr(self.grid, stage.lower())
+        times, dt = grid_stage.lookahead, self.dt_seconds
+        if mode == FORECAST_FILE:
+            if given is None:
+                raise ValueError(f"{stage} {quantity} forecasts come from the input files but none were given")
+            return lambda start, stop: actual_at(given, dt, times[start:stop])
+        if mode == FORECAST_PERFECT:
+            return lambda start, stop: actual_at(actual, dt, times[start:stop])
+        if mode == FORECAST_PERSISTENCE:
+            nlead = times.shape[1]
+            return lambda start, stop: np.repeat(
+                actual_at(actual, dt, grid_stage.run_times[start:stop])[:, None, :], nlead, axis=1)
+        if mode == FORECAST_ERROR:
+            error = getattr(self.config, f'{stage.lower()}_{quantity}_error')
+            # Chunks are built in issue order, so they continue the stream's draws
+            return lambda start, stop: error_forecast(
+                actual_at(actual, dt, times[start:stop]), error, self.generators[stream])
+        raise ValueError(f"Unknown forecast creation type {mode} for {stage} {quantity}")
+
+    def __getitem__(self, stream):
+        return self.cubes[stream]
+
+    def forecast(self, stage, quantity, issue):
+        """(lead, series) forecast of one solve of a stage"""
+        return self.cubes[stage, quantity][issue]
+
+    def materialize(self):
+        """Build every cube up front"""
+        for cube in self.cubes.values():
+            if isinstance(cube, ForecastCube):
+                cube.materialize()
+        return self
+
+# Example usage:
+# if __name__ == "__main__":
+#     grid = TimeGrid(run_config)
+#     forecasts = ForecastEngine(grid, run_config, ACTUAL_LOAD, ACTUAL_VG, run_config.tAGC, run.run_number)
+#     i = grid.rtc.run_issued_at(time_seconds)
+#     RTC_load, RTC_vg = forecasts.forecast('RTC', 'load', i), forecasts.forecast('RTC', 'vg', i)
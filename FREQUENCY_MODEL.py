@@ -0,0 +1,122 @@
+# % System frequency and primary (governor) response.
+# %
+# % One aggregate swing equation for the system frequency deviation and one
+# % first-order governor per unit:
+# %   M d(df)/dt = sum(Pg) - dP - D df
+# %   Tg_i d(Pg_i)/dt = -Pg_i - k_i db(df)
+# % with M = 2 (sum(INERTIA_i CAPACITY_i) over online units + INERTIALOAD
+# % load) / FREQUENCY, k_i = GOV_BETA_i CAPACITY_i / (DROOP_i FREQUENCY),
+# % db() the GOV_DB deadband and D = LOAD_DAMPING load / FREQUENCY. Governor
+# % output is limited by the unit's headroom and footroom.
+# %
+# % Each step is one backward-Euler update of all units at once: the
+# % governor states are eliminated and the new frequency comes from a scalar
+# % equation, so a whole AGC interval can be taken in one stable step.
+# % Contingencies are resolved with sub-steps to capture nadir and RoCoF.
+
+import numpy as np
+
+DEFAULT_FREQUENCY = 60.0
+
+class FrequencyModel:
+    """Frequency deviation (Hz) and governor response (MW per unit) of one system"""
+
+    def __init__(self, model):
+        gen = model.gen
+        self.f0 = model.system_value('FREQUENCY', DEFAULT_FREQUENCY) or DEFAULT_FREQUENCY
+        self.inertia_load = model.system_value('INERTIALOAD', 0.0)
+        self.load_damping = model.system_value('LOAD_DAMPING', 0.0)
+        self.dfmax = model.system_value('DFMAX', np.inf)
+        self.capacity = gen.column('capacity')
+        self.min_gen = gen.column('min_gen')
+        self.inertia = gen.column('inertia')
+        self.deadband = gen.column('gov_db')
+        self.tg = np.maximum(gen.column('gov_tg'), 0.0)
+        droop = gen.column('droop')
+        beta = gen.column('gov_beta', 1.0)
+        # MW per Hz of each governor; units with no droop have none
+        self.gain = np.divide(beta * self.capacity, droop * self.f0,
+                              out=np.zeros(gen.n), where=droop > 0)
+
+        self.df = 0.0
+        self.governor = np.zeros(gen.n)
+        self.nadir = 0.0
+        self.dfmax_violations = 0
+
+    @property
+    def frequency(self):
+        return self.f0 + self.df
+
+    def _deadband_offset(self, df):
+        """Per-unit active mask and the deadband edge the governor measures from"""
+        active = np.abs(df) > self.deadband
+        return active, np.sign(df) * self.deadband
+
+    def step(self, imbalance, dt, load, output=None, online=None):
+        """
+        Advance one backward-Euler step of dt seconds.
+
+        imbalance is load minus generation in MW (positive pulls frequency
+        down), load the system load and output/online the current unit
+        dispatch and status (default: all units at zero output, online).
+        Returns the new frequency deviation in Hz.
+        """
+        output = np.zeros_like(self.capacity) if output is None else np.asarray(output, dtype=float)
+        online = np.ones(len(self.capacity), dtype=bool) if online is None else np.asarray(online, dtype=bool)
+        M = 2 * (np.dot(self.inertia * self.capacity, online) + self.inertia_load * load) / self.f0
+        D = self.load_damping * load / self.f0
+        gain = np.where(online, self.gain, 0.0)
+        c = dt / (self.tg + dt)
+        upper = np.where(online, np.maximum(self.capacity - output, 0), 0)
+        lower = np.where(online, np.minimum(self.min_gen - output, 0), 0)
+
+        # Governor response after the step is a + b * df_new for units outside their deadband.
+        # The active and saturated sets are taken from the current deviation, then refined
+        df_new = self.df
+        saturated = np.zeros(len(gain), dtype=bool)
+        limited = np.zeros(len(gain))
+        previous = None
+        for _ in range(3):
+            active, edge = self._deadband_offset(df_new)
+            if previous is not None and np.array_equal(active, previous):
+                break
+            previous = active
+            k = np.where(active, gain, 0.0)
+            a = np.where(saturated, limited, (1 - c) * self.governor + c * k * edge)
+            b = np.where(saturated, 0.0, -c * k)
+            df_new = (M * self.df / dt + a.sum() - imbalance) / (M / dt - b.sum() + D) if M > 0 or D > 0 else 0.0
+            response = a + b * df_new
+            limited = np.clip(response, lower, upper)
+            newly_saturated = limited != response
+            if newly_saturated.any():
+                saturated |= newly_saturated
+                previous = None
+        self.governor = limited
+        self.df = df_new
+        self.nadir = min(self.nadir, df_new)
+        self.dfmax_violations += int(abs(df_new) > self.dfmax)
+        return df_new
+
+    def advance(self, imbalance, dt, load, output=None, online=None, substeps=1):
+        """Advance dt seconds in substeps backward-Euler steps; returns the deviation after each"""
+        h = dt / substeps
+        return np.array([self.step(imbalance, h, load, output, online) for _ in range(substeps)])
+
+    def contingency(self, lost_MW, load, output=None, online=None, duration=30.0, dt=0.05):
+        """
+        Response to a sudden loss of lost_MW of generation from the current state.
+
+        Returns (times, deviation trace, nadir deviation, initial RoCoF in Hz/s).
+        """
+        before = self.df
+        trace = self.advance(lost_MW, duration, load, output, online, substeps=int(round(duration / dt)))
+        times = np.arange(1, len(trace) + 1) * dt
+        return times, trace, trace.min(), (trace[0] - before) / dt
+
+# Example usage:
+# if __name__ == "__main__":
+#     frequency = FrequencyModel(system_model)
+#     for step in range(time_grid.nagc):
+#         frequency.step(ACTUAL_LOAD[step] - ACTUAL_GEN_OUTPUT[step].sum(), tAGC, ACTUAL_LOAD[step],
+#                        ACTUAL_GEN_OUTPUT[step], ACTUAL_GEN_OUTPUT[step] > 0)
+#     times, trace, nadir, rocof = frequency.contingency(lost_MW, load, output, output > 0)
@@ -4,6 +4,7 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QComboBox, QGroupBox, QGridLayout, QSpinBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
+import settings
 
 
 class AGCInputOptions(QMainWindow):
@@ -255,6 +256,14 @@ class AGCInputOptions(QMainWindow):
         print(f"K2: {self.k2_input.value()}")
         print(f"Deadband [MW]: {self.deadband_input.value()}")
         print(f"AGC Mode: {self.mode_combo.currentText()}")
+        # CPS2 window and L10 feed the streaming compliance scoring of the AGC
+        settings.CPS2_interval_in = self.interval_input.value()
+        settings.L10_in = self.l10_input.value()
+        settings.Type3_integral_in = self.integral_input.value()
+        settings.K1_in = self.k1_input.value()
+        settings.K2_in = self.k2_input.value()
+        settings.agc_deadband_in = self.deadband_input.value()
+        settings.agcmode = int(self.mode_combo.currentText().split(' ')[0])
         self.close()
     
     def cancel_clicked(self):
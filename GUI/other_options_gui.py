@@ -7,7 +7,10 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QFileDialog, QSplitter, QFrame)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
+import settings
 
+# solver_in of each "Which solver?" button id
+SOLVER_NAMES = ('CPLEX', 'GUROBI', 'HIGHS')
 
 class ReservePickUpDialog(QMainWindow):
     def __init__(self):
@@ -364,12 +367,17 @@ class DebuggingParametersDialog(QMainWindow):
         
         self.solver_bg = QButtonGroup()
         cplex_radio = QRadioButton("Cplex")
-        cplex_radio.setChecked(True)
         gurobi_radio = QRadioButton("Gurobi")
+        highs_radio = QRadioButton("HiGHS")
         self.solver_bg.addButton(cplex_radio, 0)
         self.solver_bg.addButton(gurobi_radio, 1)
+        self.solver_bg.addButton(highs_radio, 2)
+        solver = str(getattr(settings, 'solver_in', 'HIGHS')).upper()
+        self.solver_bg.button(SOLVER_NAMES.index(solver) if solver in SOLVER_NAMES else 2).setChecked(True)
+        self.solver_bg.idToggled.connect(self.solver_toggled)
         solver_layout.addWidget(cplex_radio)
         solver_layout.addWidget(gurobi_radio)
+        solver_layout.addWidget(highs_radio)
         
         # Solver Options - Integers
         integers_group = QGroupBox("Solver Options")
@@ -429,6 +437,11 @@ class DebuggingParametersDialog(QMainWindow):
         
         self.apply_styles()
     
+    def solver_toggled(self, button_id, checked):
+        # The selected solver is the backend of the default sub-models (solver_in)
+        if checked:
+            settings.solver_in = SOLVER_NAMES[button_id]
+    
     def apply_styles(self):
         self.setStyleSheet("""
             QGroupBox {
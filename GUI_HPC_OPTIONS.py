@@ -1,6 +1,6 @@
 # %The parameters can be changed by the user if using hardware which does not
 # %allow GUI or if using on NREL high performance computer (or other unique
-# %hardware). GAMS solver flags set here as well.
+# %hardware). GAMS solver flags and in-process solver options set here as well.
 
 import settings
 
@@ -8,4 +8,6 @@ def gui_hpc_options():
     settings.use_gui = 1;    # default is use gui
     settings.on_hpc  = 0;    # default is no hpc
     settings.gams_mip_flag = ' ' #these can be blank if they are not used in gams.
-    settings.gams_lp_flag = ' '; #these can be blank if they are not used in gams.
\ No newline at end of file
+    settings.gams_lp_flag = ' '; #these can be blank if they are not used in gams.
+    settings.solver_mip_options = {} #typed options of the in-process solver, e.g. {'mip_gap': 0.01, 'time_limit': 300}
+    settings.solver_lp_options = {}
\ No newline at end of file
@@ -0,0 +1,250 @@
+# % Network flow limits added to the SCUC/SCED models on demand.
+# %
+# % Writing every flow limit into every model - each monitored branch after
+# % each contingency when checkthenetwork and contingencycheck are on -
+# % grows as O(branches^2) rows, although only a few ever bind. Instead the
+# % model is solved, the flows of its dispatch are checked for all
+# % candidates with a few matrix products, and only the violated limits
+# % (together with the near-binding ones) are added as row blocks before
+# % re-solving, until no limit is violated. Limits once added stay in an
+# % active set that is loaded into every later model, so later intervals
+# % usually need a single solve.
+# %
+# % The limit of branch l (after the outage of branch k) in interval t is
+# %   -limit <= g . p[:, t] + s * shed[t] - s * load[t] <= limit
+# % with g the generation shift factors and s the load shift factor of
+# % PTDF_l (+ LODF[l, k] PTDF_k), so only the right-hand side moves with
+# % the load and the rows can be kept in a re-solved model.
+
+import warnings
+import weakref
+import numpy as np
+from SHIFT_FACTOR import NetworkFlows
+
+DEFAULT_MARGIN = 0.95
+DEFAULT_ITERATIONS = 10
+# Largest (monitored, outage, interval) block of post-contingency flows held at once
+SCREEN_BLOCK = 4_000_000
+
+def _load(m):
+    """Load of every interval of a SCUC/SCED model, from its balance rows"""
+    return m.row_lb[m.row_blocks['balance'].start:m.row_blocks['balance'].stop]
+
+class FlowCuts:
+    """
+    Flow limits of a set of candidate constraints, added to LinearModels lazily.
+
+    Subclasses give the worst loading of every candidate for a dispatch
+    (loading) and the coefficients of its flow (coefficients). active marks
+    the candidates added to any model so far; prepare() loads them into a
+    new model, check() adds the ones a solution violates.
+    """
+
+    name = 'flow'
+
+    def __init__(self, network, ncandidates, margin=DEFAULT_MARGIN, tolerance=1e-4):
+        self.network = network
+        self.margin = margin
+        self.tolerance = tolerance
+        self.active = np.zeros(ncandidates, dtype=bool)
+        self._blocks = weakref.WeakKeyDictionary()
+
+    def loading(self, dispatch, served):
+        """Largest |flow| / limit over the intervals of every candidate"""
+        raise NotImplementedError
+
+    def coefficients(self, candidates):
+        """(generation shift (n, ngen), load shift (n,), limit (n,)) of candidates"""
+        raise NotImplementedError
+
+    def loaded(self, m):
+        """Mask of the candidates whose rows are in m"""
+        mask = np.zeros(len(self.active), dtype=bool)
+        for _, candidates, _, _ in self._blocks.get(m, ()):
+            mask[candidates] = True
+        return mask
+
+    def _set_bounds(self, m, name, shift, limit, load):
+        offset = np.outer(shift, load).ravel()
+        bound = np.repeat(limit, len(load))
+        m.set_row_bounds(name, offset - bound, offset + bound)
+
+    def _add(self, m, candidates):
+        gen, shift, limit = self.coefficients(candidates)
+        p = m.blocks['p'].index
+        shed = m.blocks['shed'].index
+        n, T = len(candidates), p.shape[1]
+        blocks = self._blocks.setdefault(m, [])
+        name = f'{self.name}_{len(blocks)}'
+        # One row per candidate and interval, candidate-major
+        m.add_rows(name, [(np.repeat(gen, T, axis=0), np.tile(p.T, (n, 1))),
+                          (np.repeat(shift, T), np.tile(shed, n))])
+        blocks.append((name, candidates, shift, limit))
+        self._set_bounds(m, name, shift, limit, _load(m))
+        self.active[candidates] = True
+
+    def prepare(self, m):
+        """Load the active set into m and move the bounds of its flow rows to m's current load"""
+        load = _load(m)
+        for name, _, shift, limit in self._blocks.get(m, ()):
+            self._set_bounds(m, name, shift, limit, load)
+        missing = np.flatnonzero(self.active & ~self.loaded(m))
+        if len(missing):
+            self._add(m, missing)
+
+    def _solution_loading(self, m, x):
+        served = _load(m) - m.blocks['shed'].values(x)
+        return np.nan_to_num(self.loading(m.blocks['p'].values(x), served))
+
+    def violated(self, m, x):
+        """Whether solution x of m exceeds the limit of any candidate"""
+        return bool((self._solution_loading(m, x) > 1 + self.tolerance).any())
+
+    def check(self, m, x):
+        """
+        Add the limits violated by solution x of m; returns how many rows were added.
+
+        With any violation every near-binding candidate (loading above
+        margin) not yet in m is added as well, which saves re-solves.
+        """
+        loading = self._solution_loading(m, x)
+        fresh = ~self.loaded(m)
+        if not (fresh & (loading > 1 + self.tolerance)).any():
+            return 0
+        candidates = np.flatnonzero(fresh & (loading > self.margin))
+        self._add(m, candidates)
+        return len(candidates)
+
+class TransmissionCuts(FlowCuts):
+    """
+    Base-case LINE_RATING limits; candidates are the rated in-service AC branches.
+
+    All flows of a dispatch come from one product with the generation
+    shift factors of the monitored branches; the load is withdrawn at the
+    network's bus load shares.
+    """
+
+    name = 'transmission'
+
+    def __init__(self, model, network=None, monitored=None, margin=DEFAULT_MARGIN, tolerance=1e-4):
+        network = NetworkFlows(model) if network is None else network
+        self.monitored = (np.flatnonzero(np.isfinite(network.rating) & (network.sf.susceptance != 0))
+                          if monitored is None else np.asarray(monitored, dtype=np.int64))
+        super().__init__(network, len(self.monitored), margin, tolerance)
+        self.limit = network.rating[self.monitored]
+        self._gen = network.gen_factors(self.monitored)
+        self._shift = network.load_shift(self.monitored)
+
+    def flows(self, dispatch, served):
+        """(monitored, T) flows of a dispatch serving the load served"""
+        return self._gen @ np.asarray(dispatch, dtype=float) - np.outer(self._shift, served)
+
+    def loading(self, dispatch, served):
+        return np.abs(self.flows(dispatch, served)).max(axis=1, initial=0) / self.limit
+
+    def coefficients(self, candidates):
+        return self._gen[candidates], self._shift[candidates], self.limit[candidates]
+
+class SecurityCuts(FlowCuts):
+    """
+    N-1 limits of monitored branches (CTGC_MONITOR) after each contingency.
+
+    Candidates are the (monitored, outage) pairs, numbered monitored-major;
+    post-contingency flows are f_l + LODF[l, k] f_k against STE_RATING.
+    Contingencies default to every in-service AC branch; those that island
+    the network are listed in islanding and not enforced.
+    """
+
+    name = 'contingency'
+
+    def __init__(self, model, network=None, monitored=None, contingencies=None,
+                 margin=DEFAULT_MARGIN, tolerance=1e-4):
+        network = NetworkFlows(model) if network is None else network
+        sf = network.sf
+        self.monitored = (np.flatnonzero((model.branch.column('ctgc_monitor') > 0) & (sf.susceptance != 0))
+                          if monitored is None else np.asarray(monitored, dtype=np.int64))
+        self.contingencies = (np.flatnonzero(sf.susceptance != 0) if contingencies is None
+                              else np.asarray(contingencies, dtype=np.int64))
+        super().__init__(network, len(self.monitored) * len(self.contingencies), margin, tolerance)
+        self.lodf = sf.lodf(self.monitored, self.contingencies)
+        self.islanding = self.contingencies[np.isnan(self.lodf).any(axis=0)]
+        valid = np.isfinite(self.lodf) & (self.monitored[:, None] != self.contingencies[None, :])
+        self.limit = np.where(valid, network.emergency[self.monitored][:, None], np.inf)
+        self.lodf = np.where(valid, self.lodf, 0.0)
+        self._gen = network.gen_factors(self.monitored), network.gen_factors(self.contingencies)
+        self._shift = network.load_shift(self.monitored), network.load_shift(self.contingencies)
+
+    def base_flows(self, dispatch, served):
+        """(monitored, T) and (contingencies, T) pre-contingency flows from the stored shift factors"""
+        dispatch = np.asarray(dispatch, dtype=float)
+        return (self._gen[0] @ dispatch - np.outer(self._shift[0], served),
+                self._gen[1] @ dispatch - np.outer(self._shift[1], served))
+
+    def post_contingency_flows(self, dispatch, served, contingencies=slice(None), base=None):
+        """(monitored, contingencies, T) flows after each outage in contingencies"""
+        f_l, f_k = self.base_flows(dispatch, served) if base is None else base
+        return f_l[:, None, :] + self.lodf[:, contingencies, None] * f_k[None, contingencies, :]
+
+    def loading(self, dispatch, served):
+        M, K = self.lodf.shape
+        T = np.shape(dispatch)[1]
+        base = self.base_flows(dispatch, served)
+        worst = np.zeros((M, K))
+        step = max(SCREEN_BLOCK // max(M * T, 1), 1)
+        for start in range(0, K, step):
+            block = slice(start, min(start + step, K))
+            worst[:, block] = np.abs(self.post_contingency_flows(dispatch, served, block, base)).max(axis=2)
+        return (worst / self.limit).ravel()
+
+    def coefficients(self, candidates):
+        l, k = np.divmod(candidates, len(self.contingencies))
+        factor = self.lodf[l, k]
+        gen = self._gen[0][l] + factor[:, None] * self._gen[1][k]
+        shift = self._shift[0][l] + factor * self._shift[1][k]
+        return gen, shift, self.limit[l, k]
+
+    def pairs(self, candidates):
+        """(monitored branch, outaged branch) of candidates"""
+        l, k = np.divmod(np.asarray(candidates), len(self.contingencies))
+        return self.monitored[l], self.contingencies[k]
+
+def network_cuts(model, config, network=None, load_factors=None):
+    """
+    The FlowCuts switched on by checkthenetwork/contingencycheck of a RunConfig (or settings).
+
+    Both share one NetworkFlows, withdrawing the load at load_factors (by
+    default the LOAD_DIST shares of the model).
+    """
+    cuts = []
+    if config.checkthenetwork == 'YES':
+        network = NetworkFlows(model, load_factors) if network is None else network
+        cuts.append(TransmissionCuts(model, network))
+        if config.contingencycheck == 'YES':
+            cuts.append(SecurityCuts(model, network))
+    return cuts
+
+def enforce(solve, m, cuts, max_iterations=DEFAULT_ITERATIONS):
+    """
+    Call solve() until no cut finds a new violated limit in its solution.
+
+    solve re-solves the LinearModel m (with the rows added meanwhile) and
+    returns an LPSolution; the last solution is returned, with a warning if
+    it still violates a limit after max_iterations solves.
+    """
+    for cut in cuts:
+        cut.prepare(m)
+    result = solve()
+    for _ in range(max_iterations - 1):
+        if result.x is None or not sum(cut.check(m, result.x) for cut in cuts):
+            return result
+        result = solve()
+    if result.x is not None and any(cut.violated(m, result.x) for cut in cuts):
+        warnings.warn(f"Flow limits are still violated after {max_iterations} solves")
+    return result
+
+# Example usage:
+# if __name__ == "__main__":
+#     cuts = network_cuts(system_model, run_config)
+#     result = solve_dascuc(system_model, DAC_load_forecast, DAC_vg_forecast, cuts=cuts)
+#     rtsced = RTSCEDModel.from_config(system_model, run_config)
+#     monitored, outaged = cuts[-1].pairs(np.flatnonzero(cuts[-1].active))
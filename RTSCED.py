@@ -0,0 +1,190 @@
+# % Default real-time security-constrained economic dispatch (RTSCED).
+# %
+# % RTSCED is solved every tRTD_in minutes with the same structure: only the
+# % load and VG forecasts, the reserve requirement, the initial MW of every
+# % unit and the commitment coming from RTSCUC change. The LP is therefore
+# % assembled once per run and kept loaded in the solver; every interval
+# % only pushes new bounds and right-hand sides and re-solves from the
+# % previous basis (with highspy installed), instead of rebuilding and
+# % re-solving from scratch.
+# %
+# % Commitment enters only through bounds: dispatch is bounded by
+# % [MIN_GEN * u, CAPACITY * u], the capacity row right-hand side is
+# % CAPACITY * u and the ramp rows are relaxed for starts and stops, so the
+# % matrix never depends on the commitment.
+# %
+# % Flow limits (NETWORK_CONSTRAINTS) are generated lazily: the rows of the
+# % lines found binding in earlier intervals stay in the model with their
+# % right-hand sides moved to the new load, and only newly violated lines
+# % are added before re-solving.
+
+import numpy as np
+from lp_model import LinearModel
+from DASCUC import UnitData, DEFAULT_VOLL, reserve_shortage_cost
+from NETWORK_CONSTRAINTS import enforce, network_cuts, TransmissionCuts
+
+class RTSCEDResult:
+    """Dispatch, reserves and prices of one RTSCED interval"""
+
+    def __init__(self, ced, solution):
+        m = ced.lp
+        self.status = solution.status
+        self.message = solution.message
+        self.objective = solution.objective
+        if solution.x is None:
+            x = np.zeros(m.nvars)
+            lmp = np.full(ced.nintervals, np.nan)
+        else:
+            x = solution.x
+            # Costs are per interval, prices per MWh
+            lmp = solution.duals[m.row_blocks['balance'].rows] / ced.interval_hours
+        self.dispatch = m.blocks['p'].values(x)
+        self.reserve = m.blocks['r'].values(x)
+        self.shed = m.blocks['shed'].values(x)
+        self.reserve_shortfall = m.blocks['reserve_short'].values(x)
+        self.lmp = lmp
+        # Base-case flows of the monitored branches (TransmissionCuts), None without network checks
+        self.flows = None
+        for cut in ced.cuts:
+            if isinstance(cut, TransmissionCuts):
+                self.flows = cut.flows(self.dispatch, m.row_lb[m.row_blocks['balance'].rows] - self.shed)
+
+    @property
+    def feasible(self):
+        return self.status == 0
+
+    def write(self, results, interval_time, stage='RTSCED'):
+        """Stream this interval's dispatch, reserves, prices and flows to a ResultsWriter"""
+        quantities = {'dispatch': self.dispatch, 'reserve': self.reserve, 'lmp': self.lmp, 'shed': self.shed,
+                      'reserve_shortfall': self.reserve_shortfall}
+        if self.flows is not None:
+            quantities['flows'] = self.flows
+        results.write(stage, interval_time, **quantities)
+
+class RTSCEDModel:
+    """
+    Persistent RTSCED LP of one run.
+
+    interval_minutes are the lengths of the look-ahead intervals, e.g.
+    [IRTD_in] + [IRTDADV_in] * (HRTD_in - 1). Build it once and call solve()
+    every RTD interval. cuts are the FlowCuts enforced on the dispatch;
+    with a ResultsWriter every solved interval is written to its 'RTSCED'
+    stage.
+    """
+
+    def __init__(self, model, interval_minutes, reserve_time=10.0, backend=None, cuts=(), results=None):
+        self.interval_minutes = np.asarray(interval_minutes, dtype=float)
+        self.interval_hours = self.interval_minutes / 60
+        self.reserve_time = reserve_time
+        self.nintervals = H = len(self.interval_minutes)
+        self.units = units = UnitData(model, 1.0)
+        G = units.ngen
+        # Ramp rates per interval in MW, 0 ramp rate means not ramp limited
+        ramp_rate = model.gen.column('ramp_rate')
+        self.ramp = np.where(ramp_rate[:, None] > 0, ramp_rate[:, None] * self.interval_minutes[None, :],
+                             units.capacity[:, None])
+        self.ramp[units.is_vg] = units.capacity[units.is_vg, None]
+
+        m = self.lp = LinearModel()
+        p = m.add_variables('p', (G, H), lb=0, ub=units.capacity[:, None],
+                            cost=units.energy_cost[:, None] * self.interval_hours[None, :])
+        r = m.add_variables('r', (G, H), lb=0, ub=(units.reserve_ramp * reserve_time)[:, None])
+        shed = m.add_variables('shed', H, lb=0, ub=0, cost=model.system_value('VOLL', DEFAULT_VOLL) * self.interval_hours)
+        short = m.add_variables('reserve_short', H, lb=0, ub=0, cost=reserve_shortage_cost(model))
+
+        m.add_rows('balance', [(1.0, p.index.T), (1.0, shed.index)], lb=0, ub=0)
+        m.add_rows('reserve', [(1.0, r.index.T), (1.0, short.index)], lb=0)
+        flat = lambda block: block.index.ravel()
+        m.add_rows('capacity', [(1.0, flat(p)), (1.0, flat(r))], ub=0)
+        prev = np.concatenate([np.full((G, 1), -1), p.index[:, :-1]], axis=1).ravel()
+        m.add_rows('ramp_up', [(1.0, flat(p)), (-1.0, prev)], ub=0)
+        m.add_rows('ramp_down', [(-1.0, flat(p)), (1.0, prev)], ub=0)
+        self.session = m.session(backend)
+        self.cuts = tuple(cuts)
+        self.results = results
+        self.solves = 0
+
+    @classmethod
+    def from_config(cls, model, config, reserve_time=10.0, cuts=None, results=None):
+        """
+        RTSCED with the look-ahead (HRTD_in, IRTD_in, IRTDADV_in), solver
+        (solver_in) and network checks (checkthenetwork, contingencycheck)
+        of a RunConfig; pass cuts to share their active sets with RTSCUC.
+        """
+        from solver_backend import get_backend
+        minutes = [config.IRTD_in] + [config.IRTDADV_in] * (config.HRTD_in - 1)
+        cuts = network_cuts(model, config) if cuts is None else cuts
+        return cls(model, minutes, reserve_time, get_backend(config), cuts, results)
+
+    def update(self, load, vg_forecast=None, reserve_requirement=None, initial_MW=None,
+               commitment=None, initial_status=None):
+        """
+        Push one interval's data into the model without touching the matrix.
+
+        load and reserve_requirement are (H,), vg_forecast (n_vg_units, H) or
+        (ngen, H), commitment (ngen, H) 0/1 and initial_MW/initial_status the
+        state of every unit at the start of the binding interval. Missing
+        values default to the GEN tab (all units on, initial MW).
+        """
+        units, m = self.units, self.lp
+        G, H = units.ngen, self.nintervals
+        load = np.asarray(load, dtype=float)
+        reserve_requirement = np.zeros(H) if reserve_requirement is None else np.asarray(reserve_requirement, dtype=float)
+        u = np.ones((G, H)) if commitment is None else np.asarray(commitment, dtype=float)
+        u = np.where(units.is_out[:, None], 0.0, u)
+        p0 = units.initial_MW if initial_MW is None else np.asarray(initial_MW, dtype=float)
+        u0 = (p0 > 0) if initial_status is None else np.asarray(initial_status, dtype=bool)
+
+        p_max = units.capacity[:, None] * u
+        if vg_forecast is not None:
+            vg_forecast = np.asarray(vg_forecast, dtype=float)
+            vg_max = vg_forecast[units.is_vg] if vg_forecast.shape[0] == G else vg_forecast
+            p_max[units.is_vg] = np.minimum(vg_max, units.capacity[units.is_vg, None]) * u[units.is_vg]
+        p_min = np.minimum(units.min_gen[:, None] * u, p_max)
+        m.set_var_bounds('p', lb=p_min, ub=p_max)
+        m.set_var_bounds('r', ub=(units.reserve_ramp * self.reserve_time)[:, None] * u)
+        m.set_var_bounds('shed', ub=np.maximum(load, 0))
+        m.set_var_bounds('reserve_short', ub=reserve_requirement)
+
+        m.set_row_bounds('balance', lb=load, ub=load)
+        m.set_row_bounds('reserve', lb=reserve_requirement)
+        m.set_row_bounds('capacity', ub=(units.capacity[:, None] * u).ravel())
+
+        # Ramp limits, relaxed to the output limits when a unit starts or stops
+        u_prev = np.concatenate([u0[:, None].astype(float), u[:, :-1]], axis=1)
+        starting = (u > 0) & (u_prev == 0)
+        stopping = (u == 0) & (u_prev > 0)
+        ramp_up = np.where(starting, np.maximum(self.ramp, p_min), self.ramp)
+        ramp_down = np.where(stopping, units.capacity[:, None], self.ramp)
+        ramp_up[:, 0] += p0
+        ramp_down[:, 0] -= p0
+        # A unit outside its new limits may move straight onto them
+        ramp_up[:, 0] = np.maximum(ramp_up[:, 0], p_min[:, 0])
+        ramp_down[:, 0] = np.maximum(ramp_down[:, 0], -p_max[:, 0])
+        m.set_row_bounds('ramp_up', ub=ramp_up.ravel())
+        m.set_row_bounds('ramp_down', ub=ramp_down.ravel())
+
+    def solve(self, load, vg_forecast=None, reserve_requirement=None, initial_MW=None,
+              commitment=None, initial_status=None, interval_time=None):
+        """
+        Update the model for one RTD interval and re-solve it.
+
+        interval_time (seconds) stamps the results; by default the solves
+        are taken to be one binding interval apart from time 0.
+        """
+        self.update(load, vg_forecast, reserve_requirement, initial_MW, commitment, initial_status)
+        result = RTSCEDResult(self, enforce(self.session.solve, self.lp, self.cuts))
+        if self.results is not None:
+            if interval_time is None:
+                interval_time = self.solves * self.interval_minutes[0] * 60
+            result.write(self.results, interval_time)
+        self.solves += 1
+        return result
+
+# Example usage:
+# if __name__ == "__main__":
+#     rtsced = RTSCEDModel.from_config(system_model, run_config, results=run_context.results)
+#     for step in range(time_grid.nagc):
+#         if time_grid.rtd_due(step):
+#             result = rtsced.solve(RTD_load, RTD_vg, RTD_reserve, ACTUAL_GEN_OUTPUT, RTSCUC_commitment,
+#                                   interval_time=time_grid.step_time(step))
@@ -0,0 +1,102 @@
+# % Default real-time security-constrained unit commitment (RTSCUC).
+# %
+# % Same formulation as DASCUC over the HRTC_in intervals of IRTC_in minutes,
+# % starting from the current state of every unit. Each solve is handed an
+# % incumbent built by RTSCUCSTART from the previous solution shifted in
+# % time and the DASCUC commitment: the commitment is fixed, the dispatch LP
+# % is solved and the full solution is passed to the solver as a MIP start, so
+# % branch and bound begins with a feasible schedule instead of searching for
+# % one. With Fix_RT_Pump the PSH units keep their DASCUC commitment. The
+# % flow limits found binding by earlier solves (NETWORK_CONSTRAINTS active
+# % sets) are written into each new model before it is first solved.
+
+import numpy as np
+from DASCUC import build_scuc, solve_scuc
+from SYSTEM_MODEL import TYPE_INDICES
+from RTSCUCSTART import rtscuc_start
+
+def fix_commitment(m, units, dascuc_commitment):
+    """Fix the commitment of units (a boolean mask) to the DASCUC schedule"""
+    index = m.blocks['u'].index[units].ravel()
+    fixed = np.asarray(dascuc_commitment, dtype=float)[units].ravel()
+    m.lb[index] = fixed
+    m.ub[index] = fixed
+
+def incumbent_solution(session, commitment):
+    """Full solution vector of a commitment, or None if it cannot be dispatched"""
+    m = session.model
+    u = m.blocks['u'].index.ravel()
+    commitment = np.clip(np.asarray(commitment, dtype=float).ravel(), m.lb[u], m.ub[u])
+    saved = m.lb[u].copy(), m.ub[u].copy()
+    m.lb[u] = m.ub[u] = commitment
+    try:
+        result = session.solve()
+    finally:
+        m.lb[u], m.ub[u] = saved
+    return result.x if result.status == 0 else None
+
+def solve_rtscuc(model, load, vg_forecast, reserve_requirement, initial, dascuc_commitment,
+                 interval_hours=0.25, times=None, previous=None, previous_times=None, mode=1,
+                 fix_pump=True, integer=True, time_limit=None, mip_gap=None, backend=None, cuts=(), results=None):
+    """
+    Build and solve one RTSCUC, warm-started from the previous solve.
+
+    initial is the dict of 'status', 'hours' and 'MW' of every unit at the
+    start of the horizon, dascuc_commitment the (G, T) DASCUC commitment of
+    the horizon's intervals, times their start times in seconds and
+    previous/previous_times the last result (SCUCResult) and its interval
+    starts. mode is RTSCUCSTART_MODE_RTC or RTSCUCSTART_MODE_RPU and cuts
+    the FlowCuts enforced, kept from one solve to the next. With a
+    ResultsWriter the solve is written to its 'RTSCUC' stage at times[0].
+    Returns an SCUCResult; its start attribute tells whether an incumbent
+    was passed to the solver.
+    """
+    m, units = build_scuc(model, load, vg_forecast, reserve_requirement, interval_hours, initial=initial)
+    if fix_pump:
+        fix_commitment(m, model.gen_type_mask(TYPE_INDICES.pumped_storage_gen_type_index), dascuc_commitment)
+    for cut in cuts:
+        cut.prepare(m)
+
+    session = m.session(backend)
+    if times is None:
+        times = np.arange(len(load)) * interval_hours * 3600
+    start = None
+    if integer:
+        previous_commitment = None if previous is None else previous.commitment
+        commitment = rtscuc_start(mode, times, dascuc_commitment, previous_commitment, previous_times,
+                                  interval_hours * 3600)
+        start = incumbent_solution(session, commitment)
+    result = solve_scuc(m, integer, time_limit, mip_gap, start=start, session=session, cuts=cuts)
+    result.start = start is not None
+    if results is not None:
+        result.write(results, times[0], 'RTSCUC')
+    return result
+
+def initial_state(result, interval_hours, elapsed=1, previous_initial=None):
+    """
+    Status, time in state and MW of every unit after the first elapsed intervals of result.
+
+    Used to roll the horizon forward when no actual (AGC) output is available.
+    """
+    u = result.commitment[:, :elapsed]
+    status = u[:, -1] > 0
+    changed = (u != u[:, -1:])
+    # Intervals since the last change of state within the elapsed window
+    last_change = np.where(changed.any(axis=1), elapsed - 1 - np.argmax(changed[:, ::-1], axis=1), -1)
+    hours = (elapsed - 1 - last_change) * interval_hours
+    if previous_initial is not None:
+        carried = (last_change < 0) & (np.asarray(previous_initial['status'], dtype=bool) == status)
+        hours = np.where(carried, np.asarray(previous_initial['hours']) + elapsed * interval_hours, hours)
+    return {'status': status, 'hours': hours, 'MW': result.dispatch[:, elapsed - 1]}
+
+# Example usage:
+# if __name__ == "__main__":
+#     previous = None
+#     for i in range(time_grid.rtc.nruns):
+#         times = time_grid.rtc.lookahead[i]
+#         result = solve_rtscuc(system_model, RTC_load, RTC_vg, RTC_reserve, initial,
+#                               DASCUC_commitment[:, time_grid.rtc2da[i]], run_config.IRTC_in / 60, times,
+#                               previous, previous_times, run_config.RTSCUCSTART_MODE_RTC,
+#                               fix_pump=run_config.Fix_RT_Pump == 1, cuts=rtsced.cuts,
+#                               results=run_context.results)
+#         previous, previous_times = result, times
@@ -0,0 +1,66 @@
+# % Starting commitment for RTSCUC and RPU solves.
+# %
+# % Consecutive RTSCUC solves overlap for all but the last few intervals of
+# % their horizon, so the previous solution shifted forward in time is
+# % nearly always a good incumbent. RTSCUCSTART_MODE_RTC / _RPU select how
+# % the start is built:
+# % 1 (RTC default) previous solution where the horizons overlap, DASCUC
+# %   commitment after the end of the previous horizon.
+# % 2 (RPU default) previous solution, holding each unit's last state past
+# %   the end of the previous horizon, since an RPU only re-dispatches the
+# %   near term around the current RTSCUC schedule.
+# % Any other value is user-defined and needs code added to rtscuc_start.
+
+import numpy as np
+
+def commitment_at(commitment, times, new_times, hold_last=False, interval_seconds=None):
+    """
+    Sample a (G, T) commitment, whose intervals start at times (seconds), at new_times.
+
+    The last interval is interval_seconds long, or as long as the one before
+    it if not given; a single interval needs interval_seconds. Columns of
+    new_times after the last interval are -1 unless hold_last.
+    """
+    commitment = np.asarray(commitment)
+    times = np.asarray(times)
+    new_times = np.asarray(new_times)
+    index = np.searchsorted(times, new_times, side='right') - 1
+    sampled = commitment[:, np.clip(index, 0, commitment.shape[1] - 1)].astype(np.int8)
+    if interval_seconds is None:
+        if len(times) < 2:
+            raise ValueError("A commitment with a single interval needs interval_seconds to know where it ends")
+        interval_seconds = times[-1] - times[-2]
+    end = times[-1] + interval_seconds
+    past_end = new_times >= end
+    if not hold_last:
+        sampled[:, past_end] = -1
+    sampled[:, index < 0] = -1
+    return sampled
+
+def rtscuc_start(mode, times, dascuc_commitment, previous_commitment=None, previous_times=None,
+                 interval_seconds=None):
+    """
+    Incumbent (G, T) 0/1 commitment for a solve whose intervals start at times.
+
+    dascuc_commitment is the DASCUC commitment already aligned to those
+    intervals (see TimeGrid.rtc2da), previous_commitment/previous_times the
+    last RTSCUC (or RPU) solution and its interval starts and
+    interval_seconds the length of its intervals.
+    """
+    dascuc_commitment = np.asarray(dascuc_commitment, dtype=np.int8)
+    if previous_commitment is None:
+        return dascuc_commitment.copy()
+    if mode == 1:
+        start = commitment_at(previous_commitment, previous_times, times, interval_seconds=interval_seconds)
+        return np.where(start < 0, dascuc_commitment, start)
+    if mode == 2:
+        start = commitment_at(previous_commitment, previous_times, times, hold_last=True,
+                              interval_seconds=interval_seconds)
+        return np.where(start < 0, dascuc_commitment, start)
+    raise ValueError(f"RTSCUCSTART mode {mode} is user-defined; add it to rtscuc_start")
+
+# Example usage:
+# if __name__ == "__main__":
+#     start = rtscuc_start(run_config.RTSCUCSTART_MODE_RTC, grid.rtc.lookahead[i],
+#                          DASCUC_commitment[:, grid.rtc2da[i:i + HRTC]], previous.commitment, grid.rtc.lookahead[i - 1],
+#                          run_config.IRTC_in * 60)
@@ -0,0 +1,229 @@
+# % DC shift factors (PTDF) of the network.
+# %
+# % The reduced nodal susceptance matrix B (slack bus removed) is assembled
+# % sparsely from BRANCHDATA reactances and the BRANCHBUS topology and
+# % factorized once with sparse LU. PTDF rows are solved only for the
+# % branches asked for (the monitored ones) and memoized. Factorizations are
+# % cached in the run-invariant shared cache under a hash of the topology,
+# % so RTSCUC/RTSCED intervals with unchanged topology reuse them, and
+# % branch outages are applied as low-rank (Sherman-Morrison-Woodbury)
+# % updates of the base factorization instead of refactoring. HVDC branches
+# % (BRANCH_TYPE HVDC) are not part of the AC network: they are left out of
+# % B, have zero shift factors and are never monitored or outaged.
+# %
+# % SHIFT_FACTOR_PRE_in/SHIFT_FACTOR_POST_in functional mods still run
+# % around the computation in the main loop.
+
+import hashlib
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+from run_context import shared_cache
+from SYSTEM_MODEL import TYPE_INDICES
+
+def topology_key(model, outages=()):
+    """Hash of everything the shift factors depend on: branch ends, reactances, AC branches, slack and outages"""
+    topology = model.topology
+    digest = hashlib.sha1()
+    for array in (topology.branch_from, topology.branch_to, model.branch.column('reactance'), ac_branches(model)):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(np.int64(topology.slack).tobytes())
+    digest.update(np.asarray(sorted(outages), dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+def ac_branches(model):
+    """Mask of the branches of the AC network, i.e. every branch but the HVDC links"""
+    return ~model.branch_type_mask(TYPE_INDICES.HVDC_branch_type_index)
+
+class ShiftFactors:
+    """
+    PTDF of one topology.
+
+    ptdf(branches) returns the (len(branches), nbus) rows, with the slack
+    column zero; flows(injections, branches) the DC flows of bus
+    injections. Rows are computed on first use and kept.
+    """
+
+    def __init__(self, branch_from, branch_to, reactance, nbus, slack, in_service=None):
+        self.branch_from = np.asarray(branch_from, dtype=np.int64)
+        self.branch_to = np.asarray(branch_to, dtype=np.int64)
+        self.nbus = nbus
+        self.slack = slack
+        nbranch = len(self.branch_from)
+        in_service = np.ones(nbranch, dtype=bool) if in_service is None else np.asarray(in_service, dtype=bool)
+        connected = in_service & (self.branch_from >= 0) & (self.branch_to >= 0) & (np.asarray(reactance) != 0)
+        self.susceptance = np.where(connected, 1 / np.where(connected, reactance, 1.0), 0.0)
+
+        # Position of every bus in the reduced (slack-free) system, -1 for the slack
+        self.reduced = np.full(nbus, -1, dtype=np.int64)
+        self.reduced[np.arange(nbus) != slack] = np.arange(nbus - 1)
+        self._rows = {}
+        self._lu = None
+        if nbus > 1:
+            self._lu = splu(self._reduced_b(connected).tocsc())
+
+    def _incidence(self, branches):
+        """Sparse (nbus - 1, len(branches)) reduced incidence columns e_from - e_to"""
+        branches = np.asarray(branches, dtype=np.int64)
+        f = self.reduced[self.branch_from[branches]]
+        t = self.reduced[self.branch_to[branches]]
+        cols = np.arange(len(branches))
+        rows = np.concatenate([f, t])
+        vals = np.concatenate([np.ones(len(f)), -np.ones(len(t))])
+        keep = rows >= 0
+        return sp.csc_matrix((vals[keep], (rows[keep], np.concatenate([cols, cols])[keep])),
+                             shape=(self.nbus - 1, len(branches)))
+
+    def _reduced_b(self, connected):
+        branches = np.flatnonzero(connected)
+        A = self._incidence(branches)
+        return (A @ sp.diags(self.susceptance[branches]) @ A.T).tocsc()
+
+    def solve(self, rhs):
+        """B^-1 rhs for the reduced system"""
+        return self._lu.solve(np.asarray(rhs, dtype=float))
+
+    def _solve_rows(self, branches):
+        A = self._incidence(branches).toarray()
+        return (self.solve(A) * self.susceptance[branches]).T
+
+    def ptdf(self, branches=None):
+        """PTDF rows of branches (all branches by default) as a dense (k, nbus) array"""
+        if branches is None:
+            branches = np.arange(len(self.branch_from))
+        branches = np.atleast_1d(np.asarray(branches, dtype=np.int64))
+        missing = [b for b in dict.fromkeys(branches.tolist()) if b not in self._rows]
+        if missing and self._lu is not None:
+            rows = self._solve_rows(np.array(missing))
+            for b, row in zip(missing, rows):
+                full = np.zeros(self.nbus)
+                full[self.reduced >= 0] = row
+                self._rows[b] = full
+        elif missing:
+            for b in missing:
+                self._rows[b] = np.zeros(self.nbus)
+        return np.array([self._rows[b] for b in branches.tolist()]).reshape(len(branches), self.nbus)
+
+    def flows(self, injections, branches=None):
+        """DC flows on branches of bus injections (nbus,) or (nbus, T)"""
+        return self.ptdf(branches) @ np.asarray(injections, dtype=float)
+
+    def with_outages(self, outages):
+        """ShiftFactors of this topology with the given branches out of service"""
+        return OutageShiftFactors(self, outages)
+
+    def lodf(self, monitored, outages):
+        """
+        Line outage distribution factors as a (len(monitored), len(outages)) array.
+
+        LODF[l, k] = PTDF_l a_k / (1 - PTDF_k a_k) with a_k the incidence of
+        branch k, so the flow on l after k trips is f_l + LODF[l, k] f_k.
+        Columns of outages that island the network are NaN, out of service
+        branches have zero columns and a branch's own outage gives -1.
+        """
+        monitored = np.atleast_1d(np.asarray(monitored, dtype=np.int64))
+        outages = np.atleast_1d(np.asarray(outages, dtype=np.int64))
+        f, t = self.branch_from[outages], self.branch_to[outages]
+        ptdf_l = self.ptdf(monitored)
+        transfer = ptdf_l[:, f] - ptdf_l[:, t]
+        ptdf_k = self.ptdf(outages)
+        k = np.arange(len(outages))
+        denominator = 1 - (ptdf_k[k, f] - ptdf_k[k, t])
+        islanding = np.abs(denominator) < 1e-8
+        lodf = transfer / np.where(islanding, 1.0, denominator)
+        lodf[:, islanding] = np.nan
+        lodf[:, self.susceptance[outages] == 0] = 0.0
+        lodf[monitored[:, None] == outages[None, :]] = -1.0
+        return lodf
+
+class OutageShiftFactors(ShiftFactors):
+    """
+    Shift factors after branch outages, from a low-rank update of the base LU.
+
+    With A the incidence columns of the outaged branches and b their
+    susceptances, B' = B - A diag(b) A^T and
+    B'^-1 r = B^-1 r + W (diag(1/b) - A^T W)^-1 W^T r with W = B^-1 A.
+    """
+
+    def __init__(self, base, outages):
+        self.base = base
+        self.branch_from = base.branch_from
+        self.branch_to = base.branch_to
+        self.nbus = base.nbus
+        self.slack = base.slack
+        self.reduced = base.reduced
+        self.outages = np.unique(np.asarray(outages, dtype=np.int64))
+        self.outages = self.outages[base.susceptance[self.outages] != 0]
+        self.susceptance = base.susceptance.copy()
+        self.susceptance[self.outages] = 0.0
+        self._rows = {}
+        self._lu = base._lu
+        if len(self.outages) and base._lu is not None:
+            A = base._incidence(self.outages)
+            self._W = base.solve(A.toarray())
+            capacitance = np.diag(1 / base.susceptance[self.outages]) - A.T @ self._W
+            if np.linalg.cond(capacitance) > 1e12:
+                raise ValueError(f"Outage of branches {self.outages.tolist()} islands the network")
+            self._capacitance = capacitance
+
+    def solve(self, rhs):
+        x = self.base.solve(rhs)
+        if not len(self.outages):
+            return x
+        return x + self._W @ np.linalg.solve(self._capacitance, self._W.T @ np.asarray(rhs, dtype=float))
+
+class NetworkFlows:
+    """
+    Branch flows of a unit dispatch and system load through one ShiftFactors.
+
+    Unit output is injected at its GENBUS bus and the load is withdrawn in
+    proportion to load_factors (one weight per bus), by default the LOAD_DIST
+    shares of the input file. rating is LINE_RATING and emergency STE_RATING (LINE_RATING where no
+    STE_RATING is given); branches with no rating are not limited.
+    """
+
+    def __init__(self, model, load_factors=None, outages=(), cache=shared_cache):
+        self.sf = shift_factors(model, outages, cache)
+        topology = model.topology
+        self.injection = topology.gen_injection_matrix(model.gen.n)
+        load_factors = topology.load_factors if load_factors is None else np.asarray(load_factors, dtype=float)
+        if load_factors is None or not load_factors.sum() > 0:
+            raise ValueError("The input file has no LOAD_DIST shares, the load of each bus is unknown")
+        self.load_factors = load_factors / load_factors.sum()
+        rating = model.branch.column('line_rating')
+        emergency = model.branch.column('ste_rating')
+        self.rating = np.where(rating > 0, rating, np.inf)
+        self.emergency = np.where(emergency > 0, emergency, self.rating)
+        self.nbranch = len(rating)
+
+    def gen_factors(self, branches):
+        """(len(branches), ngen) flow per MW of each unit's output"""
+        return np.asarray((self.injection.T @ self.sf.ptdf(branches).T).T)
+
+    def load_shift(self, branches):
+        """(len(branches),) flow per MW of system load"""
+        return self.sf.ptdf(branches) @ self.load_factors
+
+    def flows(self, dispatch, load, branches=None):
+        """Flows on branches of a (ngen, T) dispatch serving a (T,) load"""
+        injections = self.injection @ np.asarray(dispatch, dtype=float) - np.outer(self.load_factors, load)
+        return self.sf.flows(injections, branches)
+
+def shift_factors(model, outages=(), cache=shared_cache):
+    """ShiftFactors of a SystemModel's network with outages, shared by every interval with the same topology"""
+    topology = model.topology
+    if topology is None:
+        raise ValueError("The input file has no BRANCHBUS tab, the network cannot be modelled")
+    outages = tuple(sorted(set(int(b) for b in outages)))
+    base = cache.get('shift_factors', topology_key(model), lambda: ShiftFactors(
+        topology.branch_from, topology.branch_to, model.branch.column('reactance'), topology.nbus, topology.slack,
+        ac_branches(model)))
+    if not outages:
+        return base
+    return cache.get('shift_factors', topology_key(model, outages), lambda: base.with_outages(outages))
+
+# Example usage:
+# if __name__ == "__main__":
+#     sf = shift_factors(system_model, outages=outaged_branches)
+#     monitored = np.flatnonzero(system_model.branch.ctgc_monitor)
+#     flows = sf.flows(bus_injections, monitored)
@@ -0,0 +1,266 @@
+# % Columnar in-memory model of the input tabs. GEN, STORAGE, BRANCHDATA and
+# % RESERVEPARAM are loaded once into contiguous NumPy vectors, one per field,
+# % so that scheduling and AGC code can work on whole columns at a time
+# % instead of indexing raw tables with the 1-based positions on settings.
+
+import numpy as np
+import os
+import types
+import settings
+from DECLARE_INDICES import (get_input_file, load_type_indices, GEN_PARAMS, STORAGE_PARAMS,
+                             RESERVE_PARAMS, BRANCH_PARAMS)
+
+# Generator and branch type indices of load_type_indices, without touching settings
+TYPE_INDICES = types.SimpleNamespace()
+load_type_indices(TYPE_INDICES)
+
+MODEL_TABS = ('SYSTEM', 'GEN', 'STORAGE', 'RESERVEPARAM', 'BRANCHDATA', 'BRANCHBUS', 'GENBUS', 'LOAD_DIST')
+
+# Enumerations matching load_type_indices are kept as int8, flags and counts
+# as int32, everything else as float64.
+ENUM_FIELDS = {'gen_type', 'branch_type'}
+INT_FIELDS = {
+    'agc_qualified', 'max_starts', 'initial_status', 'gen_agc_mode',
+    'variable_start', 'initial_pump_status', 'variable_efficiency',
+    'enforce_final_storage', 'res_on', 'res_dir', 'res_agc', 'res_gov',
+    'res_inertia', 'res_inclusive', 'res_vg', 'ctgc_monitor'
+}
+
+def field_dtype(field):
+    """Return the NumPy dtype a SystemModel field is stored as"""
+    if field in ENUM_FIELDS:
+        return np.int8
+    if field in INT_FIELDS:
+        return np.int32
+    return np.float64
+
+class ColumnTable:
+    """Struct-of-arrays view of one input tab: a names list and one vector per field"""
+
+    __slots__ = ('names', 'columns', 'n')
+
+    def __init__(self, names, columns):
+        self.names = list(names)
+        self.columns = columns
+        self.n = len(self.names)
+
+    def __getattr__(self, field):
+        try:
+            return self.columns[field]
+        except KeyError:
+            raise AttributeError(field) from None
+
+    def __contains__(self, field):
+        return field in self.columns
+
+    def __len__(self):
+        return self.n
+
+    def column(self, field, default=0.0):
+        """Return the vector for field, or a vector filled with default if the tab lacks it"""
+        if field in self.columns:
+            return self.columns[field]
+        return np.full(self.n, default, dtype=field_dtype(field))
+
+    def index_of(self, names):
+        """Return the row positions of the given names as an int32 vector (-1 if absent)"""
+        lookup = {name: i for i, name in enumerate(self.names)}
+        return np.array([lookup.get(name, -1) for name in names], dtype=np.int32)
+
+def _decode(values):
+    """Return a list of str from a column of bytes/str/objects"""
+    return [v.decode() if isinstance(v, bytes) else str(v) for v in values]
+
+def _build_table(raw, params):
+    """Build a ColumnTable from a {header: values} dict, taking the names from its text column"""
+    text = [h for h, v in raw.items() if np.asarray(v).dtype.kind not in 'fiub']
+    if text:
+        names = _decode(raw[text[0]])
+    else:
+        # No name column, number the rows instead
+        names = [str(i + 1) for i in range(len(next(iter(raw.values()))))]
+    columns = {}
+    for param, header_name in params.items():
+        if header_name in raw:
+            values = np.asarray(raw[header_name], dtype=np.float64).ravel()
+            if field_dtype(param) is not np.float64:
+                values = np.nan_to_num(values)
+            columns[param] = np.ascontiguousarray(values, dtype=field_dtype(param))
+    return ColumnTable(names, columns)
+
+def _build_system(raw):
+    """Build the SYSTEM {property: value} dict"""
+    headers = list(raw.keys())
+    prop_key = 'Property' if 'Property' in raw else headers[0]
+    value_keys = [h for h in headers if h != prop_key]
+    value_key = 'Value' if 'Value' in raw else (value_keys[0] if value_keys else None)
+    props = _decode(np.asarray(raw[prop_key]).ravel())
+    values = np.asarray(raw[value_key]).ravel() if value_key else [None] * len(props)
+    return dict(zip(props, values))
+
+class Topology:
+    """
+    Bus-level connectivity of the network.
+
+    buses are the bus names, branch_from/branch_to the bus position of each
+    BRANCHDATA row (BRANCHBUS tab, -1 if unmapped), gen_unit/gen_bus/
+    gen_factor the GEN row, bus position and participation factor of each
+    GENBUS entry and slack the position of SLACK_BUS. load_factors is the
+    share of the system load at every bus (LOAD_DIST tab), None without it.
+    """
+
+    def __init__(self, buses, branch_from, branch_to, gen_unit, gen_bus, gen_factor, slack, load_factors=None):
+        self.buses = list(buses)
+        self.branch_from = branch_from
+        self.branch_to = branch_to
+        self.gen_unit = gen_unit
+        self.gen_bus = gen_bus
+        self.gen_factor = gen_factor
+        self.slack = slack
+        self.load_factors = load_factors
+
+    @property
+    def nbus(self):
+        return len(self.buses)
+
+    def gen_injection_matrix(self, ngen):
+        """Sparse (nbus, ngen) matrix mapping unit output to bus injections"""
+        import scipy.sparse as sp
+        return sp.csr_matrix((self.gen_factor, (self.gen_bus, self.gen_unit)), shape=(self.nbus, ngen))
+
+def _build_topology(tables, branch, gen, system):
+    """Build the Topology from the BRANCHBUS/GENBUS/LOAD_DIST tabs, or None without BRANCHBUS"""
+    if 'BRANCHBUS' not in tables:
+        return None
+    raw = tables['BRANCHBUS']
+    headers = list(raw.keys())
+    branch_names = _decode(raw['BRANCH'] if 'BRANCH' in raw else raw[headers[0]])
+    from_names = _decode(raw['FROM'] if 'FROM' in raw else raw[headers[1]])
+    to_names = _decode(raw['TO'] if 'TO' in raw else raw[headers[2]])
+    buses = list(dict.fromkeys(from_names + to_names))
+    position = {bus: i for i, bus in enumerate(buses)}
+    # BRANCHBUS rows in BRANCHDATA order
+    order = branch.index_of(branch_names)
+    branch_from = np.full(branch.n, -1, dtype=np.int32)
+    branch_to = np.full(branch.n, -1, dtype=np.int32)
+    for row, from_name, to_name in zip(order, from_names, to_names):
+        if row >= 0:
+            branch_from[row] = position[from_name]
+            branch_to[row] = position[to_name]
+
+    gen_unit = np.empty(0, dtype=np.int32)
+    gen_bus = np.empty(0, dtype=np.int32)
+    gen_factor = np.empty(0)
+    if 'GENBUS' in tables:
+        raw = tables['GENBUS']
+        headers = list(raw.keys())
+        gen_names = _decode(raw['GEN'] if 'GEN' in raw else raw[headers[0]])
+        bus_names = _decode(raw['BUS'] if 'BUS' in raw else raw[headers[1]])
+        gen_unit = gen.index_of(gen_names)
+        gen_bus = np.array([position.get(b, -1) for b in bus_names], dtype=np.int32)
+        factor_key = 'PARTICIPATION_FACTOR' if 'PARTICIPATION_FACTOR' in raw else None
+        gen_factor = (np.asarray(raw[factor_key], dtype=np.float64) if factor_key
+                      else np.ones(len(gen_names)))
+        keep = (gen_unit >= 0) & (gen_bus >= 0)
+        gen_unit, gen_bus, gen_factor = gen_unit[keep], gen_bus[keep], gen_factor[keep]
+
+    load_factors = None
+    if 'LOAD_DIST' in tables:
+        raw = tables['LOAD_DIST']
+        headers = list(raw.keys())
+        load_buses = _decode(raw['BUS'] if 'BUS' in raw else raw[headers[0]])
+        shares = np.asarray(raw['LOAD_DIST'] if 'LOAD_DIST' in raw else raw[headers[1]], dtype=np.float64)
+        unknown = [bus for bus in load_buses if bus not in position]
+        if unknown:
+            raise ValueError(f"LOAD_DIST buses {unknown} are not connected by any BRANCHBUS branch")
+        load_factors = np.zeros(len(buses))
+        np.add.at(load_factors, [position[bus] for bus in load_buses], np.nan_to_num(shares))
+
+    slack_value = system.get('SLACK_BUS')
+    slack = 0
+    if slack_value is not None:
+        name = str(slack_value.decode() if isinstance(slack_value, bytes) else slack_value)
+        number = name[:-2] if name.endswith('.0') else name
+        if name in position:
+            slack = position[name]
+        elif number in position:
+            slack = position[number]
+        else:
+            # A bus number, 1-based position in the bus list
+            slack = min(max(int(float(name)) - 1, 0), len(buses) - 1)
+    return Topology(buses, branch_from, branch_to, gen_unit, gen_bus, gen_factor, slack, load_factors)
+
+def read_input_tables(fileName=None, tabs=MODEL_TABS, config=settings):
+    """Read the given tabs from the input file in one pass as {tab: {header: values}}"""
+    if fileName is None:
+        fileName = get_input_file(config)
+    tables = {}
+    # pandas/h5py are imported where they are used, keeping them off the startup path
+    if os.path.splitext(fileName)[1].lower() == '.h5':
+        import h5py
+        with h5py.File(fileName, 'r') as f:
+            main_input = f['/Main Input File']
+            for tab in tabs:
+                if tab in main_input:
+                    group = main_input[tab]
+                    tables[tab] = {key: np.asarray(group[key][:]).ravel() for key in group.keys()}
+    else:
+        import pandas as pd
+        with pd.ExcelFile(fileName) as xls:
+            for tab in tabs:
+                if tab in xls.sheet_names:
+                    df = xls.parse(sheet_name=tab)
+                    tables[tab] = {str(col): df[col].to_numpy() for col in df.columns}
+    return tables
+
+class SystemModel:
+    """Columnar GEN/STORAGE/BRANCHDATA/RESERVEPARAM data and network topology of one input file"""
+
+    def __init__(self, tables):
+        empty = ColumnTable([], {})
+        self.system = _build_system(tables['SYSTEM']) if 'SYSTEM' in tables else {}
+        self.gen = _build_table(tables['GEN'], GEN_PARAMS) if 'GEN' in tables else empty
+        self.storage = _build_table(tables['STORAGE'], STORAGE_PARAMS) if 'STORAGE' in tables else empty
+        self.reserve = _build_table(tables['RESERVEPARAM'], RESERVE_PARAMS) if 'RESERVEPARAM' in tables else empty
+        self.branch = _build_table(tables['BRANCHDATA'], BRANCH_PARAMS) if 'BRANCHDATA' in tables else empty
+        self.topology = _build_topology(tables, self.branch, self.gen, self.system)
+
+        # Row of each storage unit in the GEN tab
+        self.storage_gen_index = self.gen.index_of(self.storage.names)
+
+    @property
+    def ngen(self):
+        return self.gen.n
+
+    @property
+    def nbranch(self):
+        return self.branch.n
+
+    def system_value(self, prop, default=None):
+        """Return a SYSTEM tab value as float, or default if the property is missing"""
+        value = self.system.get(prop)
+        if value is None:
+            return default
+        return float(value)
+
+    def gen_type_mask(self, *type_indices):
+        """Boolean mask of the units whose GEN_TYPE is any of the given type indices"""
+        return np.isin(self.gen.column('gen_type', 0), type_indices)
+
+    def units_of_type(self, *type_indices):
+        """Row positions of the units whose GEN_TYPE is any of the given type indices"""
+        return np.flatnonzero(self.gen_type_mask(*type_indices)).astype(np.int32)
+
+    def branch_type_mask(self, *type_indices):
+        """Boolean mask of the branches whose BRANCH_TYPE is any of the given type indices"""
+        return np.isin(self.branch.column('branch_type', 0), type_indices)
+
+def load_system_model(fileName=None, config=settings):
+    """Load the SystemModel of the input file of config (settings or a RunConfig), or of fileName"""
+    return SystemModel(read_input_tables(fileName, config=config))
+
+# Usage:
+# if __name__ == "__main__":
+#     model = load_system_model()
+#     wind = model.units_of_type(TYPE_INDICES.wind_gen_type_index)
+#     print(model.gen.capacity[wind].sum())
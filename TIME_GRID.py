@@ -0,0 +1,147 @@
+# % Multi-resolution time grid of a FESTIV run.
+# %
+# % Every stage cadence (DAC, RTC, RTD, AGC) is converted once to integer
+# % seconds. Interval starts, binding intervals, look-ahead windows and the
+# % DA->RT and RT->ACT settlement alignments are precomputed as integer
+# % arrays, so the main loop does integer lookups instead of repeated float
+# % modulo and eps comparisons.
+
+import numpy as np
+
+def on_boundary(time_seconds, period_seconds):
+    """True if time_seconds falls on a multiple of period_seconds (both rounded to whole seconds)"""
+    period_seconds = int(round(period_seconds))
+    return period_seconds > 0 and int(round(time_seconds)) % period_seconds == 0
+
+def align_intervals(end_times, interval, lining):
+    """
+    Map interval end times (seconds) onto the index of the coarser interval they settle against.
+
+    lining follows DA2RTInterval_Lining/RT2ACTInterval_Lining:
+    1 top of interval, e.g. hourly 1:05 ... 2:00 -> 1:00
+    2 middle of interval, e.g. 0:35 ... 1:30 -> 1:00
+    3 bottom of interval, e.g. 0:05 ... 1:00 -> 1:00
+    The index of the interval labelled T is T / interval.
+    """
+    end_times = np.asarray(end_times, dtype=np.int64)
+    if lining == 1:
+        return (end_times - 1) // interval
+    if lining == 2:
+        return (end_times - 1 + interval // 2) // interval
+    if lining == 3:
+        return (end_times - 1) // interval + 1
+    raise ValueError(f"Unknown interval lining {lining}")
+
+class StageGrid:
+    """
+    Solve times and look-ahead windows of one scheduling stage, in seconds.
+
+    run_times[i] is when the i-th solve is issued, binding[i] the start of
+    its binding (first) interval and lookahead[i, k] the start of its k-th
+    interval; interval_lengths[k] is the length of look-ahead interval k.
+    """
+
+    def __init__(self, name, frequency, interval, horizon, processing, total, advisory_interval=None):
+        self.name = name
+        self.frequency = int(frequency)
+        self.interval = int(interval)
+        self.horizon = int(horizon)
+        self.processing = int(processing)
+
+        lengths = np.full(self.horizon, self.interval, dtype=np.int64)
+        if advisory_interval and self.horizon > 1:
+            lengths[1:] = int(advisory_interval)
+        self.interval_lengths = lengths
+        offsets = np.concatenate(([0], np.cumsum(lengths[:-1])))
+
+        # Solves are issued processing seconds before their binding interval
+        self.binding = np.arange(0, total, self.frequency, dtype=np.int64)
+        self.run_times = self.binding - self.processing
+        self.lookahead = self.binding[:, None] + offsets[None, :]
+        self.nruns = len(self.binding)
+
+    def run_index(self, time_seconds):
+        """Index of the latest solve whose binding interval has started by time_seconds"""
+        return min(int(time_seconds) // self.frequency, self.nruns - 1)
+
+    def run_issued_at(self, time_seconds):
+        """Index of the solve issued at time_seconds (see runs_at)"""
+        return (int(time_seconds) + self.processing) // self.frequency
+
+    def runs_at(self, time_seconds):
+        """True if a solve of this stage is issued at time_seconds"""
+        return (int(time_seconds) + self.processing) % self.frequency == 0
+
+class TimeGrid:
+    """Integer-indexed DAC/RTC/RTD/AGC time tables of one run"""
+
+    def __init__(self, config, tAGC=None):
+        self.tAGC = int(tAGC if tAGC is not None else config.tAGC)
+        self.total = int(config.daystosimulate * 86400 + config.hours_to_simulate_in * 3600
+                         + config.minutes_to_simulate_in * 60 + config.seconds_to_simulate_in)
+
+        self.dac = StageGrid('DAC', config.tDAC_in * 3600, config.IDAC_in * 3600,
+                             config.HDAC_in // config.IDAC_in, 0, self.total)
+        # DASCUC is solved GDAC_in hours ahead of the day it schedules
+        self.dac.run_times = self.dac.binding - int(config.GDAC_in * 3600)
+        self.rtc = StageGrid('RTC', config.tRTC_in * 60, config.IRTC_in * 60,
+                             config.HRTC_in, config.PRTC_in * 60, self.total)
+        self.rtd = StageGrid('RTD', config.tRTD_in * 60, config.IRTD_in * 60,
+                             config.HRTD_in, config.PRTD_in * 60, self.total,
+                             advisory_interval=config.IRTDADV_in * 60)
+
+        # AGC steps and how many of them each stage interval spans
+        self.nagc = self.total // self.tAGC
+        self.agc_per_rtd = self.rtd.interval // self.tAGC
+        self.agc_per_rtc = self.rtc.interval // self.tAGC
+
+        # Settlement alignment: RTD interval -> DAC interval, AGC step -> RTD interval
+        # and the AGC steps of each RTD interval
+        rtd_ends = self.rtd.binding + self.rtd.interval
+        self.rt2da = align_intervals(rtd_ends, self.dac.interval, config.DA2RTInterval_Lining)
+        step_ends = (np.arange(self.nagc, dtype=np.int64) + 1) * self.tAGC
+        self.rt2act = align_intervals(step_ends, self.rtd.interval, config.RT2ACTInterval_Lining)
+        self.rtd_first_step = self.rtd.binding // self.tAGC
+
+        # RTC interval -> DAC interval, for RTSCUC commitments taken from DASCUC
+        rtc_ends = self.rtc.binding + self.rtc.interval
+        self.rtc2da = align_intervals(rtc_ends, self.dac.interval, config.DA2RTInterval_Lining)
+
+    def step_time(self, step):
+        """Time in seconds at the start of AGC step"""
+        return step * self.tAGC
+
+    def rtd_interval_of_step(self, step):
+        """RTD interval an AGC step settles against (RT2ACTInterval_Lining); works on arrays too"""
+        return self.rt2act[step]
+
+    def rtc_due(self, step):
+        """True if an RTSCUC solve is issued at this AGC step"""
+        return self.rtc.runs_at(step * self.tAGC)
+
+    def rtd_due(self, step):
+        """True if an RTSCED solve is issued at this AGC step"""
+        return self.rtd.runs_at(step * self.tAGC)
+
+    def dac_due(self, step):
+        """True if a DASCUC solve is issued at this AGC step"""
+        return (step * self.tAGC - self.dac.run_times[0]) % self.dac.frequency == 0
+
+    def events(self):
+        """Sorted (AGC step, stage) pairs of every solve in the horizon, stage in 'DAC', 'RTC', 'RTD'"""
+        steps = []
+        stages = []
+        for stage in (self.dac, self.rtc, self.rtd):
+            steps.append(stage.run_times // self.tAGC)
+            stages.append(np.full(stage.nruns, stage.name))
+        steps = np.concatenate(steps)
+        stages = np.concatenate(stages)
+        order = np.argsort(steps, kind='stable')
+        return steps[order], stages[order]
+
+# Example usage:
+# if __name__ == "__main__":
+#     grid = TimeGrid(run_config)
+#     for step in range(grid.nagc):
+#         if grid.rtd_due(step):
+#             window = grid.rtd.lookahead[grid.rtd.run_issued_at(grid.step_time(step))]
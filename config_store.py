@@ -0,0 +1,137 @@
+import json
+import os
+import struct
+import zipfile
+import numpy as np
+
+# A config is stored as <base>.npz (uncompressed, one member per array) plus a
+# <base>.json sidecar with the scalars, strings and other plain values. The
+# members of an uncompressed npz are contiguous .npy images inside the zip,
+# so they can be memory-mapped in place instead of being read and copied.
+
+def config_paths(base):
+    """Return the (.npz, .json) paths of a config base name"""
+    base = os.path.splitext(base)[0] if base.endswith(('.npz', '.json')) else base
+    return base + '.npz', base + '.json'
+
+def _to_plain(value, nested=False):
+    """
+    Return value as a JSON-serializable object.
+
+    Top-level numeric arrays with more than one element return None, meaning
+    they are kept binary. Cell arrays and structs are converted recursively.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in ('U', 'S'):
+            if value.dtype.kind == 'S':
+                value = np.char.decode(value, 'utf-8')
+            return str(value.item()) if value.size == 1 else value.tolist()
+        if value.dtype.names:
+            structs = [{name: _to_plain(item[name], True) for name in value.dtype.names}
+                       for item in value.ravel()]
+            return structs[0] if len(structs) == 1 else structs
+        if value.dtype.kind == 'O':
+            cells = [_to_plain(item, True) for item in value.ravel()]
+            return cells[0] if len(cells) == 1 else cells
+        if value.size == 1:
+            return value.item()
+        return value.tolist() if nested else None
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+def save_config(variables, base):
+    """
+    Write a {name: value} dict as a binary config, replacing any previous one.
+
+    Arrays go to the npz unchanged (dtype and shape preserved), 1x1 arrays
+    become scalars, char arrays become strings. Writing is a single pass over
+    the data and the result only depends on the input, so repeating the
+    conversion is harmless.
+    """
+    npz_path, json_path = config_paths(base)
+    arrays = {}
+    plain = {}
+    for key, value in variables.items():
+        converted = _to_plain(value)
+        if converted is None:
+            arrays[key] = np.ascontiguousarray(value)
+        else:
+            plain[key] = converted
+
+    for path, writer in ((npz_path, lambda f: np.savez(f, **arrays)),
+                         (json_path, lambda f: f.write(json.dumps(plain, indent=1, sort_keys=True, default=str).encode()))):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            writer(f)
+        os.replace(tmp_path, path)
+    return npz_path, json_path
+
+def _memmap_member(npz_path, info):
+    """Memory-map one stored (uncompressed) .npy member of an npz file"""
+    with open(npz_path, 'rb') as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"{info.filename} holds Python objects and cannot be memory-mapped")
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype, order='F' if fortran_order else 'C')
+    return np.memmap(npz_path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+class ConfigStore:
+    """Lazily loaded binary config: plain values come from the JSON, arrays are mapped on first use"""
+
+    def __init__(self, base):
+        self.npz_path, self.json_path = config_paths(base)
+        with open(self.json_path, 'r') as f:
+            self._plain = json.load(f)
+        with zipfile.ZipFile(self.npz_path) as zf:
+            self._members = {os.path.splitext(info.filename)[0]: info for info in zf.infolist()}
+        self._arrays = {}
+
+    def keys(self):
+        return list(self._plain) + list(self._members)
+
+    def __contains__(self, key):
+        return key in self._plain or key in self._members
+
+    def __getitem__(self, key):
+        if key in self._plain:
+            return self._plain[key]
+        if key not in self._arrays:
+            info = self._members[key]
+            if info.compress_type != zipfile.ZIP_STORED:
+                # Compressed members cannot be mapped, fall back to reading them
+                with np.load(self.npz_path) as npz:
+                    self._arrays[key] = npz[key]
+            else:
+                self._arrays[key] = _memmap_member(self.npz_path, info)
+        return self._arrays[key]
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def apply_to(self, module):
+        """Set every config value as an attribute of module (e.g. settings)"""
+        for key in self.keys():
+            setattr(module, key, self[key])
+
+def load_config(base):
+    """Open the binary config written by save_config"""
+    return ConfigStore(base)
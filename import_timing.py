@@ -0,0 +1,51 @@
+import builtins
+import sys
+import time
+
+class ImportTimer:
+    """
+    Record how long each top-level import takes while active.
+
+    Only the outermost import of a module that was not loaded yet is timed,
+    so the time of a package includes everything it pulls in and every
+    module appears once. Use as a context manager and call report() after.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._depth = 0
+        self._original_import = None
+
+    def __enter__(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if self._depth or level or name in sys.modules:
+            self._depth += 1
+            try:
+                return self._original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+    def report(self, top=15, file=None):
+        """Print the slowest imports and the total import time"""
+        file = file or sys.stdout
+        print(f"Import time: {self.total * 1000:.1f} ms", file=file)
+        for name, seconds in sorted(self.timings.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"  {seconds * 1000:9.1f} ms  {name}", file=file)
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+CACHE_SUFFIX = '.cache.h5'
+CACHE_VERSION = 1
+
+def cache_path_for(workbook_path):
+    """Return the path of the parsed-input cache that sits next to a workbook"""
+    input_dir = os.path.dirname(workbook_path)
+    input_name = os.path.splitext(os.path.basename(workbook_path))[0]
+    return os.path.join(input_dir, f"{input_name}{CACHE_SUFFIX}")
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _cache_is_valid(cache_file, workbook_path):
+    """Check whether cache_file was built from the current contents of the workbook"""
+    if not os.path.isfile(cache_file):
+        return False
+    # h5py is only loaded once an input file is actually read, not at startup
+    import h5py
+    stat = os.stat(workbook_path)
+    try:
+        with h5py.File(cache_file, 'r') as f:
+            attrs = f.attrs
+            if attrs.get('cache_version') != CACHE_VERSION:
+                return False
+            # Same size and mtime as when converted, no need to hash again
+            if attrs.get('source_size') == stat.st_size and attrs.get('source_mtime') == stat.st_mtime:
+                return True
+            source_hash = attrs.get('source_sha256')
+    except OSError:
+        return False
+    if source_hash != file_sha256(workbook_path):
+        return False
+    # Contents unchanged (e.g. file was touched or copied), refresh the fast-path stamp
+    try:
+        with h5py.File(cache_file, 'r+') as f:
+            f.attrs['source_size'] = stat.st_size
+            f.attrs['source_mtime'] = stat.st_mtime
+    except OSError:
+        # Read-only cache, still valid; the workbook is just hashed again next time
+        pass
+    return True
+
+def _is_blank(value):
+    """True for the None/NaN pandas uses for empty cells"""
+    return value is None or (isinstance(value, float) and value != value)
+
+def _write_column(group, name, values):
+    """Write one sheet column as a compressed dataset"""
+    import h5py
+    values = np.asarray(values)
+    if values.dtype.kind in 'fiub':
+        group.create_dataset(name, data=values, compression='gzip', shuffle=True)
+    else:
+        text = np.array(['' if _is_blank(v) else str(v) for v in values], dtype=object)
+        group.create_dataset(name, data=text, dtype=h5py.string_dtype(), compression='gzip')
+
+def convert_workbook(workbook_path, cache_file=None):
+    """
+    Parse every sheet of the workbook once and write it to a compressed HDF5 cache.
+
+    The layout mirrors the .h5 inputs ('/Main Input File/<SHEET>/<HEADER>'), so
+    the HDF5 readers in DECLARE_INDICES and SYSTEM_MODEL read it unchanged.
+    Column order is preserved, with the SYSTEM tab stored as Property/Value.
+    """
+    if cache_file is None:
+        cache_file = cache_path_for(workbook_path)
+    # pandas/openpyxl are only needed when a workbook actually has to be parsed
+    import pandas as pd
+    source_hash = file_sha256(workbook_path)
+    stat = os.stat(workbook_path)
+    sheets = pd.read_excel(workbook_path, sheet_name=None)
+
+    # A unique temporary name, so runs converting the same workbook at once never share a file
+    fd, tmp_file = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(cache_file) + '.',
+                                    dir=os.path.dirname(cache_file) or '.')
+    os.close(fd)
+    try:
+        _write_cache(tmp_file, sheets, source_hash, stat)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return cache_file
+
+def _write_cache(tmp_file, sheets, source_hash, stat):
+    """Write the parsed sheets and the source stamp to tmp_file"""
+    import h5py
+    with h5py.File(tmp_file, 'w') as f:
+        f.attrs['cache_version'] = CACHE_VERSION
+        f.attrs['source_sha256'] = source_hash
+        f.attrs['source_size'] = stat.st_size
+        f.attrs['source_mtime'] = stat.st_mtime
+        main_input = f.create_group('Main Input File', track_order=True)
+        for sheet_name, df in sheets.items():
+            group = main_input.create_group(sheet_name, track_order=True)
+            headers = [str(col) for col in df.columns]
+            if sheet_name == 'SYSTEM' and len(headers) >= 2:
+                # Column A holds the property names below its header cell
+                headers[:2] = ['Property', 'Value']
+            for header, col in zip(headers, df.columns):
+                # h5py would turn '/' into nested groups, which the readers never look at
+                if '/' in header:
+                    raise ValueError(f"Column '{header}' of sheet '{sheet_name}' contains '/', "
+                                     "which cannot be used as an input header")
+                if header in group:
+                    raise ValueError(f"Sheet '{sheet_name}' has more than one column named '{header}'")
+                _write_column(group, header, df[col].to_numpy())
+
+def cached_input_file(workbook_path):
+    """
+    Return the parsed-input cache of a workbook, converting it first if it is missing or stale.
+
+    If the cache cannot be written (e.g. a read-only input folder) the
+    workbook itself is returned and read directly.
+    """
+    cache_file = cache_path_for(workbook_path)
+    if not _cache_is_valid(cache_file, workbook_path):
+        print(f"Converting {os.path.basename(workbook_path)} to {os.path.basename(cache_file)}")
+        try:
+            convert_workbook(workbook_path, cache_file)
+        except OSError as error:
+            print(f"Could not write {os.path.basename(cache_file)} ({error}), reading the workbook directly")
+            return workbook_path
+    return cache_file
+
+# Example usage:
+# if __name__ == "__main__":
+#     print(cached_input_file('PJM_5_BUS.xlsx'))
@@ -0,0 +1,239 @@
+import numpy as np
+import scipy.sparse as sp
+
+def _full(value, shape, dtype=float):
+    """A flat, writable copy of value broadcast to shape"""
+    return np.array(np.broadcast_to(np.asarray(value, dtype=dtype), shape), dtype=dtype).ravel()
+
+class VarBlock:
+    """A named block of model variables; index holds the column of each variable"""
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+    @property
+    def shape(self):
+        return self.index.shape
+
+    def values(self, x):
+        """This block's values in a solution vector"""
+        return np.asarray(x)[self.index]
+
+class RowBlock:
+    """A named block of constraint rows"""
+
+    def __init__(self, name, start, stop):
+        self.name = name
+        self.start = start
+        self.stop = stop
+
+    @property
+    def rows(self):
+        return np.arange(self.start, self.stop)
+
+    def __len__(self):
+        return self.stop - self.start
+
+class LinearModel:
+    """
+    Sparse (MI)LP assembled block by block from NumPy index arrays.
+
+    Variables are added as whole blocks (e.g. dispatch for every unit and
+    interval) and constraints as blocks of rows whose terms are given as
+    (coefficient, column) arrays, so the matrix is built as one COO -> CSR
+    conversion with no per-row Python loops. Row and column bounds stay
+    editable after assembly, which lets a model be re-solved with new
+    right-hand sides without rebuilding the matrix.
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.row_blocks = {}
+        self.nvars = 0
+        self.nrows = 0
+        self._cost = []
+        self._lb = []
+        self._ub = []
+        self._integer = []
+        self._coo_rows = []
+        self._coo_cols = []
+        self._coo_vals = []
+        self._row_lb = []
+        self._row_ub = []
+        self._matrix = None
+
+    # Variables
+
+    def add_variables(self, name, shape, lb=0.0, ub=np.inf, cost=0.0, integer=False):
+        """Add a block of variables with broadcastable bounds and costs"""
+        shape = tuple(np.atleast_1d(shape))
+        n = int(np.prod(shape))
+        index = np.arange(self.nvars, self.nvars + n).reshape(shape)
+        self.nvars += n
+        self._cost.append(_full(cost, shape))
+        self._lb.append(_full(lb, shape))
+        self._ub.append(_full(ub, shape))
+        self._integer.append(np.full(n, 1 if integer else 0, dtype=np.uint8))
+        block = VarBlock(name, index)
+        self.blocks[name] = block
+        self._matrix = None
+        return block
+
+    # Constraints
+
+    def add_rows(self, name, terms, lb=-np.inf, ub=np.inf):
+        """
+        Add a block of rows lb <= sum(coef * x[col]) <= ub.
+
+        terms is a list of (coef, cols) pairs whose arrays broadcast to a
+        common shape (nrows,) or (nrows, k); row i collects every entry in
+        position i. Columns of -1 are skipped, which allows ragged rows
+        (e.g. minimum up time windows of different lengths).
+        """
+        shapes = [np.broadcast_shapes(np.shape(c), np.shape(i)) for c, i in terms]
+        nrows = max(s[0] if s else 1 for s in shapes)
+        for coef, cols in terms:
+            shape = np.broadcast_shapes(np.shape(coef), np.shape(cols))
+            if len(shape) == 0:
+                shape = (nrows,)
+            coef = np.broadcast_to(np.asarray(coef, dtype=float), shape)
+            cols = np.broadcast_to(np.asarray(cols), shape)
+            rows = np.broadcast_to(np.arange(nrows).reshape((nrows,) + (1,) * (len(shape) - 1)), shape)
+            keep = (cols >= 0) & (coef != 0)
+            self._coo_rows.append(rows[keep] + self.nrows)
+            self._coo_cols.append(cols[keep])
+            self._coo_vals.append(coef[keep])
+        self._row_lb.append(_full(lb, (nrows,)))
+        self._row_ub.append(_full(ub, (nrows,)))
+        block = RowBlock(name, self.nrows, self.nrows + nrows)
+        self.row_blocks[name] = block
+        self.nrows += nrows
+        self._matrix = None
+        return block
+
+    # Assembled data
+
+    def _concat(self, parts, dtype=float):
+        if len(parts) != 1:
+            merged = np.concatenate(parts).astype(dtype, copy=False) if parts else np.empty(0, dtype)
+            parts[:] = [merged]
+        return parts[0]
+
+    @property
+    def matrix(self):
+        """Constraint matrix as CSR, assembled once"""
+        if self._matrix is None:
+            rows = self._concat(self._coo_rows, np.int64)
+            cols = self._concat(self._coo_cols, np.int64)
+            vals = self._concat(self._coo_vals)
+            self._matrix = sp.coo_matrix((vals, (rows, cols)), shape=(self.nrows, self.nvars)).tocsr()
+        return self._matrix
+
+    @property
+    def cost(self):
+        return self._concat(self._cost)
+
+    @property
+    def lb(self):
+        return self._concat(self._lb)
+
+    @property
+    def ub(self):
+        return self._concat(self._ub)
+
+    @property
+    def integrality(self):
+        return self._concat(self._integer, np.uint8)
+
+    @property
+    def row_lb(self):
+        return self._concat(self._row_lb)
+
+    @property
+    def row_ub(self):
+        return self._concat(self._row_ub)
+
+    # Updates between solves
+
+    def set_row_bounds(self, name, lb=None, ub=None):
+        """Change the bounds of a row block in place"""
+        block = self.row_blocks[name]
+        if lb is not None:
+            self.row_lb[block.start:block.stop] = lb
+        if ub is not None:
+            self.row_ub[block.start:block.stop] = ub
+
+    def set_var_bounds(self, name, lb=None, ub=None):
+        """Change the bounds of a variable block in place"""
+        index = self.blocks[name].index.ravel()
+        if lb is not None:
+            self.lb[index] = np.broadcast_to(lb, self.blocks[name].shape).ravel()
+        if ub is not None:
+            self.ub[index] = np.broadcast_to(ub, self.blocks[name].shape).ravel()
+
+    def set_cost(self, name, cost):
+        """Change the objective coefficients of a variable block in place"""
+        block = self.blocks[name]
+        self.cost[block.index.ravel()] = np.broadcast_to(cost, block.shape).ravel()
+
+    # Solving
+
+    def solve_milp(self, integer=True, time_limit=None, mip_gap=None):
+        """Solve from scratch with HiGHS through scipy.optimize.milp; returns an LPSolution (no duals)"""
+        from scipy.optimize import milp, LinearConstraint, Bounds
+        options = {}
+        if time_limit is not None:
+            options['time_limit'] = time_limit
+        if mip_gap is not None:
+            options['mip_rel_gap'] = mip_gap
+        constraints = LinearConstraint(self.matrix, self.row_lb, self.row_ub) if self.nrows else None
+        result = milp(self.cost, integrality=self.integrality if integer else None,
+                      bounds=Bounds(self.lb, self.ub), constraints=constraints, options=options)
+        return LPSolution(result.x, np.zeros(self.nrows), result.status, result.message, result.fun)
+
+    def solve_lp(self):
+        """
+        Solve the LP relaxation with HiGHS through scipy.optimize.linprog.
+
+        Returns (result, row_duals) where row_duals[i] is the marginal of row i
+        (d objective / d rhs) for every row of the model.
+        """
+        from scipy.optimize import linprog
+        A = self.matrix
+        lb, ub = self.row_lb, self.row_ub
+        eq = lb == ub
+        up = ~eq & np.isfinite(ub)
+        lo = ~eq & np.isfinite(lb)
+        A_ub = sp.vstack([A[up], -A[lo]]).tocsr()
+        b_ub = np.concatenate([ub[up], -lb[lo]])
+        result = linprog(self.cost, A_ub=A_ub if A_ub.shape[0] else None, b_ub=b_ub if A_ub.shape[0] else None,
+                         A_eq=A[eq] if eq.any() else None, b_eq=lb[eq] if eq.any() else None,
+                         bounds=np.column_stack([self.lb, self.ub]), method='highs')
+        duals = np.zeros(self.nrows)
+        if result.status == 0:
+            if eq.any():
+                duals[eq] = result.eqlin.marginals
+            if A_ub.shape[0]:
+                marg = result.ineqlin.marginals
+                nup = int(up.sum())
+                duals[up] += marg[:nup]
+                duals[lo] -= marg[nup:]
+        return result, duals
+
+    def session(self, backend=None):
+        """Load this model into a solver session of backend (default: solver_backend.get_backend())"""
+        if backend is None:
+            from solver_backend import get_backend
+            backend = get_backend()
+        return backend.session(self)
+
+class LPSolution:
+    """Primal values, row duals and status of one solve"""
+
+    def __init__(self, x, duals, status, message, objective):
+        self.x = x
+        self.duals = duals
+        self.status = status
+        self.message = message
+        self.objective = objective
@@ -2,6 +2,10 @@ import scipy.io
 import h5py
 import numpy as np
 import os
+from config_store import save_config
+
+# MATLAB metadata and names that are not valid Python identifiers
+SKIPPED_VARIABLES = ('__header__', '__version__', '__globals__', '__function_workspace__', 'None')
 
 def load_mat_file(mat_file_path):
     """Load a .mat file using scipy.io.loadmat or h5py for HDF5 format."""
@@ -66,6 +70,8 @@ def append_to_settings(mat_data, settings_file='settings2.py'):
     if os.path.exists(settings_file):
         with open(settings_file, 'r') as f:
             for line in f:
+                if line.strip() == 'import numpy as np':
+                    existing_vars.add('np')
                 if line.strip().startswith('#') or not '=' in line:
                     continue
                 var_name = line.split('=')[0].strip()
@@ -74,10 +80,10 @@ def append_to_settings(mat_data, settings_file='settings2.py'):
     # Append new variables to settings.py
     with open(settings_file, 'a') as f:
         f.write('\n# Variables loaded from .mat file\n')
-        f.write('import numpy as np\n')  # Ensure numpy is imported for arrays
-        f.write('from PyQt5.QtWidgets import QPushButton, QLineEdit, QSlider, QLabel\n')  # Import PyQt widgets
+        if 'np' not in existing_vars:
+            f.write('import numpy as np\n')  # Ensure numpy is imported for arrays
         for key, value in mat_data.items():
-            if key in ('__header__', '__version__', '__globals__', 'None'):  # Skip MATLAB metadata and invalid names
+            if key in SKIPPED_VARIABLES:  # Skip MATLAB metadata and invalid names
                 print(f"Skipping invalid or metadata variable '{key}'")
                 continue
             if key in existing_vars:
@@ -124,13 +130,35 @@ def append_to_settings(mat_data, settings_file='settings2.py'):
             f.write(f"{key} = {value_str}\n")
             print(f"Added variable '{key}' to {settings_file}")
 
+def convert_mat_to_config(mat_data, config_base='settings2'):
+    """
+    Write .mat file variables as a binary config (config_base.npz + config_base.json).
+
+    Unlike append_to_settings this rewrites the config from scratch, so running
+    it again on the same .mat file gives the same result, and arrays are stored
+    as binary instead of Python source.
+    """
+    variables = {}
+    for key, value in mat_data.items():
+        if key in SKIPPED_VARIABLES:
+            continue
+        if is_ui_component(value):
+            pyqt_props = map_ui_to_pyqt(value)
+            if pyqt_props:
+                variables[key] = pyqt_props
+            continue
+        variables[key] = value
+    npz_path, json_path = save_config(variables, config_base)
+    print(f"Wrote {len(variables)} variables to {npz_path} and {json_path}")
+    return npz_path, json_path
+
 def main():
-    mat_file_path = r'C:\Users\priya\OneDrive\Desktop\FESTIV_OSS\FESTIV_OSS\tempws.mat'  # Path from your error
+    mat_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tempws.mat')
     if not os.path.exists(mat_file_path):
         print(f"Error: {mat_file_path} not found!")
         return
     mat_data = load_mat_file(mat_file_path)
-    append_to_settings(mat_data, settings_file='settings2.py')  # Use settings2.py as per your error
+    convert_mat_to_config(mat_data, config_base=os.path.join(os.path.dirname(mat_file_path), 'settings2'))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,13 @@
+import copy
+import types
 import settings
 
+# Values of settings.py as first imported, before any run touched them
+_settings_defaults = {
+    name: copy.deepcopy(value) for name, value in vars(settings).items()
+    if not name.startswith('__') and not callable(value) and not isinstance(value, types.ModuleType)
+}
+
 def reset_settings_to_zero(use_float=False):
     """
     Resets all user-defined variables in settings.py to 0 (integer or float).
@@ -24,6 +32,23 @@ def reset_settings_to_zero(use_float=False):
         if var not in protected_vars and not callable(getattr(settings, var)):
             setattr(settings, var, reset_value)
 
+def reset_settings_to_defaults():
+    """
+    Restores every variable in settings.py to the value it is declared with.
+
+    Unlike reset_settings_to_zero, arrays such as dac_vg_error keep their
+    shape and modules imported by settings.py are left alone. Variables added
+    to settings during a run are removed, so each run starts from a clean
+    module; run-invariant data is kept in run_context.shared_cache instead.
+    """
+    for var in list(vars(settings)):
+        if var.startswith('__') or isinstance(getattr(settings, var), types.ModuleType):
+            continue
+        if var not in _settings_defaults and not callable(getattr(settings, var)):
+            delattr(settings, var)
+    for var, value in _settings_defaults.items():
+        setattr(settings, var, copy.deepcopy(value))
+
 # Example usage
 if __name__ == "__main__":
     # Reset to 0.0 (float) for compatibility with MATLAB's floating-point numbers
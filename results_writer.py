@@ -0,0 +1,155 @@
+import queue
+import threading
+import h5py
+import numpy as np
+
+_FLUSH = object()
+_STOP = object()
+_ATTRS = object()
+
+class ResultsWriter:
+    """
+    Append-only, chunked and compressed HDF5 writer for per-interval results.
+
+    Each stage (RTSCUC, RTSCED, ...) is a group holding a 'time' vector and one
+    dataset per quantity (dispatch, commitment, lmp, reserves, flows, ...)
+    whose first axis is the interval. write() only puts the arrays on a
+    bounded queue; a background thread batches flush_rows intervals at a time
+    and appends them to the file, so the simulation loop never waits on disk
+    unless it gets more than max_pending intervals ahead of it.
+    """
+
+    def __init__(self, path, max_pending=64, flush_rows=32, compression='gzip'):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.compression = compression
+        self._file = h5py.File(path, 'w')
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._pending = {}
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='ResultsWriter', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, config, path, **options):
+        """Writer of a RunConfig (or settings), or None when stream_results is off"""
+        if config.stream_results != 1:
+            return None
+        return cls(path, **options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, stage, interval_time, **quantities):
+        """Queue one interval of results for a stage, e.g. write('RTSCED', time, dispatch=x, lmp=y)"""
+        if self._error is not None:
+            raise RuntimeError('results writer failed') from self._error
+        record = {name: np.array(value, copy=True) for name, value in quantities.items()}
+        self._queue.put((stage, float(interval_time), record))
+
+    def set_attributes(self, stage, **values):
+        """Queue summary values (scores, counts, ...) to be stored as attributes of a stage group"""
+        if self._error is not None:
+            raise RuntimeError('results writer failed') from self._error
+        self._queue.put((_ATTRS, stage, dict(values)))
+
+    def flush(self):
+        """Block until everything queued so far is on disk"""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        """Write all pending results and close the file"""
+        if self._file is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+        self._file = None
+        if self._error is not None:
+            raise RuntimeError('results writer failed') from self._error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    self._flush_all()
+                    return
+                if item is _FLUSH:
+                    self._flush_all()
+                elif self._error is None and item[0] is _ATTRS:
+                    _, stage, values = item
+                    self._flush_stage(stage)
+                    self._file.require_group(stage).attrs.update(values)
+                elif self._error is None:
+                    stage, interval_time, record = item
+                    rows = self._pending.setdefault(stage, [])
+                    rows.append((interval_time, record))
+                    if len(rows) >= self.flush_rows:
+                        self._flush_stage(stage)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _flush_all(self):
+        for stage in list(self._pending):
+            self._flush_stage(stage)
+        self._file.flush()
+
+    def _dataset(self, group, name, sample):
+        if name in group:
+            return group[name]
+        shape = sample.shape[1:]
+        chunk_rows = max(1, min(self.flush_rows, (1 << 20) // max(sample[0].nbytes, 1)))
+        return group.create_dataset(
+            name, shape=(0,) + shape, maxshape=(None,) + shape, dtype=sample.dtype,
+            chunks=(chunk_rows,) + shape, compression=self.compression, shuffle=True)
+
+    def _append(self, group, name, block):
+        dataset = self._dataset(group, name, block)
+        n = dataset.shape[0]
+        dataset.resize(n + block.shape[0], axis=0)
+        dataset[n:] = block
+
+    def _flush_stage(self, stage):
+        rows = self._pending.pop(stage, None)
+        if not rows:
+            return
+        group = self._file.require_group(stage)
+        # Every interval of a stage records the same quantities; stack them all before touching the file
+        names = sorted({name for _, record in rows for name in record})
+        blocks = {'time': np.array([t for t, _ in rows])}
+        blocks.update((name, np.stack([record[name] for _, record in rows])) for name in names)
+        lengths = {name: group[name].shape[0] for name in blocks if name in group}
+        try:
+            for name, block in blocks.items():
+                self._append(group, name, block)
+        except Exception:
+            # Undo the datasets already extended so 'time' and the quantities stay aligned
+            for name in blocks:
+                if name in lengths:
+                    group[name].resize(lengths[name], axis=0)
+                elif name in group:
+                    del group[name]
+            raise
+
+def read_results(path, stage, quantity):
+    """Return (time, values) of one recorded quantity"""
+    with h5py.File(path, 'r') as f:
+        group = f[stage]
+        return group['time'][:], group[quantity][:]
+
+def read_attributes(path, stage):
+    """Return the summary attributes of a stage as a dict"""
+    with h5py.File(path, 'r') as f:
+        return dict(f[stage].attrs)
+
+# Example usage:
+# if __name__ == "__main__":
+#     with ResultsWriter('FESTIV_RESULTS.h5') as results:
+#         results.write('RTSCED', time, dispatch=RTSCED_dispatch, lmp=RTSCED_lmp)
@@ -0,0 +1,204 @@
+# % Immutable configuration of one FESTIV run.
+# %
+# % The legacy code keeps every option as a module attribute on settings,
+# % which means only one simulation can exist per process. A RunConfig is
+# % built once from the GUI/file inputs (via settings or a binary config) and
+# % then passed explicitly, so several runs can share a process or execute in
+# % parallel threads/processes without clobbering each other.
+
+import dataclasses
+import types
+import numpy as np
+import settings
+from DECLARE_INDICES import declare_indices, get_input_file
+
+def _error_vector(n):
+    vector = np.zeros((n, 1))
+    vector.flags.writeable = False
+    return vector
+
+@dataclasses.dataclass(frozen=True, slots=True, eq=False)
+class RunConfig:
+    """Frozen per-run options; field names match the settings attributes they replace"""
+
+    # Input file
+    inputPath: str = ''
+    useHDF5: int = 1
+    cache_excel_inputs: int = 1
+    multiplefilecheck: int = 0
+    numberoffiles: int = 1
+    checkthenetwork: str = 'NO'
+    contingencycheck: str = 'NO'
+
+    # Scheduling horizons, intervals and process times
+    HDAC_in: int = 24
+    IDAC_in: int = 1
+    tDAC_in: int = 24
+    GDAC_in: int = 12
+    PDAC_in: int = 1
+    HRTC_in: int = 3
+    IRTC_in: int = 15
+    tRTC_in: int = 15
+    PRTC_in: int = 15
+    tRTCSTART_in: int = 1
+    HRTD_in: int = 2
+    IRTD_in: int = 5
+    tRTD_in: int = 5
+    PRTD_in: int = 5
+    IRTDADV_in: int = 15
+    tAGC: int = 4
+    daystosimulate: int = 1
+    hours_to_simulate_in: int = 0
+    minutes_to_simulate_in: int = 0
+    seconds_to_simulate_in: int = 0
+    start_date_in: int = 1
+
+    # Forecast creation
+    DAC_load_forecast_data_create_in: int = 2
+    DAC_vg_forecast_data_create_in: int = 2
+    RTC_load_forecast_data_create_in: int = 2
+    RTC_vg_forecast_data_create_in: int = 3
+    RTD_load_forecast_data_create_in: int = 2
+    RTD_vg_forecast_data_create_in: int = 3
+    DAC_RESERVE_FORECAST_MODE_in: int = 1
+    RTC_RESERVE_FORECAST_MODE_in: int = 1
+    RTD_RESERVE_FORECAST_MODE_in: int = 1
+
+    # AGC
+    K1_in: float = 1
+    K2_in: float = 2
+    Type3_integral_in: float = 180
+    CPS2_interval_in: float = 10
+    L10_in: float = 50
+    agc_deadband_in: float = 5
+    agcmode: int = 3
+
+    # Reserve pick up
+    HRPU_in: int = 6
+    IRPU_in: int = 10
+    PRPU_in: int = 1
+    ACE_RPU_THRESHOLD_MW_in: float = 1000
+    ACE_RPU_THRESHOLD_T_in: float = 2
+    restrict_multiple_rpu_time_in: float = 10
+    ALLOW_RPU_in: str = 'NO'
+
+    # Contingencies
+    SIMULATE_CONTINGENCIES_in: str = 'NO'
+    Contingency_input_check_in: int = 0
+    gen_outage_time_in: float = 0
+
+    # Debugging
+    USE_INTEGER_in: str = 'YES'
+    solver_in: str = 'HIGHS'
+    suppress_plots_in: str = 'NO'
+    debugcheck_in: int = 0
+    timefordebugstop_in: float = 999
+
+    # GUI_HPC_OPTIONS / DETECT_HARDWARE_OPTIONS
+    use_gui: int = 1
+    on_hpc: int = 0
+    gams_mip_flag: str = ' '
+    gams_lp_flag: str = ' '
+    solver_mip_options: types.MappingProxyType = dataclasses.field(default_factory=lambda: types.MappingProxyType({}))
+    solver_lp_options: types.MappingProxyType = dataclasses.field(default_factory=lambda: types.MappingProxyType({}))
+
+    # FESTIV_ADDL_OPTIONS
+    use_Default_DASCUC: int = 1
+    use_Default_RTSCUC: int = 1
+    use_Default_RTSCED: int = 1
+    use_Default_SCRPU: int = 1
+    use_Default_AGC: int = 1
+    RTSCUCSTART_MODE_RTC: int = 1
+    RTSCUCSTART_MODE_RPU: int = 2
+    RPU_TRIGGER_MODE: int = 1
+    Stop_for_Infeasibilities: int = 1
+    monitor_ALFEE: int = 0
+    Fix_RT_Pump: int = 1
+    reg_proportion: int = 2
+    DA2RTInterval_Lining: int = 2
+    RT2ACTInterval_Lining: int = 3
+    max_price: float = 1000
+    dac_vg_error: np.ndarray = dataclasses.field(default_factory=lambda: _error_vector(24))
+    dac_load_error: np.ndarray = dataclasses.field(default_factory=lambda: _error_vector(24))
+    rtc_vg_error: np.ndarray = dataclasses.field(default_factory=lambda: _error_vector(10))
+    rtc_load_error: np.ndarray = dataclasses.field(default_factory=lambda: _error_vector(10))
+    rtd_vg_error: np.ndarray = dataclasses.field(default_factory=lambda: _error_vector(5))
+    rtd_load_error: np.ndarray = dataclasses.field(default_factory=lambda: _error_vector(5))
+    forecast_seed: int = 0
+    outage_seed: int = 0
+    Dispatch_Schedule_Type: int = 2
+    Dispatch_Schedule_Type2_begin: int = 10
+    Dispatch_Schedule_Type2_end: int = 10
+    RTCPrintResults: int = 0
+    RTDPrintResults: int = 0
+    stream_results: int = 1
+    eps: float = 0.0000001
+
+    # Column indices declared from the input file (see DECLARE_INDICES)
+    indices: types.MappingProxyType = dataclasses.field(default_factory=lambda: types.MappingProxyType({}))
+
+    def __post_init__(self):
+        # Arrays are shared between runs, so make sure nobody can write to them
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, np.ndarray) and value.flags.writeable:
+                value = value.copy()
+                value.flags.writeable = False
+                object.__setattr__(self, field.name, value)
+        for name in ('indices', 'solver_mip_options', 'solver_lp_options'):
+            value = getattr(self, name)
+            if not isinstance(value, types.MappingProxyType):
+                object.__setattr__(self, name, types.MappingProxyType(dict(value)))
+
+    @classmethod
+    def from_source(cls, source=settings, load_indices=False):
+        """
+        Build a RunConfig from any object with settings-style attributes.
+
+        source can be the settings module, a ConfigStore or a namespace.
+        Missing attributes keep their defaults. With load_indices the input
+        file is read (through the header cache) to declare the column indices.
+        """
+        values = {}
+        for field in dataclasses.fields(cls):
+            if field.name == 'indices':
+                continue
+            try:
+                value = getattr(source, field.name)
+            except AttributeError:
+                continue
+            if isinstance(value, np.ndarray) and value.size == 1 and field.type is not np.ndarray:
+                value = value.item()
+            values[field.name] = value
+        config = cls(**values)
+        if load_indices:
+            config = config.with_indices()
+        return config
+
+    def with_indices(self, fileName=None):
+        """Return a copy with the column indices of the input file declared"""
+        if fileName is None:
+            fileName = get_input_file(self)
+        return dataclasses.replace(self, indices=declare_indices(fileName))
+
+    def replace(self, **changes):
+        """Return a copy with some options changed"""
+        return dataclasses.replace(self, **changes)
+
+    def index(self, name):
+        """1-based column index of a declared parameter, or None"""
+        return self.indices.get(name)
+
+    def apply_to(self, module=settings):
+        """Copy the options and indices onto settings for code that still reads module globals"""
+        for field in dataclasses.fields(self):
+            if field.name != 'indices':
+                setattr(module, field.name, getattr(self, field.name))
+        for name, value in self.indices.items():
+            setattr(module, name, value)
+
+# Example usage:
+# if __name__ == "__main__":
+#     from config_store import load_config
+#     config = RunConfig.from_source(load_config('settings2'), load_indices=True)
+#     faster = config.replace(tRTD_in=1, IRTD_in=1)
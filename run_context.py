@@ -0,0 +1,122 @@
+# % Per-run state and the process-wide cache of run-invariant data.
+# %
+# % Each FESTIV run (every entry of the multiple-runs queue) gets a fresh
+# % RunContext holding its RunConfig and a clean namespace for mutable state.
+# % Expensive data that only depends on the inputs -- parsed input tabs,
+# % shift factors, solver handles -- lives in shared_cache, keyed by what it
+# % was built from, so back-to-back runs on the same inputs reuse it.
+
+import os
+import threading
+import types
+from DECLARE_INDICES import get_input_file
+from SYSTEM_MODEL import load_system_model
+
+class SharedCache:
+    """Thread-safe store of run-invariant objects, keyed by (kind, key)"""
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, key, factory):
+        """Return the cached object for (kind, key), building it with factory() on first use"""
+        with self._lock:
+            try:
+                value = self._items[(kind, key)]
+            except KeyError:
+                self.misses += 1
+                value = self._items[(kind, key)] = factory()
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, kind, key, value):
+        with self._lock:
+            self._items[(kind, key)] = value
+
+    def invalidate(self, kind=None):
+        """Drop every cached object, or only those of one kind"""
+        with self._lock:
+            if kind is None:
+                self._items.clear()
+            else:
+                for item_key in [k for k in self._items if k[0] == kind]:
+                    del self._items[item_key]
+
+    def __len__(self):
+        return len(self._items)
+
+shared_cache = SharedCache()
+
+def input_file_key(config):
+    """Cache key of a config's input file: its path and modification time"""
+    fileName = os.path.abspath(get_input_file(config))
+    return (fileName, os.path.getmtime(fileName))
+
+class RunContext:
+    """
+    Everything that belongs to one FESTIV run.
+
+    config is the run's RunConfig, state a fresh namespace for whatever the
+    run mutates, and cache the shared run-invariant data. Resources opened
+    for the run (results writers, ...) are registered with on_close and
+    released when the context ends.
+    """
+
+    def __init__(self, config, run_number=1, cache=shared_cache):
+        self.config = config
+        self.run_number = run_number
+        self.cache = cache
+        self.state = types.SimpleNamespace()
+        self._closers = []
+        # False until results is first asked for; the writer, or None when stream_results is off
+        self._results = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def system_model(self):
+        """SystemModel of the run's input file, shared with other runs on the same file"""
+        return self.cache.get('system_model', input_file_key(self.config),
+                              lambda: load_system_model(config=self.config))
+
+    @property
+    def results(self):
+        """
+        ResultsWriter of the run (FESTIV_RESULTS_<run_number>.h5), opened on first use.
+
+        None when stream_results is off. The writer is closed, and its
+        pending intervals written, when the context ends.
+        """
+        if self._results is False:
+            # h5py is only loaded once a run actually writes results
+            from results_writer import ResultsWriter
+            self._results = ResultsWriter.from_config(self.config, f'FESTIV_RESULTS_{self.run_number}.h5')
+            if self._results is not None:
+                self.on_close(self._results.close)
+        return self._results
+
+    def shared(self, kind, key, factory):
+        """Get run-invariant data (shift factors, solver handles, ...) from the shared cache"""
+        return self.cache.get(kind, key, factory)
+
+    def on_close(self, closer):
+        """Register a callable to run when this run ends"""
+        self._closers.append(closer)
+
+    def close(self):
+        while self._closers:
+            self._closers.pop()()
+
+# Example usage:
+# if __name__ == "__main__":
+#     for run_number, config in enumerate(queued_configs, start=1):
+#         with RunContext(config, run_number) as run:
+#             model = run.system_model   # parsed once for all runs on the same input
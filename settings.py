@@ -5,6 +5,7 @@ execution_from_previous = 0
 
 time = 0 
 tRTC = 0
+tAGC = 4 #AGC time resolution in seconds
 RTSCUC_binding_interval_index = 0
 
 
@@ -12,6 +13,8 @@ use_gui = 1
 on_hpc  = 0    
 gams_mip_flag = ' '
 gams_lp_flag = ' '
+solver_mip_options = {}
+solver_lp_options = {}
 
 #from the FESTIV_ADDL_OPTIONS file
 
@@ -49,6 +52,8 @@ rtc_vg_error = np.zeros((10, 1))
 rtc_load_error = np.zeros((10, 1))
 rtd_vg_error = np.zeros((5, 1))
 rtd_load_error = np.zeros((5, 1))
+forecast_seed = 0
+outage_seed = 0
 
 Dispatch_Schedule_Type = 0
 Dispatch_Schedule_Type2_begin = 0
@@ -56,6 +61,9 @@ Dispatch_Schedule_Type2_end = 0
 
 RTCPrintResults = 0
 RTDPrintResults = 0
+stream_results = 1
+
+cache_excel_inputs = 1
 
 eps = 0
 
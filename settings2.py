@@ -1,21 +1,8 @@
 
 # Variables loaded from .mat file
 import numpy as np
-from PyQt5.QtWidgets import QPushButton, QLineEdit, QSlider, QLabel
 multiplefilecheck = 0
 useHDF5 = 1
-
-# Variables loaded from .mat file
-import numpy as np
-from PyQt5.QtWidgets import QPushButton, QLineEdit, QSlider, QLabel
-
-# Variables loaded from .mat file
-import numpy as np
-from PyQt5.QtWidgets import QPushButton, QLineEdit, QSlider, QLabel
-
-# Variables loaded from .mat file
-import numpy as np
-from PyQt5.QtWidgets import QPushButton, QLineEdit, QSlider, QLabel
 inputPath = 'C:\\Users\\priya\\OneDrive\\Desktop\\FESTIV_MODEL-master\\Input\\5_Bus_Tutorial\\PJM_5_BUS.h5'
 checkthenetwork = 'NO'
 contingencycheck = 'NO'
@@ -108,7 +95,7 @@ radiobutton13 = np.array([])
 radiobutton15 = np.array([])
 timefordebugstop_in_edit = np.array([])
 USE_INTEGER_in = 'YES'
-solver_in = 'CPLEX'
+solver_in = 'HIGHS'
 suppress_plots_in = 'NO'
 debugcheck_in = 0
 timefordebugstop_in = 999
@@ -193,4 +180,3 @@ a = 'C:\\Users\\priya\\OneDrive\\Desktop\\FESTIV_MODEL-master\\Input\\5_Bus_Tuto
 name = 'PJM_5_BUS_WITH_WIND'
 ext = '.h5'
 displayname = 'PJM_5_BUS_WITH_WIND.h5'
-__function_workspace__ = np.array([[ 0,  1, 73, ...,  0,  0,  0]])
@@ -0,0 +1,421 @@
+# % In-process solver backends for the default sub-models.
+# %
+# % The original pipeline writes GDX/.gms files and starts a GAMS process for
+# % every DASCUC, RTSCUC, RTSCED and RPU solve. A SolverBackend instead
+# % receives the LinearModel matrices in memory and keeps a SolverSession
+# % alive across intervals: the matrix is loaded once and only bounds, costs
+# % and integrality are pushed before each solve, so nothing is written to
+# % disk and no process is spawned in the inner loop.
+# %
+# % HiGHS is the default (highspy, or scipy's HiGHS build when highspy is not
+# % installed); Gurobi (gurobipy) and CPLEX (cplex) are used when solver_in
+# % asks for them and their Python bindings are installed. Solver options
+# % are a typed dict (see SOLVER_OPTIONS); the gams_mip_flag/gams_lp_flag
+# % strings are still understood and converted to it.
+
+import abc
+import importlib.util
+import warnings
+import numpy as np
+import settings
+from lp_model import LPSolution
+
+# Typed solver options and their names in HiGHS, Gurobi and CPLEX (a dotted
+# parameter path); None where a solver has no equivalent.
+SOLVER_OPTIONS = {
+    'time_limit': (float, 'time_limit', 'TimeLimit', 'timelimit'),
+    'mip_gap': (float, 'mip_rel_gap', 'MIPGap', 'mip.tolerances.mipgap'),
+    'mip_abs_gap': (float, 'mip_abs_gap', 'MIPGapAbs', 'mip.tolerances.absmipgap'),
+    'threads': (int, 'threads', 'Threads', 'threads'),
+    'presolve': (bool, 'presolve', 'Presolve', 'preprocessing.presolve'),
+    'feasibility_tol': (float, 'primal_feasibility_tolerance', 'FeasibilityTol', 'simplex.tolerances.feasibility'),
+    'seed': (int, 'random_seed', 'Seed', 'randomseed'),
+    'verbose': (bool, 'output_flag', 'OutputFlag', None),
+}
+
+# GAMS option names accepted in gams_mip_flag/gams_lp_flag
+GAMS_OPTION_NAMES = {
+    'reslim': 'time_limit',
+    'optcr': 'mip_gap',
+    'optca': 'mip_abs_gap',
+    'threads': 'threads',
+}
+
+def solver_options(flags=None, **options):
+    """
+    Typed solver options from a GAMS-style flag string and/or keywords.
+
+    flags is a gams_mip_flag/gams_lp_flag string such as
+    'optcr=0.01 reslim=300' or a dict; keywords override it. GAMS tokens
+    with no typed equivalent (optfile=1, lp=cplex, ...) are skipped with a
+    warning; other unknown names raise ValueError.
+    """
+    merged = {}
+    if isinstance(flags, str):
+        for item in flags.replace(',', ' ').split():
+            name, _, value = item.partition('=')
+            name = GAMS_OPTION_NAMES.get(name.strip().lower(), name.strip().lower())
+            if name not in SOLVER_OPTIONS:
+                warnings.warn(f"GAMS option '{item}' has no in-process solver equivalent and is ignored")
+                continue
+            merged[name] = value.strip()
+    elif flags:
+        merged.update(flags)
+    merged.update(options)
+    typed = {}
+    for name, value in merged.items():
+        if name not in SOLVER_OPTIONS:
+            raise ValueError(f"Unknown solver option '{name}'")
+        kind = SOLVER_OPTIONS[name][0]
+        if kind is bool and isinstance(value, str):
+            value = value.strip().lower() in ('1', 'yes', 'true', 'on')
+        typed[name] = kind(value)
+    return typed
+
+def _constraint_rows(model, start=0):
+    """Split the ranged rows of a model (from row start on) into equality, <= and >= row indices"""
+    lb, ub = model.row_lb[start:], model.row_ub[start:]
+    eq = lb == ub
+    up = np.flatnonzero(~eq & np.isfinite(ub))
+    lo = np.flatnonzero(~eq & np.isfinite(lb))
+    return np.flatnonzero(eq) + start, up + start, lo + start
+
+class SolverSession(abc.ABC):
+    """
+    A LinearModel kept loaded in one solver between solves.
+
+    Edit the model with set_row_bounds/set_var_bounds/set_cost and call
+    solve(); the current bounds and costs are pushed to the solver first.
+    Rows added to the model after the session was created (security and
+    transmission cuts) are loaded by the next solve.
+    """
+
+    warm_start = False
+
+    def __init__(self, backend, model):
+        self.backend = backend
+        self.model = model
+        self.solves = 0
+        self._loaded_rows = model.nrows
+
+    def sync(self):
+        """Load rows added to the model since the session was created; by default the solver model is rebuilt"""
+        if self.model.nrows != self._loaded_rows:
+            solves = self.solves
+            self.__init__(self.backend, self.model)
+            self.solves = solves
+
+    def options(self, integer, overrides):
+        """Backend options for the problem class, with per-solve overrides"""
+        options = dict(self.backend.mip_options if integer else self.backend.lp_options)
+        options.update(solver_options(**{k: v for k, v in overrides.items() if v is not None}))
+        return options
+
+    @abc.abstractmethod
+    def solve(self, integer=False, start=None, **options):
+        """
+        Solve with the model's current data; returns an LPSolution.
+
+        integer solves the MILP (row duals are zero), otherwise the LP
+        relaxation. start is a full solution vector used as MIP start where
+        the solver supports it. options override the backend's options for
+        this solve only.
+        """
+
+class ScipySession(SolverSession):
+    """HiGHS through scipy.optimize; every solve starts from scratch"""
+
+    def solve(self, integer=False, start=None, **options):
+        self.solves += 1
+        options = self.options(integer, options)
+        if integer:
+            return self.model.solve_milp(time_limit=options.get('time_limit'), mip_gap=options.get('mip_gap'))
+        result, duals = self.model.solve_lp()
+        return LPSolution(result.x, duals, result.status, result.message, result.fun)
+
+class HighsSession(SolverSession):
+    """One highspy Highs instance; LP solves start from the previous basis"""
+
+    warm_start = True
+
+    def __init__(self, backend, model):
+        super().__init__(backend, model)
+        import highspy
+        self._highspy = highspy
+        A = model.matrix.tocsc()
+        lp = highspy.HighsLp()
+        lp.num_col_ = model.nvars
+        lp.num_row_ = model.nrows
+        lp.col_cost_ = model.cost
+        lp.col_lower_ = model.lb
+        lp.col_upper_ = model.ub
+        lp.row_lower_ = model.row_lb
+        lp.row_upper_ = model.row_ub
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = A.indptr
+        lp.a_matrix_.index_ = A.indices
+        lp.a_matrix_.value_ = A.data
+        self._highs = highspy.Highs()
+        self._highs.setOptionValue('output_flag', False)
+        self._highs.passModel(lp)
+        self._cols = np.arange(model.nvars, dtype=np.int32)
+        self._rows = np.arange(model.nrows, dtype=np.int32)
+        self._integer_cols = np.flatnonzero(model.integrality).astype(np.int32)
+        self._integer = False
+
+    def _set_integrality(self, integer):
+        integer = integer and len(self._integer_cols) > 0
+        if integer != self._integer:
+            kind = self._highspy.HighsVarType.kInteger if integer else self._highspy.HighsVarType.kContinuous
+            self._highs.changeColsIntegrality(len(self._integer_cols), self._integer_cols,
+                                              np.full(len(self._integer_cols), kind))
+            self._integer = integer
+
+    def sync(self):
+        """Append new rows to the loaded model, keeping the current basis"""
+        m, start = self.model, self._loaded_rows
+        if m.nrows == start:
+            return
+        A = m.matrix[start:]
+        self._highs.addRows(A.shape[0], m.row_lb[start:], m.row_ub[start:], A.nnz,
+                            A.indptr[:-1].astype(np.int32), A.indices.astype(np.int32), A.data)
+        self._rows = np.arange(m.nrows, dtype=np.int32)
+        self._loaded_rows = m.nrows
+
+    def solve(self, integer=False, start=None, **options):
+        self.solves += 1
+        self.sync()
+        highspy, h, m = self._highspy, self._highs, self.model
+        h.resetOptions()
+        h.setOptionValue('output_flag', False)
+        for name, value in self.options(integer, options).items():
+            if name == 'presolve':
+                value = 'on' if value else 'off'
+            h.setOptionValue(SOLVER_OPTIONS[name][1], value)
+        h.changeColsCost(m.nvars, self._cols, m.cost)
+        h.changeColsBounds(m.nvars, self._cols, m.lb, m.ub)
+        h.changeRowsBounds(m.nrows, self._rows, m.row_lb, m.row_ub)
+        self._set_integrality(integer)
+        if start is not None and self._integer:
+            h.setSolution(m.nvars, self._cols, np.asarray(start, dtype=float))
+        h.run()
+        model_status = h.getModelStatus()
+        message = h.modelStatusToString(model_status)
+        info = h.getInfo()
+        if info.primal_solution_status != 2:
+            return LPSolution(None, np.zeros(m.nrows), 2, message, np.nan)
+        solution = h.getSolution()
+        duals = np.asarray(solution.row_dual) if info.dual_solution_status == 2 else np.zeros(m.nrows)
+        status = 0 if model_status == highspy.HighsModelStatus.kOptimal else 1
+        return LPSolution(np.asarray(solution.col_value), duals, status, message, info.objective_function_value)
+
+class GurobiSession(SolverSession):
+    """One gurobipy Model; bounds, costs and right-hand sides are updated in place"""
+
+    warm_start = True
+
+    def __init__(self, backend, model):
+        super().__init__(backend, model)
+        import gurobipy
+        self._gp = gurobipy
+        self._env = gurobipy.Env(empty=True)
+        self._env.setParam('OutputFlag', 0)
+        self._env.start()
+        g = self._grb = gurobipy.Model(env=self._env)
+        self._x = g.addMVar(model.nvars, lb=model.lb, ub=model.ub, obj=model.cost)
+        # (rows, constraints, bound) blocks; rows appended later get blocks of their own
+        self._blocks = []
+        self._add_rows(0)
+        self._vtype = np.where(model.integrality > 0, gurobipy.GRB.INTEGER, gurobipy.GRB.CONTINUOUS)
+
+    def _add_rows(self, start):
+        m, g = self.model, self._grb
+        A = m.matrix
+        eq, up, lo = _constraint_rows(m, start)
+        for rows, sense, bound in ((eq, '=', 'row_lb'), (up, '<', 'row_ub'), (lo, '>', 'row_lb')):
+            if len(rows):
+                self._blocks.append((rows, g.addMConstr(A[rows], self._x, sense, getattr(m, bound)[rows]), bound))
+
+    def sync(self):
+        """Append new rows to the loaded model, keeping its environment and last solution"""
+        if self.model.nrows == self._loaded_rows:
+            return
+        self._add_rows(self._loaded_rows)
+        self._loaded_rows = self.model.nrows
+
+    def solve(self, integer=False, start=None, **options):
+        self.solves += 1
+        self.sync()
+        GRB, g, m, x = self._gp.GRB, self._grb, self.model, self._x
+        g.resetParams()
+        g.setParam('OutputFlag', 0)
+        for name, value in self.options(integer, options).items():
+            if SOLVER_OPTIONS[name][2] is not None:
+                g.setParam(SOLVER_OPTIONS[name][2], value)
+        x.Obj = m.cost
+        x.LB = m.lb
+        x.UB = m.ub
+        for rows, constraints, bound in self._blocks:
+            constraints.RHS = getattr(m, bound)[rows]
+        x.VType = self._vtype if integer else GRB.CONTINUOUS
+        if start is not None and integer:
+            x.Start = np.asarray(start, dtype=float)
+        g.optimize()
+        if g.SolCount == 0:
+            return LPSolution(None, np.zeros(m.nrows), 2, f"Gurobi status {g.Status}", np.nan)
+        duals = np.zeros(m.nrows)
+        if not g.IsMIP and g.Status == GRB.OPTIMAL:
+            for rows, constraints, _ in self._blocks:
+                duals[rows] += constraints.Pi
+        status = 0 if g.Status == GRB.OPTIMAL else 1
+        return LPSolution(np.asarray(x.X), duals, status, f"Gurobi status {g.Status}", g.ObjVal)
+
+class CplexSession(SolverSession):
+    """One cplex.Cplex problem with ranged rows; bounds and right-hand sides are updated in place"""
+
+    warm_start = True
+
+    def __init__(self, backend, model):
+        super().__init__(backend, model)
+        import cplex
+        self._cplex = cplex
+        c = self._cpx = cplex.Cplex()
+        for stream in (c.set_log_stream, c.set_results_stream, c.set_warning_stream):
+            stream(None)
+        c.objective.set_sense(c.objective.sense.minimize)
+        c.variables.add(obj=model.cost.tolist(), lb=self._finite(model.lb).tolist(),
+                        ub=self._finite(model.ub).tolist())
+        A = model.matrix
+        rows = [cplex.SparsePair(A.indices[A.indptr[i]:A.indptr[i + 1]].tolist(),
+                                 A.data[A.indptr[i]:A.indptr[i + 1]].tolist()) for i in range(model.nrows)]
+        senses, rhs, ranges = self._row_data()
+        c.linear_constraints.add(lin_expr=rows, senses=senses, rhs=rhs, range_values=ranges)
+        self._cols = list(range(model.nvars))
+        self._rows = list(range(model.nrows))
+        self._integer_cols = np.flatnonzero(model.integrality).tolist()
+
+    def _finite(self, values):
+        return np.clip(values, -self._cplex.infinity, self._cplex.infinity)
+
+    def _row_data(self):
+        lb, ub = self.model.row_lb, self.model.row_ub
+        has_lb, has_ub = np.isfinite(lb), np.isfinite(ub)
+        # Free rows (no bound on either side) are ranged over [-infinity, infinity]
+        free = ~has_lb & ~has_ub
+        infinity = self._cplex.infinity
+        senses = np.where(lb == ub, 'E', np.where((has_lb & has_ub) | free, 'R', np.where(has_ub, 'L', 'G')))
+        rhs = np.where(has_lb, lb, np.where(has_ub, ub, -infinity))
+        ranges = np.where(free, 2 * infinity, np.where(senses == 'R', ub - lb, 0.0))
+        return ''.join(senses), rhs.tolist(), ranges.tolist()
+
+    def _set_parameter(self, path, value):
+        parameter = self._cpx.parameters
+        for part in path.split('.'):
+            parameter = getattr(parameter, part)
+        parameter.set(value)
+
+    def solve(self, integer=False, start=None, **options):
+        self.solves += 1
+        self.sync()
+        cplex, c, m = self._cplex, self._cpx, self.model
+        c.parameters.reset()
+        for name, value in self.options(integer, options).items():
+            if SOLVER_OPTIONS[name][3] is not None:
+                self._set_parameter(SOLVER_OPTIONS[name][3], value)
+        c.objective.set_linear(list(zip(self._cols, m.cost.tolist())))
+        c.variables.set_lower_bounds(list(zip(self._cols, self._finite(m.lb).tolist())))
+        c.variables.set_upper_bounds(list(zip(self._cols, self._finite(m.ub).tolist())))
+        senses, rhs, ranges = self._row_data()
+        c.linear_constraints.set_senses(list(zip(self._rows, senses)))
+        c.linear_constraints.set_rhs(list(zip(self._rows, rhs)))
+        c.linear_constraints.set_range_values(list(zip(self._rows, ranges)))
+        if integer and self._integer_cols:
+            c.variables.set_types([(j, c.variables.type.integer) for j in self._integer_cols])
+            if start is not None:
+                c.MIP_starts.delete()
+                c.MIP_starts.add(cplex.SparsePair(self._cols, np.asarray(start, dtype=float).tolist()),
+                                 c.MIP_starts.effort_level.auto)
+        else:
+            c.set_problem_type(c.problem_type.LP)
+        c.solve()
+        message = c.solution.get_status_string()
+        if not c.solution.is_primal_feasible():
+            return LPSolution(None, np.zeros(m.nrows), 2, message, np.nan)
+        is_mip = integer and self._integer_cols
+        duals = np.zeros(m.nrows) if is_mip else np.asarray(c.solution.get_dual_values())
+        optimal = c.solution.get_status() in (c.solution.status.optimal, c.solution.status.MIP_optimal,
+                                               c.solution.status.optimal_tolerance)
+        return LPSolution(np.asarray(c.solution.get_values()), duals, 0 if optimal else 1, message,
+                          c.solution.get_objective_value())
+
+class SolverBackend:
+    """
+    A solver that LinearModels are handed to in memory.
+
+    mip_options/lp_options are typed option dicts (see solver_options)
+    applied to every MILP/LP solve of the sessions it opens.
+    """
+
+    name = None
+    module = None
+    session_class = None
+
+    def __init__(self, mip_options=None, lp_options=None):
+        self.mip_options = solver_options(mip_options)
+        self.lp_options = solver_options(lp_options)
+
+    @classmethod
+    def available(cls):
+        return cls.module is None or importlib.util.find_spec(cls.module) is not None
+
+    def session(self, model):
+        """Load a LinearModel into a new solver session"""
+        return self.session_class(self, model)
+
+class HighsBackend(SolverBackend):
+    name = 'HIGHS'
+
+    def session(self, model):
+        try:
+            return HighsSession(self, model)
+        except ImportError:
+            return ScipySession(self, model)
+
+class GurobiBackend(SolverBackend):
+    name = 'GUROBI'
+    module = 'gurobipy'
+    session_class = GurobiSession
+
+class CplexBackend(SolverBackend):
+    name = 'CPLEX'
+    module = 'cplex'
+    session_class = CplexSession
+
+BACKENDS = {backend.name: backend for backend in (HighsBackend, GurobiBackend, CplexBackend)}
+
+_backends = {}
+
+def get_backend(config=settings, name=None):
+    """
+    The backend selected by solver_in, with options from the config.
+
+    Falls back to HiGHS with a warning if the selected solver's Python
+    bindings are not installed. Backends are shared per (name, options).
+    """
+    name = (name or getattr(config, 'solver_in', None) or 'HIGHS').upper()
+    mip_options = solver_options(getattr(config, 'gams_mip_flag', None), **dict(getattr(config, 'solver_mip_options', {})))
+    lp_options = solver_options(getattr(config, 'gams_lp_flag', None), **dict(getattr(config, 'solver_lp_options', {})))
+    key = (name, tuple(sorted(mip_options.items())), tuple(sorted(lp_options.items())))
+    if key not in _backends:
+        backend_class = BACKENDS.get(name)
+        if backend_class is None or not backend_class.available():
+            warnings.warn(f"Solver {name} is not available in Python, using HiGHS")
+            backend_class = HighsBackend
+        _backends[key] = backend_class(mip_options, lp_options)
+    return _backends[key]
+
+# Example usage:
+# if __name__ == "__main__":
+#     backend = get_backend(run_config)
+#     session = backend.session(linear_model)
+#     solution = session.solve(integer=True, mip_gap=0.01)
@@ -0,0 +1,244 @@
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sys
+import sysconfig
+
+# How each solver can be found: executables looked up on PATH and in the
+# install directories, environment variables pointing at an install, glob
+# patterns of the usual install locations per platform, and for solvers with
+# Python bindings the module to look for in the running environment.
+SOLVERS = {
+    'gams': {
+        'executables': ('gams', 'gamside'),
+        'env': ('GAMS_DIR', 'GAMSDIR', 'GAMS_SYSDIR'),
+        'dirs': {
+            'Windows': (r'C:\GAMS\*', r'C:\GAMS\win64\*', r'C:\Program Files\GAMS*'),
+            'Linux': ('/opt/gams*', '/opt/gams/*', '/usr/local/gams*', '~/gams*'),
+            'Darwin': ('/Applications/GAMS*/sysdir', '/Library/Frameworks/GAMS.framework/Versions/*/Resources'),
+        },
+    },
+    'cplex': {
+        'executables': ('cplex',),
+        'env': ('CPLEX_HOME', 'CPLEX_STUDIO_BINARIES'),
+        'module': 'cplex',
+        'dirs': {
+            'Windows': (r'C:\Program Files\IBM\ILOG\CPLEX_Studio*\cplex\bin\x64_win64',),
+            'Linux': ('/opt/ibm/ILOG/CPLEX_Studio*/cplex/bin/x86-64_linux',),
+            'Darwin': ('/Applications/CPLEX_Studio*/cplex/bin/*',),
+        },
+    },
+    'gurobi': {
+        'executables': ('gurobi_cl',),
+        'env': ('GUROBI_HOME',),
+        'module': 'gurobipy',
+        'dirs': {
+            'Windows': (r'C:\gurobi*\win64\bin',),
+            'Linux': ('/opt/gurobi*/linux64/bin',),
+            'Darwin': ('/Library/gurobi*/macos_universal2/bin',),
+        },
+    },
+    'highs': {
+        'executables': ('highs',),
+        'env': ('HIGHS_HOME',),
+        'module': 'highspy',
+    },
+    'cbc': {
+        'executables': ('cbc',),
+        'env': ('CBC_HOME',),
+    },
+    'glpk': {
+        'executables': ('glpsol',),
+        'env': ('GLPK_HOME',),
+    },
+}
+
+CACHE_VERSION = 2
+
+def cache_file():
+    """Return the path of the solver discovery cache"""
+    cache_dir = os.environ.get('FESTIV_CACHE_DIR')
+    if not cache_dir:
+        if platform.system() == 'Windows':
+            cache_dir = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'FESTIV')
+        else:
+            cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'festiv')
+    return os.path.join(cache_dir, 'solver_paths.json')
+
+def _environment_fingerprint():
+    """Hash of everything that decides where solvers are found; a change invalidates the cache"""
+    env_names = sorted({name for spec in SOLVERS.values() for name in spec['env']})
+    parts = [os.environ.get('PATH', ''), sys.prefix, platform.system()]
+    parts += [f"{name}={os.environ.get(name, '')}" for name in env_names]
+    return hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+
+def _venv_dirs():
+    """Script directories of the running Python environment"""
+    dirs = [sysconfig.get_path('scripts'), os.path.dirname(sys.executable)]
+    return [d for d in dict.fromkeys(dirs) if d]
+
+def _glob_base(pattern):
+    """The deepest directory of a glob pattern without wildcards, where a new install shows up"""
+    base = os.path.dirname(pattern)
+    while glob.has_magic(base):
+        base = os.path.dirname(base)
+    return base
+
+def _install_dirs():
+    """Known install locations of this platform and the directories the solver environment variables name"""
+    dirs = []
+    for spec in SOLVERS.values():
+        for pattern in spec.get('dirs', {}).get(platform.system(), ()):
+            pattern = os.path.expanduser(pattern)
+            dirs.append(_glob_base(pattern))
+            dirs += sorted(glob.glob(pattern))
+        for env_name in spec['env']:
+            directory = os.environ.get(env_name)
+            if directory:
+                dirs += [directory, os.path.join(directory, 'bin')]
+    return dirs
+
+def _scanned_dirs():
+    """
+    Directories a solver install lands in without changing the fingerprint:
+    PATH, the venv, site-packages and the known install locations
+    """
+    dirs = os.environ.get('PATH', '').split(os.pathsep) + _venv_dirs()
+    dirs += [sysconfig.get_path('purelib'), sysconfig.get_path('platlib')]
+    dirs += _install_dirs()
+    return [d for d in dict.fromkeys(dirs) if d]
+
+def _dir_mtimes():
+    """{directory: mtime} of the scanned directories, None for the missing ones"""
+    mtimes = {}
+    for directory in _scanned_dirs():
+        try:
+            mtimes[directory] = os.path.getmtime(directory)
+        except OSError:
+            mtimes[directory] = None
+    return mtimes
+
+def _executable_in(directory, executables):
+    """Return the first solver executable found directly in (or in bin/ under) directory"""
+    for candidate_dir in (directory, os.path.join(directory, 'bin')):
+        for exe in executables:
+            found = shutil.which(exe, path=candidate_dir)
+            if found:
+                return found
+    return None
+
+def _find(name):
+    """Search for one solver, returning {'path', 'kind'} or None"""
+    spec = SOLVERS[name]
+    executables = spec['executables']
+
+    # PATH and the running environment (a venv may ship the open-source solvers)
+    for exe in executables:
+        found = shutil.which(exe)
+        if found:
+            return {'path': os.path.realpath(found), 'kind': 'executable'}
+    for directory in _venv_dirs():
+        found = _executable_in(directory, executables)
+        if found:
+            return {'path': os.path.realpath(found), 'kind': 'executable'}
+
+    # Environment variables pointing at an install
+    for env_name in spec['env']:
+        directory = os.environ.get(env_name)
+        if directory and os.path.isdir(directory):
+            found = _executable_in(directory, executables)
+            if found:
+                return {'path': os.path.realpath(found), 'kind': 'executable'}
+
+    # Known install locations, newest version first
+    for pattern in spec.get('dirs', {}).get(platform.system(), ()):
+        for directory in sorted(glob.glob(os.path.expanduser(pattern)), reverse=True):
+            found = _executable_in(directory, executables)
+            if found:
+                return {'path': os.path.realpath(found), 'kind': 'executable'}
+
+    # Python bindings, located without importing them
+    module = spec.get('module')
+    if module:
+        module_spec = importlib.util.find_spec(module)
+        if module_spec is not None and module_spec.origin:
+            return {'path': os.path.realpath(module_spec.origin), 'kind': 'module'}
+    return None
+
+def _load_cache():
+    try:
+        with open(cache_file(), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION or cache.get('fingerprint') != _environment_fingerprint():
+        return {}
+    return cache.get('solvers', {})
+
+def _save_cache(solvers):
+    path = cache_file()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'fingerprint': _environment_fingerprint(),
+                       'solvers': solvers}, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only home directory only costs the rediscovery on the next start
+        pass
+
+def _entry_is_valid(entry, dir_mtimes):
+    """
+    A cached hit is valid while the file is still there with the same mtime,
+    a cached miss while the directories scanned for it are unchanged.
+    """
+    if entry.get('path') is None:
+        # e.g. pip install highspy into the venv changes site-packages but not PATH
+        return entry.get('scanned') == dir_mtimes
+    try:
+        return os.path.getmtime(entry['path']) == entry['mtime']
+    except OSError:
+        return False
+
+def discover_solvers(names=None, refresh=False):
+    """
+    Return {solver: {'path', 'kind', 'mtime'} or None} for the given solvers.
+
+    Results are kept in a cache that is reused while PATH, the solver
+    environment variables and the found files are unchanged, so after the
+    first start discovery only stats a handful of files. Solvers that were
+    not found are looked for again once a PATH, venv, site-packages or
+    install directory changes.
+    """
+    names = list(SOLVERS) if names is None else list(names)
+    cache = {} if refresh else _load_cache()
+    dir_mtimes = _dir_mtimes()
+    changed = False
+    for name in names:
+        if name in cache and _entry_is_valid(cache[name], dir_mtimes):
+            continue
+        entry = _find(name)
+        if entry is not None:
+            entry['mtime'] = os.path.getmtime(entry['path'])
+        else:
+            entry = {'path': None, 'scanned': dir_mtimes}
+        cache[name] = entry
+        changed = True
+    if changed:
+        _save_cache(cache)
+    return {name: cache[name] if cache[name]['path'] is not None else None for name in names}
+
+def find_solver(name, refresh=False):
+    """Return the path of a solver executable or Python binding, or '' if it is not installed"""
+    entry = discover_solvers([name], refresh)[name]
+    return entry['path'] if entry else ''
+
+# Example usage:
+# if __name__ == "__main__":
+#     for name, entry in discover_solvers().items():
+#         print(name, entry['path'] if entry else 'not found')
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SYSTEM_MODEL import SystemModel
+
+def _column(values):
+    values = np.asarray(values)
+    return values.astype(object) if values.dtype.kind in 'US' else values.astype(float)
+
+def build_model(gen, system=None, **tabs):
+    """
+    SystemModel from plain {header: values} tabs.
+
+    gen gets GEN names G1, G2, ... unless it has a GEN column, system is a
+    {property: value} dict for the SYSTEM tab and tabs are any other tabs
+    (BRANCHDATA, BRANCHBUS, GENBUS, RESERVEPARAM, ...).
+    """
+    ngen = len(next(iter(gen.values())))
+    tables = {'GEN': {'GEN': np.array([f'G{i + 1}' for i in range(ngen)], dtype=object)}}
+    tables['GEN'].update((header, _column(values)) for header, values in gen.items())
+    system = {} if system is None else system
+    tables['SYSTEM'] = {'Property': np.array(list(system), dtype=object),
+                        'Value': np.array(list(system.values()), dtype=float)}
+    for tab, columns in tabs.items():
+        tables[tab] = {header: _column(values) for header, values in columns.items()}
+    return SystemModel(tables)
+
+@pytest.fixture
+def make_model():
+    return build_model
@@ -0,0 +1,23 @@
+import numpy as np
+
+from SYSTEM_MODEL import TYPE_INDICES
+from AGC import AGCEngine
+
+def _engine(make_model, gen_type):
+    model = make_model({'CAPACITY': [200, 200], 'RAMP_RATE': [900, 900], 'AGC_QUALIFIED': [1, 1],
+                        'GEN_TYPE': [1, gen_type]}, {'VOLL': 1000})
+    return AGCEngine(model, tAGC=4, mode=3, deadband=5, reg_proportion=3, initial_output=[50.0, 0.0])
+
+def test_offline_unit_does_not_regulate_by_default(make_model):
+    agc = _engine(make_model, 1)
+    agc.sace = -40.0
+    agc.advance([50.0, 0.0], 90.0)
+    np.testing.assert_allclose(agc.output, [90.0, 0.0])
+
+def test_regulation_stays_within_available_vg_output(make_model):
+    agc = _engine(make_model, TYPE_INDICES.wind_gen_type_index)
+    agc.output = np.array([50.0, 50.0])
+    agc.sace = -40.0
+    agc.advance([50.0, 50.0], 140.0, available=[0.0, 55.0])
+    assert agc.output[1] <= 55.0
+    np.testing.assert_allclose(agc.output.sum(), 140.0)
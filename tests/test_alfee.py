@@ -0,0 +1,37 @@
+import numpy as np
+
+from ALFEE import ALFEEMonitor
+
+def _dc_flows(output, load):
+    """Flows of L1 (B1-B2), L2 (B2-B3), L3 (B1-B3) from a DC power flow solved with B1 as slack"""
+    x = np.array([0.1, 0.2, 0.1])
+    ends = [(0, 1), (1, 2), (0, 2)]
+    B = np.zeros((3, 3))
+    for (f, t), xl in zip(ends, x):
+        B[np.ix_([f, t], [f, t])] += np.array([[1, -1], [-1, 1]]) / xl
+    injection = np.array([output[0], output[1] - 0.2 * load, -0.8 * load])
+    theta = np.zeros(3)
+    theta[1:] = np.linalg.solve(B[1:, 1:], injection[1:])
+    return np.array([(theta[f] - theta[t]) / xl for (f, t), xl in zip(ends, x)])
+
+def test_alfee_matches_a_dc_power_flow_of_every_step(make_model):
+    model = make_model({'CAPACITY': [200.0, 200.0], 'GEN_TYPE': [1.0, 1.0]}, {'SLACK_BUS': 1.0},
+                       BRANCHDATA={'BRANCH': ['L1', 'L2', 'L3'], 'REACTANCE': [0.1, 0.2, 0.1],
+                                   'LINE_RATING': [50.0, 50.0, 60.0]},
+                       BRANCHBUS={'BRANCH': ['L1', 'L2', 'L3'], 'FROM': ['B1', 'B2', 'B1'],
+                                  'TO': ['B2', 'B3', 'B3']},
+                       GENBUS={'GEN': ['G1', 'G2'], 'BUS': ['B1', 'B2']},
+                       LOAD_DIST={'BUS': ['B2', 'B3'], 'LOAD_DIST': [0.2, 0.8]})
+    alfee = ALFEEMonitor(model, tAGC=4)
+    output = np.random.default_rng(0).uniform(0, 150, (30, 2))
+    load = output.sum(axis=1)
+    for step in range(10):
+        alfee.push(output[step], load[step])
+    alfee.push_block(output[10:], load[10:])
+
+    flows = np.array([_dc_flows(output[step], load[step]) for step in range(30)])
+    excess = np.maximum(np.abs(flows) - [50.0, 50.0, 60.0], 0)
+    np.testing.assert_allclose(alfee.exceedance, excess.sum(axis=0) * 4 / 3600)
+    np.testing.assert_array_equal(alfee.steps_exceeded, np.count_nonzero(excess, axis=0))
+    np.testing.assert_allclose(alfee.max_loading, np.abs(flows).max(axis=0) / [50.0, 50.0, 60.0])
+    assert alfee.steps == 30 and alfee.total > 0
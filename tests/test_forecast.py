@@ -0,0 +1,29 @@
+import numpy as np
+
+from FORECAST import ForecastEngine, error_forecasts
+from TIME_GRID import TimeGrid
+from run_config import RunConfig
+
+def _engine(chunk, run_number=2):
+    config = RunConfig(daystosimulate=1, RTD_vg_forecast_data_create_in=4, RTC_load_forecast_data_create_in=4,
+                       rtd_vg_error=np.full((5, 1), 0.02), rtc_load_error=np.full((10, 1), 0.05))
+    grid = TimeGrid(config)
+    n = grid.total // 4
+    load = 1000 + 200 * np.sin(np.arange(n) * 4 / 86400 * 2 * np.pi)
+    vg = np.random.default_rng(5).uniform(0, 100, (n, 3))
+    return ForecastEngine(grid, config, load, vg, 4, run_number, chunk=chunk), (grid, config, load, vg)
+
+def test_error_forecasts_do_not_depend_on_the_chunk_size_or_access_order():
+    small, (grid, config, load, vg) = _engine(chunk=7)
+    late = small.forecast('RTD', 'vg', 200).copy()
+    large, _ = _engine(chunk=96)
+    expected = error_forecasts(grid, config, load, vg, 4, run_number=2)
+    for stream in (('RTD', 'vg'), ('RTC', 'load')):
+        np.testing.assert_array_equal(small[stream].materialize(), large[stream].materialize())
+        np.testing.assert_array_equal(large[stream].materialize(), expected[stream])
+    np.testing.assert_array_equal(late, expected['RTD', 'vg'][200])
+
+def test_runs_draw_independent_forecasts():
+    first, _ = _engine(chunk=96, run_number=1)
+    second, _ = _engine(chunk=96, run_number=2)
+    assert not np.array_equal(first['RTD', 'vg'].materialize(), second['RTD', 'vg'].materialize())
@@ -0,0 +1,24 @@
+import glob
+
+import pandas as pd
+import pytest
+
+from input_cache import convert_workbook
+
+def _workbook(tmp_path, sheet_name, frame):
+    path = tmp_path / 'inputs.xlsx'
+    frame.to_excel(path, sheet_name=sheet_name, index=False)
+    return str(path)
+
+def test_header_with_slash_is_rejected(tmp_path):
+    path = _workbook(tmp_path, 'GEN', pd.DataFrame({'GEN': ['G1'], 'MW/MIN': [1.0]}))
+    with pytest.raises(ValueError, match="contains '/'"):
+        convert_workbook(path)
+    assert not glob.glob(str(tmp_path / '*.tmp'))
+
+def test_duplicate_header_is_rejected(tmp_path):
+    # Column A/B become Property/Value, so a third 'Value' column clashes
+    frame = pd.DataFrame([['SLACK_BUS', 1.0, 2.0]], columns=['SYSTEM', 'DATA', 'Value'])
+    path = _workbook(tmp_path, 'SYSTEM', frame)
+    with pytest.raises(ValueError, match="more than one column named 'Value'"):
+        convert_workbook(path)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from DASCUC import build_scuc
+from NETWORK_CONSTRAINTS import SecurityCuts, TransmissionCuts, enforce
+from RTSCED import RTSCEDModel
+
+def _triangle(make_model, **tabs):
+    """G1 at B1 serving all the load at B3 over the triangle B1-B2, B2-B3, B1-B3"""
+    return make_model({'CAPACITY': [200.0], 'GEN_TYPE': [1.0]}, {'SLACK_BUS': 1.0},
+                      BRANCHDATA={'BRANCH': ['L1', 'L2', 'L3'], 'REACTANCE': [0.1, 0.1, 0.1],
+                                  'LINE_RATING': [80.0, 80.0, 80.0], 'CTGC_MONITOR': [1.0, 1.0, 1.0]},
+                      BRANCHBUS={'BRANCH': ['L1', 'L2', 'L3'], 'FROM': ['B1', 'B2', 'B1'],
+                                 'TO': ['B2', 'B3', 'B3']},
+                      GENBUS={'GEN': ['G1'], 'BUS': ['B1']}, **tabs)
+
+def test_post_contingency_flows_follow_the_load_distribution(make_model):
+    model = _triangle(make_model, LOAD_DIST={'BUS': ['B3'], 'LOAD_DIST': [1.0]})
+    cuts = SecurityCuts(model)
+    flows = cuts.post_contingency_flows(np.array([[90.0]]), np.array([90.0]))
+    # With L3 out all 90 MW go round B1-B2-B3
+    l3 = list(cuts.contingencies).index(2)
+    np.testing.assert_allclose(flows[[0, 1], l3, 0], [90.0, 90.0])
+
+def test_network_limits_need_the_load_distribution(make_model):
+    with pytest.raises(ValueError, match='LOAD_DIST'):
+        SecurityCuts(_triangle(make_model))
+
+def test_screening_matches_the_network_flows(make_model):
+    model = _triangle(make_model, LOAD_DIST={'BUS': ['B2', 'B3'], 'LOAD_DIST': [0.25, 0.75]})
+    cuts = SecurityCuts(model)
+    dispatch, served = np.array([[60.0, 120.0]]), np.array([60.0, 120.0])
+    f_l = cuts.network.flows(dispatch, served, cuts.monitored)
+    f_k = cuts.network.flows(dispatch, served, cuts.contingencies)
+    expected = f_l[:, None, :] + cuts.lodf[:, :, None] * f_k[None, :, :]
+    np.testing.assert_allclose(cuts.post_contingency_flows(dispatch, served), expected)
+    np.testing.assert_allclose(cuts.loading(dispatch, served),
+                               (np.abs(expected).max(axis=2) / cuts.limit).ravel())
+
+def test_enforce_warns_when_limits_are_still_violated(make_model):
+    model = _triangle(make_model, LOAD_DIST={'BUS': ['B3'], 'LOAD_DIST': [1.0]})
+    cuts = [SecurityCuts(model)]
+    m, _ = build_scuc(model, np.array([150.0]))
+    with pytest.warns(UserWarning, match='still violated'):
+        result = enforce(m.session().solve, m, cuts, max_iterations=1)
+    assert cuts[0].violated(m, result.x)
+
+def test_rtsced_line_limits_use_the_load_distribution(make_model):
+    model = make_model({'CAPACITY': [200.0, 200.0], 'PERUNIT_COST': [20.0, 50.0], 'GEN_TYPE': [1.0, 1.0]},
+                       {'SLACK_BUS': 1.0, 'VOLL': 1000.0},
+                       BRANCHDATA={'BRANCH': ['L1', 'L2', 'L3'], 'REACTANCE': [0.1, 0.1, 0.1],
+                                   'LINE_RATING': [200.0, 200.0, 80.0]},
+                       BRANCHBUS={'BRANCH': ['L1', 'L2', 'L3'], 'FROM': ['B1', 'B2', 'B1'],
+                                  'TO': ['B2', 'B3', 'B3']},
+                       GENBUS={'GEN': ['G1', 'G2'], 'BUS': ['B1', 'B3']},
+                       LOAD_DIST={'BUS': ['B3'], 'LOAD_DIST': [1.0]})
+    rtsced = RTSCEDModel(model, [5], cuts=[TransmissionCuts(model)])
+    result = rtsced.solve(np.array([150.0]))
+    # Two thirds of G1's output crosses L3, which is limited to 80 MW
+    np.testing.assert_allclose(result.dispatch[:, 0], [120.0, 30.0], atol=1e-6)
+    np.testing.assert_allclose(result.flows[:, 0], [40.0, 40.0, 80.0], atol=1e-6)
@@ -0,0 +1,46 @@
+import types
+
+import numpy as np
+import pytest
+
+import results_writer
+from results_writer import ResultsWriter, read_results
+from run_context import RunContext
+from RTSCED import RTSCEDModel
+
+def test_failed_flush_keeps_time_and_quantities_aligned(tmp_path):
+    path = str(tmp_path / 'results.h5')
+    writer = ResultsWriter(path, flush_rows=2)
+    for t in range(2):
+        writer.write('RTSCED', t, dispatch=np.ones(2), lmp=np.ones(3))
+    writer.flush()
+    # The next block's LMPs have another shape and cannot be appended to the dataset
+    for t in range(2, 4):
+        writer.write('RTSCED', t, dispatch=np.ones(2), lmp=np.ones(4))
+    with pytest.raises(RuntimeError):
+        writer.close()
+    time, dispatch = read_results(path, 'RTSCED', 'dispatch')
+    _, lmp = read_results(path, 'RTSCED', 'lmp')
+    np.testing.assert_array_equal(time, [0, 1])
+    assert len(dispatch) == len(lmp) == 2
+
+def test_rtsced_intervals_are_streamed_to_the_run_results(tmp_path, monkeypatch, make_model):
+    monkeypatch.chdir(tmp_path)
+    model = make_model({'CAPACITY': [100.0, 100.0], 'PERUNIT_COST': [20.0, 50.0], 'GEN_TYPE': [1.0, 1.0],
+                        'INITIAL_STATUS': [1.0, 1.0], 'INITIAL_MW': [50.0, 0.0]}, {'VOLL': 1000.0})
+    with RunContext(types.SimpleNamespace(stream_results=1), run_number=2) as run:
+        rtsced = RTSCEDModel(model, [5, 5], results=run.results)
+        for load in (50.0, 150.0, 120.0):
+            rtsced.solve(np.full(2, load))
+    time, lmp = read_results('FESTIV_RESULTS_2.h5', 'RTSCED', 'lmp')
+    np.testing.assert_array_equal(time, [0, 300, 600])
+    np.testing.assert_allclose(lmp[:, 0], [20.0, 50.0, 50.0])
+    assert read_results('FESTIV_RESULTS_2.h5', 'RTSCED', 'dispatch')[1].shape == (3, 2, 2)
+
+def test_results_writer_is_not_looked_up_again_when_streaming_is_off(monkeypatch):
+    calls = []
+    monkeypatch.setattr(results_writer.ResultsWriter, 'from_config',
+                        classmethod(lambda cls, config, path: calls.append(path)))
+    run = RunContext(types.SimpleNamespace(stream_results=0))
+    assert run.results is None and run.results is None
+    assert len(calls) == 1
@@ -0,0 +1,14 @@
+import numpy as np
+
+from RTSCED import RTSCEDModel
+
+def test_rtsced_reserve_shortfall_is_priced_at_a_voir_below_the_default(make_model):
+    model = make_model({'CAPACITY': [100.0, 100.0], 'PERUNIT_COST': [20.0, 50.0], 'GEN_TYPE': [1.0, 1.0],
+                        'INITIAL_STATUS': [1.0, 1.0], 'INITIAL_MW': [50.0, 0.0]},
+                       {'VOLL': 1000.0}, RESERVEPARAM={'RESERVE': ['SPIN'], 'VOIR': [300.0]})
+    rtsced = RTSCEDModel(model, [5, 5])
+    # No unit has a ramp rate, so none can carry reserve and all of it is short
+    result = rtsced.solve(np.full(2, 50.0), reserve_requirement=np.full(2, 10.0))
+    assert result.feasible
+    np.testing.assert_allclose(result.reserve_shortfall, 10.0)
+    np.testing.assert_allclose(result.objective, 2 * (50 * 20.0 * 5 / 60 + 10 * 300.0))
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from RTSCUCSTART import commitment_at, rtscuc_start
+
+def test_single_previous_interval_covers_its_own_length():
+    previous = np.array([[1], [0]])
+    sampled = commitment_at(previous, [0], [0, 300, 900], interval_seconds=900)
+    np.testing.assert_array_equal(sampled, [[1, 1, -1], [0, 0, -1]])
+
+def test_single_previous_interval_needs_its_length():
+    with pytest.raises(ValueError, match='interval_seconds'):
+        commitment_at(np.array([[1]]), [0], [0])
+
+def test_rtc_start_shifts_a_single_interval_solution():
+    dascuc = np.array([[0, 0], [1, 1]])
+    start = rtscuc_start(1, [0, 900], dascuc, np.array([[1], [0]]), [0], interval_seconds=900)
+    np.testing.assert_array_equal(start, [[1, 0], [0, 1]])
@@ -0,0 +1,31 @@
+import numpy as np
+
+from DASCUC import solve_dascuc
+from RTSCUC import solve_rtscuc
+
+def _two_units(make_model, **tabs):
+    return make_model({'CAPACITY': [100.0, 100.0], 'MIN_GEN': [0.0, 0.0], 'PERUNIT_COST': [20.0, 50.0],
+                       'NO_LOAD_COST': [0.0, 0.0], 'STARTUP_COST': [0.0, 0.0], 'MIN_RUN_TIME': [0.0, 0.0],
+                       'MIN_DOWN_TIME': [0.0, 0.0], 'GEN_TYPE': [1.0, 1.0], 'INITIAL_STATUS': [1.0, 1.0],
+                       'INITIAL_HOUR': [10.0, 10.0], 'INITIAL_MW': [50.0, 0.0]},
+                      {'VOLL': 1000.0}, **tabs)
+
+def test_dascuc_lmp_is_per_mwh_at_subhourly_intervals(make_model):
+    result = solve_dascuc(_two_units(make_model), np.full(4, 50.0), interval_hours=0.25)
+    assert result.feasible
+    np.testing.assert_allclose(result.lmp, 20.0)
+
+def test_rtscuc_lmp_is_per_mwh_at_15_minute_intervals(make_model):
+    model = _two_units(make_model)
+    initial = {'status': np.ones(2, dtype=bool), 'hours': np.full(2, 10.0), 'MW': np.array([50.0, 0.0])}
+    result = solve_rtscuc(model, np.full(4, 150.0), None, None, initial, np.ones((2, 4)), interval_hours=0.25)
+    assert result.feasible
+    np.testing.assert_allclose(result.lmp, 50.0)
+
+def test_dascuc_reserve_shortfall_is_priced_at_a_voir_below_the_default(make_model):
+    # No unit has a ramp rate, so none can carry reserve and all of it is short
+    model = _two_units(make_model, RESERVEPARAM={'RESERVE': ['SPIN'], 'VOIR': [300.0]})
+    result = solve_dascuc(model, np.full(2, 50.0), reserve_requirement=np.full(2, 10.0))
+    assert result.feasible
+    np.testing.assert_allclose(result.reserve_shortfall, 10.0)
+    np.testing.assert_allclose(result.objective, 2 * (50 * 20.0 + 10 * 300.0))
@@ -0,0 +1,36 @@
+import numpy as np
+
+from SYSTEM_MODEL import TYPE_INDICES
+from SHIFT_FACTOR import shift_factors
+from NETWORK_CONSTRAINTS import TransmissionCuts, SecurityCuts
+from run_context import SharedCache
+
+def _triangle_model(make_model, hvdc=False):
+    """Three-bus AC triangle, optionally with an HVDC link in parallel to B1-B3"""
+    frm, to = ['B1', 'B2', 'B1'], ['B2', 'B3', 'B3']
+    branch_type = [TYPE_INDICES.transmission_line_branch_type_index] * 3
+    if hvdc:
+        frm, to = frm + ['B1'], to + ['B3']
+        branch_type = branch_type + [TYPE_INDICES.HVDC_branch_type_index]
+    nl = len(frm)
+    names = [f'L{i}' for i in range(nl)]
+    return make_model(
+        {'CAPACITY': [100, 100], 'GEN_TYPE': [1, 1]}, {'SLACK_BUS': 1},
+        BRANCHDATA={'BRANCH': names, 'REACTANCE': [0.1] * nl, 'LINE_RATING': [50] * nl,
+                    'CTGC_MONITOR': [1] * nl, 'BRANCH_TYPE': branch_type},
+        BRANCHBUS={'BRANCH': names, 'FROM': frm, 'TO': to},
+        GENBUS={'GEN': ['G1', 'G2'], 'BUS': ['B1', 'B2']},
+        LOAD_DIST={'BUS': ['B3'], 'LOAD_DIST': [1.0]})
+
+def test_hvdc_branch_is_not_part_of_the_ac_network(make_model):
+    ac = shift_factors(_triangle_model(make_model), cache=SharedCache())
+    sf = shift_factors(_triangle_model(make_model, hvdc=True), cache=SharedCache())
+    np.testing.assert_allclose(sf.ptdf([0, 1, 2]), ac.ptdf([0, 1, 2]))
+    np.testing.assert_allclose(sf.ptdf([3]), 0.0)
+
+def test_hvdc_branch_is_neither_monitored_nor_outaged(make_model):
+    model = _triangle_model(make_model, hvdc=True)
+    assert 3 not in TransmissionCuts(model).monitored
+    security = SecurityCuts(model)
+    assert 3 not in security.monitored
+    assert 3 not in security.contingencies
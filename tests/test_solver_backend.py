@@ -0,0 +1,17 @@
+import pytest
+
+from run_config import RunConfig
+from solver_backend import solver_options
+
+def test_legacy_gams_tokens_without_an_equivalent_are_skipped():
+    with pytest.warns(UserWarning) as record:
+        options = solver_options('optfile=1 lp=cplex optcr=0.01 reslim=300')
+    assert options == {'mip_gap': 0.01, 'time_limit': 300.0}
+    assert ["'optfile=1'" in str(w.message) or "'lp=cplex'" in str(w.message) for w in record] == [True, True]
+
+def test_unknown_typed_solver_options_are_rejected():
+    with pytest.raises(ValueError):
+        solver_options(None, bogus=1)
+
+def test_highs_is_the_default_solver():
+    assert RunConfig().solver_in == 'HIGHS'
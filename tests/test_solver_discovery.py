@@ -0,0 +1,25 @@
+import os
+import platform
+
+import pytest
+
+from solver_discovery import SOLVERS, discover_solvers
+
+@pytest.mark.skipif(platform.system() == 'Windows', reason='uses a POSIX executable')
+def test_new_install_in_a_known_location_invalidates_a_cached_miss(tmp_path, monkeypatch):
+    monkeypatch.setenv('FESTIV_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('GUROBI_HOME', raising=False)
+    opt = tmp_path / 'opt'
+    opt.mkdir()
+    monkeypatch.setitem(SOLVERS['gurobi'], 'dirs', {platform.system(): (str(opt / 'gurobi*' / 'linux64' / 'bin'),)})
+    # Keep the Python bindings out of the way, only the install directory counts here
+    monkeypatch.delitem(SOLVERS['gurobi'], 'module')
+    assert discover_solvers(['gurobi'])['gurobi'] is None
+
+    bin_dir = opt / 'gurobi1100' / 'linux64' / 'bin'
+    bin_dir.mkdir(parents=True)
+    exe = bin_dir / 'gurobi_cl'
+    exe.write_text('#!/bin/sh\n')
+    exe.chmod(0o755)
+    entry = discover_solvers(['gurobi'])['gurobi']
+    assert entry is not None and entry['path'] == os.path.realpath(exe)
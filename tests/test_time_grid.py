@@ -0,0 +1,15 @@
+import dataclasses
+
+import numpy as np
+
+from run_config import RunConfig
+from TIME_GRID import TimeGrid, align_intervals
+
+def test_rt2act_table_matches_the_interval_lining():
+    for lining in (1, 2, 3):
+        grid = TimeGrid(dataclasses.replace(RunConfig(), RT2ACTInterval_Lining=lining))
+        steps = np.arange(grid.nagc)
+        expected = align_intervals((steps + 1) * grid.tAGC, grid.rtd.interval, lining)
+        assert grid.rt2act.shape == (grid.nagc,)
+        np.testing.assert_array_equal(grid.rtd_interval_of_step(steps), expected)
+        assert grid.rtd_interval_of_step(grid.agc_per_rtd - 1) == expected[grid.agc_per_rtd - 1]
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import timeseries_store
+from timeseries_store import TimeSeriesStore, convert_timeseries
+
+def _csv(tmp_path, times, values):
+    path = tmp_path / 'ACTUAL_LOAD.csv'
+    pd.DataFrame({'Time': times, 'LOAD': values}).to_csv(path, index=False)
+    return str(path)
+
+def test_converted_store_reads_back_across_blocks(tmp_path):
+    values = np.arange(10.0)
+    source = _csv(tmp_path, np.arange(10) * 4 / 3600, values)
+    dest = convert_timeseries(source, str(tmp_path / 'ACTUAL_LOAD.h5'), dt_seconds=4, chunk_rows=3)
+    with TimeSeriesStore(dest) as store:
+        np.testing.assert_array_equal(store.window(0, 1)[:, 0], values)
+        assert store.at(5 * 4 / 3600)[0] == 5.0
+
+def test_time_column_off_the_sampling_is_rejected(tmp_path):
+    # Sampled every 60 s, not every 4 s; the mismatch is in the second block
+    source = _csv(tmp_path, np.r_[np.arange(3) * 4, 60 + np.arange(3) * 60] / 3600, np.zeros(6))
+    dest = tmp_path / 'ACTUAL_LOAD.h5'
+    with pytest.raises(ValueError, match='row 3'):
+        convert_timeseries(source, str(dest), dt_seconds=4, chunk_rows=3)
+    assert not dest.exists()
+    assert not (tmp_path / 'ACTUAL_LOAD.h5.tmp').exists()
+
+def test_importing_the_store_does_not_load_h5py_or_pandas():
+    # Run in a fresh interpreter so modules the other tests loaded do not count
+    code = "import sys, timeseries_store; print('h5py' in sys.modules or 'pandas' in sys.modules)"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(timeseries_store.__file__)))
+    assert out.stdout.strip() == 'False'
@@ -0,0 +1,181 @@
+import math
+import os
+import numpy as np
+
+# Rows per HDF5 chunk. At a 4 s AGC resolution this is a little over an hour
+# of data, so an AGC/RTD window touches one or two chunks.
+DEFAULT_CHUNK_ROWS = 1024
+
+# Raw chunk cache per open store. Bounds the memory used for reads no matter
+# how long the horizon in the file is.
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024
+
+class TimeSeriesStore:
+    """
+    Read-only, windowed access to a uniformly sampled time series on disk.
+
+    The file holds one chunked 'values' dataset of shape (steps, series) with
+    the series names and the sampling (t0 in hours, dt in seconds) as
+    attributes, so a time maps to a row with integer arithmetic and only the
+    chunks covering a requested window are ever read into memory.
+    """
+
+    def __init__(self, path, cache_bytes=DEFAULT_CACHE_BYTES):
+        # h5py is only loaded once a store is actually opened, not at startup
+        import h5py
+        self.path = path
+        self._file = h5py.File(path, 'r', rdcc_nbytes=cache_bytes)
+        self._values = self._file['values']
+        self.names = [n.decode() if isinstance(n, bytes) else n for n in self._file.attrs['names']]
+        self.t0 = float(self._file.attrs['t0_hours'])
+        self.dt = float(self._file.attrs['dt_seconds'])
+        self.nsteps, self.nseries = self._values.shape
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @property
+    def end_time(self):
+        """Time in hours just past the last sample"""
+        return self.t0 + self.nsteps * self.dt / 3600
+
+    def step_of(self, time_hours):
+        """Row index of the sample at or just before time_hours"""
+        step = math.floor((time_hours - self.t0) * 3600 / self.dt + 1e-9)
+        return min(max(step, 0), self.nsteps)
+
+    def rows(self, start, stop, columns=None):
+        """Rows [start, stop) as an array, optionally only the given column positions"""
+        start = max(start, 0)
+        stop = min(stop, self.nsteps)
+        if stop <= start:
+            return np.empty((0, self.nseries if columns is None else len(columns)))
+        if columns is None:
+            return self._values[start:stop]
+        # h5py needs increasing indices for fancy selection
+        columns = np.asarray(columns)
+        order = np.argsort(columns)
+        block = self._values[start:stop, columns[order].tolist()]
+        return block[:, np.argsort(order)]
+
+    def window(self, start_hour, end_hour, columns=None):
+        """Samples with start_hour <= t < end_hour"""
+        return self.rows(self.step_of(start_hour), self.step_of(end_hour), columns)
+
+    def at(self, time_hours, columns=None):
+        """The single sample in effect at time_hours"""
+        step = min(self.step_of(time_hours), self.nsteps - 1)
+        return self.rows(step, step + 1, columns)[0]
+
+    def column_index(self, names):
+        """Column positions of the given series names"""
+        lookup = {name: i for i, name in enumerate(self.names)}
+        return np.array([lookup[name] for name in names], dtype=np.int64)
+
+class TimeSeriesWriter:
+    """Append-only writer that builds a TimeSeriesStore file block by block"""
+
+    def __init__(self, path, names, dt_seconds, t0_hours=0.0, chunk_rows=DEFAULT_CHUNK_ROWS):
+        import h5py
+        self.path = path
+        self._tmp_path = path + '.tmp'
+        self._file = h5py.File(self._tmp_path, 'w')
+        try:
+            self._file.attrs['names'] = np.array([str(n) for n in names], dtype=h5py.string_dtype())
+            self._file.attrs['t0_hours'] = float(t0_hours)
+            self._file.attrs['dt_seconds'] = float(dt_seconds)
+            self._values = self._file.create_dataset(
+                'values', shape=(0, len(names)), maxshape=(None, len(names)), dtype=np.float64,
+                chunks=(chunk_rows, len(names)), compression='gzip', shuffle=True)
+        except BaseException:
+            self.discard()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    @property
+    def nsteps(self):
+        """Rows written so far"""
+        return self._values.shape[0]
+
+    def append(self, block):
+        """Append a (steps, series) block of samples"""
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        n = self._values.shape[0]
+        self._values.resize(n + block.shape[0], axis=0)
+        self._values[n:] = block
+
+    def close(self):
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self):
+        """Close and remove the partly written file, leaving any existing store untouched"""
+        if self._file:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+def _check_times(times, first_step, dt_seconds, t0_hours, source):
+    """Raise if the time column (hours) is not sampled every dt_seconds from t0_hours"""
+    steps = first_step + np.arange(len(times))
+    offset = np.abs(np.asarray(times, dtype=np.float64) * 3600 - (t0_hours * 3600 + steps * dt_seconds))
+    # Within half a sample every time still maps to its own row
+    bad = np.flatnonzero(~(offset < dt_seconds / 2))
+    if len(bad):
+        row = first_step + bad[0]
+        raise ValueError(f"{os.path.basename(source)}: time {times[bad[0]]} in row {row} does not match "
+                         f"a {dt_seconds} s sampling from {t0_hours} h")
+
+def convert_timeseries(source, dest, dt_seconds, t0_hours=0.0, chunk_rows=DEFAULT_CHUNK_ROWS * 64):
+    """
+    Convert a time series file (first column time, one column per series) to a store.
+
+    The time column is in hours and has to follow t0_hours + k * dt_seconds;
+    it is checked and dropped, since the store only keeps t0 and dt. CSV
+    sources are streamed in blocks of chunk_rows so the conversion itself
+    does not need the whole series in memory; workbooks are read in one go.
+    """
+    # pandas is only needed when a series actually has to be converted
+    import pandas as pd
+    if os.path.splitext(source)[1].lower() == '.csv':
+        blocks = pd.read_csv(source, chunksize=chunk_rows)
+    else:
+        blocks = [pd.read_excel(source)]
+    writer = None
+    try:
+        for df in blocks:
+            if writer is None:
+                writer = TimeSeriesWriter(dest, df.columns[1:], dt_seconds, t0_hours)
+            _check_times(df.iloc[:, 0].to_numpy(), writer.nsteps, dt_seconds, t0_hours, source)
+            writer.append(df.iloc[:, 1:].to_numpy(dtype=np.float64))
+        if writer is not None:
+            writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.discard()
+        raise
+    return dest
+
+# Example usage:
+# if __name__ == "__main__":
+#     convert_timeseries('ACTUAL_LOAD.csv', 'ACTUAL_LOAD.h5', dt_seconds=4)
+#     with TimeSeriesStore('ACTUAL_LOAD.h5') as load:
+#         rtd_window = load.window(time, time + tRTD / 60)